@@ -1,592 +1,3701 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-from flask_mysqldb import MySQL
-import os
-import bcrypt
-import jwt
-import datetime
-from werkzeug.utils import secure_filename
-import PyPDF2
-import docx
-import re
-from functools import wraps
-import logging
-import random
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-app = Flask(__name__)
-CORS(app)
-
-# MySQL Configuration
-app.config['MYSQL_HOST'] = 'localhost'
-app.config['MYSQL_USER'] = 'root'
-app.config['MYSQL_PASSWORD'] = 'Kal78048'
-app.config['MYSQL_DB'] = 'viinterns'
-app.config['MYSQL_CURSORCLASS'] = 'DictCursor'
-app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
-
-mysql = MySQL(app)
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-
-# Enhanced AI Service for Viinterns
-class ViinternsAIService:
-    def __init__(self):
-        self.field_keywords = {
-            'Engineering': {
-                'keywords': ['software', 'developer', 'engineer', 'programming', 'coding', 'tech', 'computer science', 'web development'],
-                'companies': ['Google', 'Microsoft', 'Amazon', 'Meta', 'Netflix', 'Tech Startup', 'Innovation Labs']
-            },
-            'Medicine': {
-                'keywords': ['medical', 'healthcare', 'clinical', 'hospital', 'nursing', 'pharmacy', 'biomedical'],
-                'companies': ['City Hospital', 'Medical Center', 'Health Clinic', 'Research Institute']
-            },
-            'Business': {
-                'keywords': ['business', 'management', 'marketing', 'sales', 'consulting', 'operations', 'administration'],
-                'companies': ['Business Corp', 'Consulting Firm', 'Startup Hub', 'Enterprise Solutions']
-            },
-            'Science': {
-                'keywords': ['research', 'laboratory', 'biology', 'chemistry', 'physics', 'scientist', 'environmental'],
-                'companies': ['Research Lab', 'Science Institute', 'Environmental Org', 'Biotech Company']
-            },
-            'Art': {
-                'keywords': ['art', 'design', 'creative', 'painting', 'drawing', 'illustration', 'graphic'],
-                'companies': ['Art Gallery', 'Design Studio', 'Creative Agency', 'Museum']
-            },
-            'Education': {
-                'keywords': ['teaching', 'education', 'tutor', 'instructor', 'academic', 'curriculum'],
-                'companies': ['School District', 'Learning Center', 'Education Non-profit', 'Online Education']
-            }
-        }
-    
-    def search_internships(self, user_skills, career_fields, preferences):
-        """Search internships based on user skills and preferences"""
-        all_internships = []
-        
-        try:
-            user_skills_lower = [skill.lower().strip() for skill in user_skills]
-            
-            for field in career_fields:
-                if field in self.field_keywords:
-                    field_internships = self._generate_field_internships(field, user_skills_lower, preferences)
-                    all_internships.extend(field_internships)
-            
-            # Filter by skill match
-            skill_matched = self._filter_by_skill_match(all_internships, user_skills_lower)
-            
-            return skill_matched[:15]  # Limit results
-            
-        except Exception as e:
-            logging.error(f"Search error: {e}")
-            return []
-    
-    def _generate_field_internships(self, field, user_skills, preferences):
-        """Generate internships for a specific field"""
-        internships = []
-        field_data = self.field_keywords[field]
-        
-        for i in range(2):  # Generate 2 per field
-            company = random.choice(field_data['companies'])
-            keyword = random.choice(field_data['keywords'])
-            
-            # Find matching user skills
-            matching_skills = []
-            for skill in user_skills:
-                if any(field_keyword in skill for field_keyword in field_data['keywords']):
-                    matching_skills.append(skill)
-            
-            internship = {
-                'title': f'{field} Intern - {keyword.title()} Focus',
-                'company': company,
-                'location': preferences.get('location', 'Remote'),
-                'type': random.choice(['Remote', 'Hybrid', 'On-site']),
-                'duration': f'{random.randint(2, 6)} months',
-                'stipend': f'${random.randint(1000, 3000)}/month',
-                'description': f'Perfect for beginners interested in {field.lower()}. Learn {keyword} skills through hands-on projects. No experience required.',
-                'skills': self._generate_relevant_skills(field, user_skills),
-                'experienceRequired': 'No experience required',
-                'postedDate': (datetime.datetime.now() - datetime.timedelta(days=random.randint(1, 30))).strftime('%Y-%m-%d'),
-                'matchingSkills': matching_skills[:3]
-            }
-            internships.append(internship)
-        
-        return internships
-    
-    def _generate_relevant_skills(self, field, user_skills):
-        """Generate skills list with relevant user skills"""
-        base_skills = ['Communication', 'Teamwork', 'Willingness to Learn', 'Basic Computer Skills']
-        
-        # Add relevant user skills
-        relevant_skills = []
-        field_keywords_lower = [kw.lower() for kw in self.field_keywords[field]['keywords']]
-        
-        for skill in user_skills:
-            if any(keyword in skill for keyword in field_keywords_lower):
-                relevant_skills.append(skill.title())
-        
-        return base_skills + relevant_skills[:2]
-    
-    def _filter_by_skill_match(self, internships, user_skills):
-        """Filter internships by skill match"""
-        matched_internships = []
-        
-        for internship in internships:
-            internship_skills = [skill.lower() for skill in internship.get('skills', [])]
-            
-            # Calculate match score
-            match_count = 0
-            for user_skill in user_skills:
-                if any(user_skill in intern_skill or intern_skill in user_skill for intern_skill in internship_skills):
-                    match_count += 1
-            
-            if match_count > 0:  # Only include internships with at least one matching skill
-                internship['skillMatchRatio'] = match_count / len(user_skills) if user_skills else 0
-                internship['skillMatchCount'] = match_count
-                matched_internships.append(internship)
-        
-        # Sort by match ratio
-        matched_internships.sort(key=lambda x: x['skillMatchRatio'], reverse=True)
-        return matched_internships
-
-# Initialize AI Service
-ai_service = ViinternsAIService()
-
-# Authentication decorator
-def token_required(f):
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        token = request.headers.get('Authorization')
-        
-        if not token:
-            return jsonify({'message': 'Token is missing'}), 401
-        
-        try:
-            if token.startswith('Bearer '):
-                token = token[7:]
-            data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
-            current_user = get_user_by_id(data['user_id'])
-            if not current_user:
-                return jsonify({'message': 'User not found'}), 401
-        except Exception as e:
-            logging.error(f"Token validation error: {e}")
-            return jsonify({'message': 'Token validation failed'}), 401
-        
-        return f(current_user, *args, **kwargs)
-    
-    return decorated
-
-# Database helper functions
-def get_user_by_id(user_id):
-    try:
-        cur = mysql.connection.cursor()
-        cur.execute("SELECT * FROM users WHERE id = %s", (user_id,))
-        user = cur.fetchone()
-        cur.close()
-        return user
-    except Exception as e:
-        logging.error(f"Error getting user by id: {e}")
-        return None
-
-def get_user_by_email(email):
-    try:
-        cur = mysql.connection.cursor()
-        cur.execute("SELECT * FROM users WHERE email = %s", (email,))
-        user = cur.fetchone()
-        cur.close()
-        return user
-    except Exception as e:
-        logging.error(f"Error getting user by email: {e}")
-        return None
-
-# Routes
-@app.route('/')
-def home():
-    return jsonify({
-        'message': 'Viinterns Backend API',
-        'status': 'running',
-        'version': '1.0'
-    })
-
-@app.route('/api/register', methods=['POST'])
-def register():
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'message': 'No JSON data received'}), 400
-            
-        name = data.get('name')
-        email = data.get('email')
-        phone = data.get('phone')
-        password = data.get('password')
-        user_type = data.get('userType', 'student')
-        
-        if not all([name, email, password]):
-            return jsonify({'message': 'Missing required fields'}), 400
-        
-        # Check if user already exists
-        existing_user = get_user_by_email(email)
-        if existing_user:
-            return jsonify({'message': 'User already exists'}), 400
-        
-        # Hash password
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        
-        # Insert user
-        cur = mysql.connection.cursor()
-        cur.execute("""
-            INSERT INTO users (name, email, phone, password, user_type) 
-            VALUES (%s, %s, %s, %s, %s)
-        """, (name, email, phone, hashed_password, user_type))
-        mysql.connection.commit()
-        user_id = cur.lastrowid
-        cur.close()
-        
-        # Generate token
-        token = jwt.encode({
-            'user_id': user_id,
-            'exp': datetime.datetime.utcnow() + datetime.timedelta(days=30)
-        }, app.config['SECRET_KEY'], algorithm='HS256')
-        
-        user_data = {
-            'id': user_id,
-            'name': name,
-            'email': email,
-            'phone': phone,
-            'userType': user_type
-        }
-        
-        # Add additional fields based on user type
-        if user_type == 'student':
-            user_data['skills'] = data.get('skills', [])
-        else:
-            user_data['company'] = data.get('company', '')
-        
-        return jsonify({
-            'message': 'User created successfully',
-            'token': token,
-            'user': user_data
-        }), 201
-        
-    except Exception as e:
-        logging.error(f"Registration error: {e}")
-        return jsonify({'message': 'Internal server error'}), 500
-
-@app.route('/api/login', methods=['POST'])
-def login():
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'message': 'No JSON data received'}), 400
-            
-        email = data.get('email')
-        password = data.get('password')
-        
-        if not all([email, password]):
-            return jsonify({'message': 'Missing email or password'}), 400
-        
-        # Get user
-        user = get_user_by_email(email)
-        if not user:
-            return jsonify({'message': 'Invalid credentials'}), 401
-        
-        # Check password
-        if not bcrypt.checkpw(password.encode('utf-8'), user['password'].encode('utf-8')):
-            return jsonify({'message': 'Invalid credentials'}), 401
-        
-        # Generate token
-        token = jwt.encode({
-            'user_id': user['id'],
-            'exp': datetime.datetime.utcnow() + datetime.timedelta(days=30)
-        }, app.config['SECRET_KEY'], algorithm='HS256')
-        
-        user_data = {
-            'id': user['id'],
-            'name': user['name'],
-            'email': user['email'],
-            'phone': user['phone'],
-            'userType': user['user_type']
-        }
-        
-        return jsonify({
-            'message': 'Login successful',
-            'token': token,
-            'user': user_data
-        }), 200
-        
-    except Exception as e:
-        logging.error(f"Login error: {e}")
-        return jsonify({'message': 'Internal server error'}), 500
-
-@app.route('/api/search-jobs', methods=['POST'])
-def search_jobs():
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'message': 'No JSON data received'}), 400
-        
-        search_criteria = {
-            'skills': data.get('skills', []),
-            'careerFields': data.get('careerFields', []),
-            'preferences': data.get('preferences', {})
-        }
-        
-        # Get internships from AI service
-        internships = ai_service.search_internships(
-            search_criteria['skills'],
-            search_criteria['careerFields'],
-            search_criteria['preferences']
-        )
-        
-        return jsonify({
-            'message': f'Found {len(internships)} internships matching your skills',
-            'internships': internships,
-            'sources': ['Viinterns AI Search']
-        }), 200
-        
-    except Exception as e:
-        logging.error(f"Job search error: {e}")
-        return jsonify({'message': 'Internal server error'}), 500
-
-@app.route('/api/chat', methods=['POST'])
-def chat():
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'message': 'No JSON data received'}), 400
-            
-        message = data.get('message', '')
-        
-        # Simple response generation
-        if 'hello' in message.lower() or 'hi' in message.lower():
-            response = "Hello! I'm your Viinterns assistant. I can help you find no-experience internships, improve your resume, or prepare for interviews."
-        elif 'internship' in message.lower():
-            response = "I can help you find internships that require no prior experience! Check your dashboard for personalized recommendations."
-        elif 'resume' in message.lower():
-            response = "For no-experience positions, focus on transferable skills, education, projects, and willingness to learn in your resume."
-        else:
-            response = "I specialize in helping students find no-experience-required internships! How can I assist you today?"
-        
-        return jsonify({'response': response}), 200
-        
-    except Exception as e:
-        logging.error(f"Chat error: {e}")
-        return jsonify({'message': 'Internal server error'}), 500
-
-# Database initialization
-def init_db():
-    """Initialize database with required tables"""
-    try:
-        cur = mysql.connection.cursor()
-        
-        # Users table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                email VARCHAR(255) UNIQUE NOT NULL,
-                phone VARCHAR(20),
-                password VARCHAR(255) NOT NULL,
-                user_type ENUM('student', 'recruiter') DEFAULT 'student',
-                skills JSON,
-                company VARCHAR(255),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Internships table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS internships (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                title VARCHAR(255) NOT NULL,
-                company VARCHAR(255) NOT NULL,
-                location VARCHAR(255),
-                type VARCHAR(50),
-                duration VARCHAR(50),
-                stipend VARCHAR(100),
-                description TEXT,
-                skills JSON,
-                experience_required VARCHAR(100),
-                posted_by INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (posted_by) REFERENCES users(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Applications table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS applications (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT,
-                internship_id INT,
-                status ENUM('Pending', 'Approved', 'Rejected') DEFAULT 'Pending',
-                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                FOREIGN KEY (internship_id) REFERENCES internships(id) ON DELETE CASCADE
-            )
-        """)
-        
-        mysql.connection.commit()
-        cur.close()
-        logging.info("Database initialized successfully")
-        
-    except Exception as e:
-        logging.error(f"Database initialization error: {e}")
-
-if __name__ == '__main__':
-    with app.app_context():
-        init_db()
-    app.run(debug=True, port=5000, host='0.0.0.0')def search_internships_web(self, preferences):
-    """Search internships based ONLY on user's skills and career fields"""
-    all_internships = []
-    
-    try:
-        # Get user's specific skills and career fields
-        user_skills = [skill.strip().lower() for skill in preferences.get('skills', [])]
-        career_fields = preferences.get('careerFields', [])
-        
-        # If no skills specified, return empty results
-        if not user_skills:
-            return []
-        
-        # Search for each career field that matches user skills
-        for field in career_fields:
-            if self._field_matches_skills(field, user_skills):
-                field_internships = self._search_field_internships(field, user_skills, preferences)
-                all_internships.extend(field_internships)
-        
-        # Filter internships to only show those matching user skills
-        skill_matched_internships = self._filter_by_skill_match(all_internships, user_skills)
-        
-        # Remove duplicates and limit results
-        unique_internships = self._remove_duplicates(skill_matched_internships)
-        return unique_internships[:15]  # Limit to 15 results
-        
-    except Exception as e:
-        logging.error(f"Web search error: {e}")
-        return []
-
-def _field_matches_skills(self, field, user_skills):
-    """Check if user has skills relevant to this career field"""
-    if field not in self.field_keywords:
-        return False
-    
-    field_keywords = [kw.lower() for kw in self.field_keywords[field]['keywords']]
-    
-    # Check if any user skill matches field keywords
-    for skill in user_skills:
-        if any(keyword in skill for keyword in field_keywords):
-            return True
-        if any(skill in keyword for keyword in field_keywords):
-            return True
-    
-    return False
-
-def _filter_by_skill_match(self, internships, user_skills):
-    """Filter internships to only include those matching user skills"""
-    matched_internships = []
-    
-    for internship in internships:
-        internship_skills = [skill.lower() for skill in internship.get('skills', [])]
-        
-        # Calculate skill match ratio
-        matching_skills = []
-        for user_skill in user_skills:
-            for intern_skill in internship_skills:
-                if user_skill in intern_skill or intern_skill in user_skill:
-                    matching_skills.append(user_skill)
-                    break
-        
-        # Only include internships with at least one matching skill
-        if matching_skills:
-            internship['matchingSkills'] = list(set(matching_skills))
-            internship['skillMatchCount'] = len(matching_skills)
-            internship['skillMatchRatio'] = len(matching_skills) / len(user_skills)
-            matched_internships.append(internship)
-    
-    # Sort by skill match ratio (highest first)
-    matched_internships.sort(key=lambda x: x['skillMatchRatio'], reverse=True)
-    return matched_internships
-
-def _search_field_internships(self, field, user_skills, preferences):
-    """Search internships for a specific career field that matches user skills"""
-    internships = []
-    
-    if field not in self.field_keywords:
-        return internships
-    
-    field_data = self.field_keywords[field]
-    location = preferences.get('location', 'Remote')
-    
-    # Find skills that match this field
-    matching_skills = []
-    field_keywords_lower = [kw.lower() for kw in field_data['keywords']]
-    
-    for skill in user_skills:
-        if any(keyword in skill for keyword in field_keywords_lower):
-            matching_skills.append(skill)
-        elif any(skill in keyword for keyword in field_keywords_lower):
-            matching_skills.append(skill)
-    
-    # Only generate internships if there are matching skills
-    if not matching_skills:
-        return internships
-    
-    companies = self._get_companies_for_field(field)
-    
-    for i in range(2):  # Generate 2 internships per matching field
-        company = random.choice(companies)
-        primary_skill = random.choice(matching_skills)
-        
-        internship = {
-            'title': f'{field} Intern - {primary_skill.title()} Focus',
-            'company': company,
-            'location': location,
-            'type': random.choice(['Remote', 'Hybrid', 'On-site']),
-            'duration': random.choice(['2 months', '3 months', '6 months']),
-            'stipend': self._generate_stipend(field),
-            'description': self._generate_skill_specific_description(field, company, primary_skill),
-            'skills': self._generate_relevant_skills(field, user_skills),
-            'source': 'Skill-Matched Search',
-            'careerField': field,
-            'workMode': random.choice(['Remote', 'Hybrid', 'On-site']),
-            'experienceRequired': 'No experience required',
-            'postedDate': (datetime.datetime.now() - datetime.timedelta(days=random.randint(1, 30))).strftime('%Y-%m-%d'),
-            'userSkillsMatch': matching_skills
-        }
-        internships.append(internship)
-    
-    return internships
-
-def _generate_skill_specific_description(self, field, company, primary_skill):
-    """Generate description focused on the user's specific skills"""
-    descriptions = {
-        'Engineering': f"Perfect for beginners with {primary_skill} interest! Join {company} to apply your {primary_skill} knowledge in real projects. Comprehensive training provided.",
-        'Medicine': f"Ideal for students with {primary_skill} background. Gain healthcare experience at {company} with focus on {primary_skill} applications.",
-        'Business': f"Apply your {primary_skill} skills in business context at {company}. Learn practical business operations with your existing knowledge.",
-        'Science': f"Research internship at {company} focusing on {primary_skill} applications. Perfect for science students with relevant interest.",
-        'Art': f"Creative internship leveraging your {primary_skill} abilities. Work on artistic projects at {company} with professional guidance."
-    }
-    
-    return descriptions.get(field, f"Apply your {primary_skill} skills at {company}. {field} internship with comprehensive training and mentorship.")
-
-def _generate_relevant_skills(self, field, user_skills):
-    """Generate skills list that includes ONLY relevant user skills"""
-    base_skills = ['Communication', 'Teamwork', 'Willingness to Learn']
-    
-    # Filter user skills to only include relevant ones for this field
-    relevant_user_skills = []
-    field_keywords_lower = [kw.lower() for kw in self.field_keywords[field]['keywords']]
-    
-    for skill in user_skills:
-        if any(keyword in skill for keyword in field_keywords_lower):
-            relevant_user_skills.append(skill.title())
-        elif any(skill in keyword for keyword in field_keywords_lower):
-            relevant_user_skills.append(skill.title())
-    
-    # Limit to 3 most relevant skills
-    relevant_user_skills = relevant_user_skills[:3]
-    
-    return base_skills + relevant_user_skills
\ No newline at end of file
+from flask import Flask, Request, request, jsonify, g, has_request_context, Response, stream_with_context
+from flask.cli import AppGroup
+from flask_cors import CORS
+import click
+import mysql.connector
+import os
+import datetime
+from werkzeug.utils import secure_filename
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.exceptions import HTTPException
+import re
+from functools import wraps, lru_cache
+import logging
+import json
+import base64
+import threading
+import hashlib
+import uuid
+import io
+import csv
+import time
+import collections
+import heapq
+import math
+import bisect
+import sys
+import gc
+import unicodedata
+import zlib
+import shutil
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional: faster JSON encoding and brotli compression when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+app = Flask(__name__)
+CORS(app)
+
+# MySQL Configuration
+app.config['MYSQL_HOST'] = 'localhost'
+app.config['MYSQL_USER'] = 'root'
+app.config['MYSQL_PASSWORD'] = 'Kal78048'
+app.config['MYSQL_DB'] = os.environ.get('MYSQL_DB', 'viinterns')
+app.config['MYSQL_POOL_SIZE'] = int(os.environ.get('MYSQL_POOL_SIZE', 5))
+app.config['MYSQL_POOL_MAX_OVERFLOW'] = int(os.environ.get('MYSQL_POOL_MAX_OVERFLOW', 10))
+app.config['MYSQL_POOL_TIMEOUT'] = float(os.environ.get('MYSQL_POOL_TIMEOUT', 10))
+app.config['MYSQL_POOL_PING_INTERVAL'] = float(os.environ.get('MYSQL_POOL_PING_INTERVAL', 30))
+app.config['USER_CACHE_SIZE'] = int(os.environ.get('USER_CACHE_SIZE', 10000))
+app.config['USER_CACHE_TTL'] = float(os.environ.get('USER_CACHE_TTL', 300))
+app.config['TOKEN_CACHE_SIZE'] = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+app.config['CACHE_REDIS_URL'] = os.environ.get('CACHE_REDIS_URL')
+app.config['BCRYPT_ROUNDS'] = int(os.environ.get('BCRYPT_ROUNDS', 12))
+app.config['BCRYPT_WORKERS'] = int(os.environ.get('BCRYPT_WORKERS', os.cpu_count() or 2))
+app.config['BCRYPT_MAX_QUEUE'] = int(os.environ.get('BCRYPT_MAX_QUEUE', 32))
+app.config['BCRYPT_TIMEOUT'] = float(os.environ.get('BCRYPT_TIMEOUT', 10))
+app.config['SEARCH_CACHE_SIZE'] = int(os.environ.get('SEARCH_CACHE_SIZE', 5000))
+app.config['SEARCH_CACHE_MAX_BYTES'] = int(os.environ.get('SEARCH_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+app.config['SEARCH_CACHE_TTL'] = float(os.environ.get('SEARCH_CACHE_TTL', 60))
+app.config['SEARCH_CACHE_STALE_TTL'] = float(os.environ.get('SEARCH_CACHE_STALE_TTL', 300))
+app.config['BULK_INGEST_BATCH_SIZE'] = int(os.environ.get('BULK_INGEST_BATCH_SIZE', 500))
+app.config['BULK_INGEST_MAX_ERRORS'] = int(os.environ.get('BULK_INGEST_MAX_ERRORS', 1000))
+app.config['BULK_INGEST_MAX_BYTES'] = int(os.environ.get('BULK_INGEST_MAX_BYTES', 512 * 1024 * 1024))
+app.config['BATCH_MAX_PROFILES'] = int(os.environ.get('BATCH_MAX_PROFILES', 10000))
+app.config['PROFILE_SLOW_REQUESTS'] = os.environ.get('PROFILE_SLOW_REQUESTS', '0') == '1'
+app.config['PROFILE_THRESHOLD_MS'] = float(os.environ.get('PROFILE_THRESHOLD_MS', 500))
+app.config['PROFILE_INTERVAL_MS'] = float(os.environ.get('PROFILE_INTERVAL_MS', 5))
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', 'profiles')
+app.config['RESUME_WORKERS'] = int(os.environ.get('RESUME_WORKERS', 2))
+app.config['RESUME_CACHE_SIZE'] = int(os.environ.get('RESUME_CACHE_SIZE', 1000))
+app.config['RESUME_CACHE_TTL'] = float(os.environ.get('RESUME_CACHE_TTL', 24 * 3600))
+app.config['RESUME_JOB_TTL'] = float(os.environ.get('RESUME_JOB_TTL', 3600))
+app.config['CHAT_CACHE_SIZE'] = int(os.environ.get('CHAT_CACHE_SIZE', 10000))
+app.config['CHAT_CACHE_TTL'] = float(os.environ.get('CHAT_CACHE_TTL', 300))
+app.config['CHAT_TEMPLATES_FILE'] = os.environ.get('CHAT_TEMPLATES_FILE')
+app.config['GAZETTEER_FILE'] = os.environ.get('GAZETTEER_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gazetteer.json'))
+app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', '1') == '1'
+app.config['RATE_LIMIT_REDIS_URL'] = os.environ.get('RATE_LIMIT_REDIS_URL', app.config['CACHE_REDIS_URL'])
+app.config['RATE_LIMIT_STORE_SIZE'] = int(os.environ.get('RATE_LIMIT_STORE_SIZE', 100000))
+# Per-route token buckets by key kind: (burst capacity, tokens refilled per second)
+app.config['RATE_LIMITS'] = json.loads(os.environ['RATE_LIMITS']) if os.environ.get('RATE_LIMITS') else {
+    'login': {'ip': (20, 1.0), 'email': (5, 0.1)},
+    'register': {'ip': (5, 0.05)},
+    'search': {'ip': (60, 10.0), 'user': (30, 5.0)},
+    'batch': {'ip': (5, 0.1), 'user': (5, 0.1)}
+}
+# Reverse proxies in front of the app that append to X-Forwarded-For. Client
+# addresses (and so per-IP rate limits) come from that header only when this is
+# set, since any client can send it.
+app.config['TRUSTED_PROXIES'] = int(os.environ.get('TRUSTED_PROXIES', 0))
+app.config['MAX_CONCURRENT_REQUESTS'] = int(os.environ.get('MAX_CONCURRENT_REQUESTS', 64))
+app.config['ADMISSION_TIMEOUT'] = float(os.environ.get('ADMISSION_TIMEOUT', 0.1))
+app.config['RECOMMENDATIONS_TOP_K'] = int(os.environ.get('RECOMMENDATIONS_TOP_K', 50))
+app.config['RECOMMENDATION_WORKERS'] = int(os.environ.get('RECOMMENDATION_WORKERS', os.cpu_count() or 2))
+app.config['RECOMMENDATION_BATCH_SIZE'] = int(os.environ.get('RECOMMENDATION_BATCH_SIZE', 500))
+app.config['RECOMMENDATION_MAX_ATTEMPTS'] = int(os.environ.get('RECOMMENDATION_MAX_ATTEMPTS', 3))
+app.config['PRELOAD_INDEXES'] = os.environ.get('PRELOAD_INDEXES', '0') == '1'
+# Seconds between polls of catalog_state for internships inserted by other processes
+app.config['CATALOG_REFRESH_INTERVAL'] = float(os.environ.get('CATALOG_REFRESH_INTERVAL', 2))
+app.config['COMPRESS_MIN_BYTES'] = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+app.config['COMPRESS_LEVEL'] = int(os.environ.get('COMPRESS_LEVEL', 6))
+app.config['SECRET_KEY'] = 'your-secret-key-here'
+app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+
+os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+if app.config['TRUSTED_PROXIES']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'], x_proto=app.config['TRUSTED_PROXIES'])
+
+class ApiRequest(Request):
+    """Request whose body limit is MAX_CONTENT_LENGTH (sized for resumes), or BULK_INGEST_MAX_BYTES for bulk ingest"""
+
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'bulk_ingest_internships':
+            return app.config['BULK_INGEST_MAX_BYTES']
+        return super().max_content_length
+
+app.request_class = ApiRequest
+
+# Metrics
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Cumulative latency histogram in the Prometheus style"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        position = bisect.bisect_left(self.buckets, value)
+        if position < len(self.counts):
+            self.counts[position] += 1
+
+class Metrics:
+    """Process-wide request metrics rendered in the Prometheus text format.
+
+    Route latencies are recorded per (route, method). Inside a request,
+    timer() also accumulates per-component time (db, bcrypt, matching), which
+    is reported in the Server-Timing header and in per-component histograms.
+    """
+    COMPONENTS = ('db', 'bcrypt', 'matching')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = collections.defaultdict(Histogram)      # (route, method) -> histogram
+        self.components = collections.defaultdict(Histogram)  # component -> per-request total
+        self.responses = collections.Counter()                # (route, method, status) -> count
+        self.errors = collections.Counter()                   # route -> 5xx count
+        self.gauges = []                                      # callables returning {(name, labels): value}
+
+    @contextmanager
+    def timer(self, component):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(component, time.perf_counter() - started)
+
+    def add_timing(self, component, seconds):
+        """Add time spent in a component to the current request's breakdown"""
+        if has_request_context() and 'timings' in g:
+            g.timings[component] += seconds
+
+    def record_request(self, route, method, status, duration, timings=None):
+        """Record a finished request; `timings` is None when its components were not tracked"""
+        with self._lock:
+            self.routes[(route, method)].observe(duration)
+            self.responses[(route, method, status)] += 1
+            if status >= 500:
+                self.errors[route] += 1
+            if timings is not None:
+                for component in self.COMPONENTS:
+                    self.components[component].observe(timings.get(component, 0.0))
+
+    def register_gauges(self, collect):
+        """Register a callable returning {(metric name, labels dict items tuple): value}"""
+        self.gauges.append(collect)
+
+    def render(self):
+        lines = []
+
+        def labels(**values):
+            if not values:
+                return ''
+            return '{' + ','.join(f'{key}="{str(value).replace(chr(34), chr(39))}"' for key, value in values.items()) + '}'
+
+        def histogram(name, histogram, **values):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{labels(**values, le=bound)} {cumulative}')
+            lines.append(f'{name}_bucket{labels(**values, le="+Inf")} {histogram.count}')
+            lines.append(f'{name}_sum{labels(**values)} {histogram.sum}')
+            lines.append(f'{name}_count{labels(**values)} {histogram.count}')
+
+        with self._lock:
+            lines.append('# TYPE viinterns_request_duration_seconds histogram')
+            for (route, method), route_histogram in sorted(self.routes.items()):
+                histogram('viinterns_request_duration_seconds', route_histogram, route=route, method=method)
+            lines.append('# TYPE viinterns_request_component_seconds histogram')
+            for component, component_histogram in sorted(self.components.items()):
+                histogram('viinterns_request_component_seconds', component_histogram, component=component)
+            lines.append('# TYPE viinterns_responses_total counter')
+            for (route, method, status), count in sorted(self.responses.items()):
+                lines.append(f'viinterns_responses_total{labels(route=route, method=method, status=status)} {count}')
+            lines.append('# TYPE viinterns_request_errors_total counter')
+            for route, count in sorted(self.errors.items()):
+                lines.append(f'viinterns_request_errors_total{labels(route=route)} {count}')
+
+        for collect in self.gauges:
+            try:
+                for (name, label_items), value in sorted(collect().items()):
+                    lines.append(f'{name}{labels(**dict(label_items))} {value}')
+            except Exception as e:
+                logging.error(f"Metrics collection error: {e}")
+
+        return '\n'.join(lines) + '\n'
+
+metrics = Metrics()
+
+class SlowRequestProfiler:
+    """Opt-in sampling profiler that dumps folded stacks of slow requests.
+
+    While a request runs, a background thread samples its stack every
+    `interval` seconds. Requests slower than `threshold` seconds get their
+    samples written to `directory` in the folded format read by flamegraph.pl
+    and speedscope ("frame;frame;frame count" per line).
+
+    Requests are keyed by thread. Requests sharing a thread (an event loop)
+    pass their own `key`, and each gets the samples of that thread taken
+    while it was in flight.
+    """
+
+    def __init__(self, threshold, interval, directory):
+        self.threshold = threshold
+        self.interval = interval
+        self.directory = directory
+        self._active = {}  # request key -> (thread id, Counter of folded stacks)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start_request(self, key=None):
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._active[thread_id if key is None else key] = (thread_id, collections.Counter())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, name='profiler', daemon=True)
+                self._thread.start()
+
+    def finish_request(self, route, duration, key=None):
+        with self._lock:
+            _, samples = self._active.pop(threading.get_ident() if key is None else key, (None, None))
+        if not samples or duration < self.threshold:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        name = re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+        path = os.path.join(self.directory, f'{int(time.time() * 1000)}-{name}-{int(duration * 1000)}ms.folded')
+        with open(path, 'w') as f:
+            for stack, count in samples.most_common():
+                f.write(f'{stack} {count}\n')
+        logging.info(f"Slow request profile written to {path}")
+
+    def _sample(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                requests = [(key, thread_id) for key, (thread_id, _) in self._active.items()]
+            frames = sys._current_frames()
+            stacks = {}
+            for key, thread_id in requests:
+                if thread_id not in stacks:
+                    frame = frames.get(thread_id)
+                    entries = []
+                    while frame is not None:
+                        entries.append(f'{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})')
+                        frame = frame.f_back
+                    stacks[thread_id] = ';'.join(reversed(entries))
+                if not stacks[thread_id]:
+                    continue
+                with self._lock:
+                    if key in self._active:
+                        self._active[key][1][stacks[thread_id]] += 1
+
+profiler = None
+if app.config['PROFILE_SLOW_REQUESTS']:
+    profiler = SlowRequestProfiler(
+        app.config['PROFILE_THRESHOLD_MS'] / 1000,
+        app.config['PROFILE_INTERVAL_MS'] / 1000,
+        app.config['PROFILE_DIR']
+    )
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.timings = collections.defaultdict(float)
+    if profiler is not None:
+        profiler.start_request()
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' not in g:
+        return response
+    duration = time.perf_counter() - g.request_started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.record_request(route, request.method, response.status_code, duration, g.timings)
+    response.headers['Server-Timing'] = ', '.join(
+        [f'{component};dur={g.timings[component] * 1000:.2f}' for component in metrics.COMPONENTS if component in g.timings] +
+        [f'total;dur={duration * 1000:.2f}']
+    )
+    if profiler is not None:
+        profiler.finish_request(route, duration)
+    return response
+
+# Database connection pool
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+class ConnectionPool:
+    """Thread-safe MySQL connection pool with overflow and stale connection checks.
+
+    Up to `size` connections are kept open between requests; up to
+    `max_overflow` extra connections are opened under load and closed again
+    when returned. Connections idle for longer than `ping_interval` seconds
+    are pinged before reuse and replaced if the server has dropped them.
+    """
+
+    def __init__(self, connect, size=5, max_overflow=10, timeout=10, ping_interval=30):
+        self._connect = connect
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._idle = collections.deque()  # (connection, last used)
+        self._condition = threading.Condition()
+        self._opened = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.stale_replaced = 0
+
+    def acquire(self):
+        """Check out a healthy connection, waiting up to `timeout` seconds"""
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while True:
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._opened < self.size + self.max_overflow:
+                    self._opened += 1
+                    conn, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout('Timed out waiting for a database connection')
+                self.waiting += 1
+                try:
+                    self._condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.checked_out += 1
+
+        try:
+            if conn is not None and time.monotonic() - last_used > self.ping_interval:
+                if not self._is_healthy(conn):
+                    self._close(conn)
+                    conn = None
+                    with self._condition:
+                        self.stale_replaced += 1
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._condition:
+                self._opened -= 1
+                self.checked_out -= 1
+                self._condition.notify()
+            raise
+        return conn
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool; discarded and overflow connections are closed"""
+        with self._condition:
+            self.checked_out -= 1
+            if discard or self._opened > self.size:
+                self._opened -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._condition.notify()
+        if conn is not None:
+            self._close(conn)
+
+    def close_idle(self):
+        """Close every idle connection, e.g. before forking worker processes"""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._opened -= len(idle)
+        for conn, last_used in idle:
+            self._close(conn)
+
+    def _is_healthy(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def metrics(self):
+        """Snapshot of pool usage"""
+        with self._condition:
+            return {
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'opened': self._opened,
+                'idle': len(self._idle),
+                'checked_out': self.checked_out,
+                'waiting': self.waiting,
+                'overflow': max(0, self._opened - self.size),
+                'stale_replaced': self.stale_replaced
+            }
+
+def connect_mysql():
+    return mysql.connector.connect(
+        host=app.config['MYSQL_HOST'],
+        user=app.config['MYSQL_USER'],
+        password=app.config['MYSQL_PASSWORD'],
+        database=app.config['MYSQL_DB'],
+        autocommit=True
+    )
+
+db_pool = ConnectionPool(
+    connect_mysql,
+    size=app.config['MYSQL_POOL_SIZE'],
+    max_overflow=app.config['MYSQL_POOL_MAX_OVERFLOW'],
+    timeout=app.config['MYSQL_POOL_TIMEOUT'],
+    ping_interval=app.config['MYSQL_POOL_PING_INTERVAL']
+)
+
+# Errors that mean the connection itself is unusable
+CONNECTION_ERRORS = (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError)
+
+@contextmanager
+def db_cursor(transaction=False):
+    """Yield a dictionary cursor on a pooled connection.
+
+    Inside a request the connection is checked out once and returned when the
+    request ends; elsewhere it is returned when the block exits. With
+    transaction=True the block runs in a transaction that is committed on
+    success and rolled back on error.
+    """
+    started = time.perf_counter()
+    scoped = has_request_context()
+    if scoped and 'db_conn' in g:
+        conn = g.db_conn
+    else:
+        conn = db_pool.acquire()
+        if scoped:
+            g.db_conn = conn
+
+    cur = None
+    try:
+        if transaction:
+            conn.start_transaction()
+        cur = conn.cursor(dictionary=True)
+        yield cur
+        if transaction:
+            conn.commit()
+    except CONNECTION_ERRORS:
+        # Never hand a broken connection back to the pool
+        if scoped:
+            g.pop('db_conn', None)
+        db_pool.release(conn, discard=True)
+        conn = None
+        raise
+    except Exception:
+        if transaction:
+            conn.rollback()
+        raise
+    finally:
+        if cur is not None and conn is not None:
+            cur.close()
+        if conn is not None and not scoped:
+            db_pool.release(conn)
+        metrics.add_timing('db', time.perf_counter() - started)
+
+def db_query(query, params=(), fetch='all', retries=1):
+    """Run a single statement, retrying on a fresh connection if the current one went stale"""
+    for attempt in range(retries + 1):
+        try:
+            with db_cursor() as cur:
+                cur.execute(query, params)
+                if fetch == 'one':
+                    return cur.fetchone()
+                if fetch == 'all':
+                    return cur.fetchall()
+                return cur.lastrowid
+        except CONNECTION_ERRORS as e:
+            if attempt == retries:
+                raise
+            logging.warning(f"Retrying query on a fresh connection: {e}")
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        db_pool.release(conn)
+
+# Caching
+class TTLCache:
+    """Thread-safe in-process LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()  # key -> (expires at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0
+            }
+
+class RedisCache:
+    """Cache with the TTLCache interface stored in Redis, shared between workers.
+
+    Values are stored as JSON, so they must be JSON serializable (datetimes
+    are stored as strings).
+    """
+
+    def __init__(self, client, namespace, ttl=300):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key):
+        return f'{self.namespace}:{key}'
+
+    def get(self, key, default=None):
+        try:
+            value = self.client.get(self._key(key))
+        except Exception as e:
+            logging.error(f"Cache read error: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, key, value, ttl=None):
+        try:
+            self.client.set(self._key(key), json.dumps(value, default=str), ex=max(1, int(self.ttl if ttl is None else ttl)))
+        except Exception as e:
+            logging.error(f"Cache write error: {e}")
+
+    def delete(self, key):
+        try:
+            self.client.delete(self._key(key))
+        except Exception as e:
+            logging.error(f"Cache delete error: {e}")
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(f'{self.namespace}:*'))
+            if keys:
+                self.client.delete(*keys)
+        except Exception as e:
+            logging.error(f"Cache clear error: {e}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': 'redis',
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0
+        }
+
+class StaleWhileRevalidateCache:
+    """LRU cache of JSON-serializable results with a memory cap and stale-while-revalidate.
+
+    Entries are fresh for `ttl` seconds and may then be served stale for another
+    `stale_ttl` seconds while a single background refresh recomputes them.
+    Sizes are measured as the length of the entry's JSON encoding.
+    """
+
+    def __init__(self, maxsize=5000, max_bytes=64 * 1024 * 1024, ttl=60, stale_ttl=300, workers=2):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data = collections.OrderedDict()  # key -> (fresh until, stale until, size, value)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cache-refresh')
+        self.generation = 0
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _lookup(self, key, refresh):
+        """Return (found, value, generation), scheduling `refresh` for stale entries"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > now:
+                self._data.move_to_end(key)
+                if entry[0] > now:
+                    self.hits += 1
+                    return True, entry[3], self.generation
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._executor.submit(self._refresh, key, refresh, self.generation)
+                return True, entry[3], self.generation
+            self.misses += 1
+            return False, None, self.generation
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing it on a miss"""
+        found, value, generation = self._lookup(key, compute)
+        if not found:
+            value = compute()
+            self._store(key, value, generation)
+        return value
+
+    async def get_or_compute_async(self, key, compute, refresh):
+        """Like get_or_compute for coroutines; `refresh` is the blocking recompute used in the background"""
+        found, value, generation = self._lookup(key, refresh)
+        if not found:
+            value = await compute()
+            self._store(key, value, generation)
+        return value
+
+    def _refresh(self, key, compute, generation):
+        try:
+            self._store(key, compute(), generation)
+        except Exception as e:
+            logging.error(f"Cache refresh error: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key, value, generation):
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        now = time.monotonic()
+        with self._lock:
+            # Results computed before an invalidation must not be cached
+            if generation != self.generation:
+                return
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self._data[key] = (now + self.ttl, now + self.ttl + self.stale_ttl, size, value)
+            self.bytes += size
+            while len(self._data) > self.maxsize or self.bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= evicted[2]
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry, e.g. after the underlying data changed"""
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'size': len(self._data),
+                'bytes': self.bytes,
+                'maxsize': self.maxsize,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0
+            }
+
+def make_cache(namespace, maxsize, ttl, shared=True):
+    """Create a cache, backed by Redis when CACHE_REDIS_URL is configured and shared is True"""
+    redis_url = app.config.get('CACHE_REDIS_URL')
+    if shared and redis_url:
+        try:
+            import redis
+            return RedisCache(redis.Redis.from_url(redis_url), f'viinterns:{namespace}', ttl=ttl)
+        except ImportError:
+            logging.error("CACHE_REDIS_URL is set but the redis package is not installed; using an in-process cache")
+    return TTLCache(maxsize=maxsize, ttl=ttl)
+
+# Authenticated users by id, and decoded JWT payloads by token. Tokens stay in
+# process memory only; users may be shared between workers.
+user_cache = make_cache('users', app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+token_cache = make_cache('tokens', app.config['TOKEN_CACHE_SIZE'], app.config['USER_CACHE_TTL'], shared=False)
+
+# /api/search-jobs responses keyed on normalized search criteria
+search_cache = StaleWhileRevalidateCache(
+    maxsize=app.config['SEARCH_CACHE_SIZE'],
+    max_bytes=app.config['SEARCH_CACHE_MAX_BYTES'],
+    ttl=app.config['SEARCH_CACHE_TTL'],
+    stale_ttl=app.config['SEARCH_CACHE_STALE_TTL']
+)
+
+# Password hashing
+class HasherBusy(Exception):
+    """Raised when the password hashing queue is full"""
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded worker pool instead of the request thread.
+
+    bcrypt releases the GIL while hashing, so a thread pool gives real
+    parallelism. At most `max_queue` hashes may be pending or running; beyond
+    that callers get HasherBusy so they can shed load instead of queueing.
+    """
+
+    def __init__(self, rounds=12, workers=2, max_queue=32, timeout=10):
+        self.rounds = rounds
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self.rejected = 0
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HasherBusy('Password hashing queue is full')
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        with metrics.timer('bcrypt'):
+            return future.result(timeout=self.timeout)
+
+    def hash(self, password):
+        """Hash a password with the configured cost factor"""
+        return self._run(self._hash, password.encode('utf-8'), self.rounds).decode('utf-8')
+
+    def verify(self, password, hashed):
+        """Check a password against a stored hash"""
+        import bcrypt
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed):
+        """True when a stored hash uses a different cost factor than configured"""
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    @staticmethod
+    def _hash(password, rounds):
+        import bcrypt
+        return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+password_hasher = PasswordHasher(
+    rounds=app.config['BCRYPT_ROUNDS'],
+    workers=app.config['BCRYPT_WORKERS'],
+    max_queue=app.config['BCRYPT_MAX_QUEUE'],
+    timeout=app.config['BCRYPT_TIMEOUT']
+)
+
+@app.errorhandler(HasherBusy)
+def hasher_busy(e):
+    response = jsonify({'message': 'Server is busy, please retry shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+@app.errorhandler(PoolTimeout)
+def pool_timeout(e):
+    logging.error(f"Database pool exhausted: {e}")
+    response = jsonify({'message': 'Server is busy, please retry shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+# Rate limiting and admission control
+class RateLimited(Exception):
+    """Raised when a client has used up its budget for a route"""
+
+    def __init__(self, retry_after):
+        super().__init__('Rate limit exceeded')
+        self.retry_after = retry_after
+
+class TokenBucketStore:
+    """In-process token buckets, least recently used first out beyond `maxsize` keys"""
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = collections.OrderedDict()  # key -> [tokens, updated]
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, cost=1):
+        """Take `cost` tokens; return 0 on success, else seconds until they are available"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [capacity, now]
+                if len(self._buckets) > self.maxsize:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0
+            return (cost - bucket[0]) / rate
+
+class RedisTokenBucketStore:
+    """Token buckets in Redis, shared between workers. Fails open if Redis is unavailable."""
+    SCRIPT = """
+        local capacity, rate, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+        local clock = redis.call('TIME')
+        local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+        local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+        local tokens = tonumber(state[1]) or capacity
+        tokens = math.min(capacity, tokens + (now - (tonumber(state[2]) or now)) * rate)
+        local wait = 0
+        if tokens >= cost then tokens = tokens - cost else wait = (cost - tokens) / rate end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+        return tostring(wait)
+    """
+
+    def __init__(self, client, namespace):
+        self.namespace = namespace
+        self._take = client.register_script(self.SCRIPT)
+
+    def take(self, key, capacity, rate, cost=1):
+        try:
+            return float(self._take(keys=[f'{self.namespace}:{key}'], args=[capacity, rate, cost]))
+        except Exception as e:
+            logging.error(f"Rate limit store error: {e}")
+            return 0
+
+def make_rate_limit_store():
+    """Token bucket store, in Redis when RATE_LIMIT_REDIS_URL is configured"""
+    redis_url = app.config.get('RATE_LIMIT_REDIS_URL')
+    if redis_url:
+        try:
+            import redis
+            return RedisTokenBucketStore(redis.Redis.from_url(redis_url), 'viinterns:ratelimit')
+        except ImportError:
+            logging.error("RATE_LIMIT_REDIS_URL is set but the redis package is not installed; using in-process buckets")
+    return TokenBucketStore(maxsize=app.config['RATE_LIMIT_STORE_SIZE'])
+
+rate_limit_store = make_rate_limit_store()
+rate_limited_total = collections.Counter()  # (route, key kind) -> rejections
+
+def check_rate_limit(route, cost=1, **keys):
+    """Charge each key (ip=..., user=..., email=...) against the route's budget; raises RateLimited"""
+    if not app.config['RATE_LIMIT_ENABLED']:
+        return
+    budgets = app.config['RATE_LIMITS'].get(route, {})
+    for kind, value in keys.items():
+        budget = budgets.get(kind)
+        if budget is None or value is None:
+            continue
+        wait = rate_limit_store.take(f'{route}:{kind}:{value}', budget[0], budget[1], cost)
+        if wait:
+            rate_limited_total[(route, kind)] += 1
+            raise RateLimited(wait)
+
+def rate_limited(route):
+    """Apply the route's per-IP budget, and its per-user budget for signed-in callers"""
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            keys = {'ip': request.remote_addr}
+            if 'user' in app.config['RATE_LIMITS'].get(route, {}) and 'Authorization' in request.headers:
+                user = optional_user()
+                keys['user'] = user['id'] if user else None
+            check_rate_limit(route, **keys)
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+@app.errorhandler(RateLimited)
+def rate_limit_exceeded(e):
+    response = jsonify({'message': 'Too many requests, please retry later'})
+    response.headers['Retry-After'] = str(max(1, math.ceil(e.retry_after)))
+    return response, 429
+
+class AdmissionControl:
+    """Caps requests in flight per process.
+
+    A request that cannot get a slot within `timeout` seconds is shed with a
+    503 straight away, rather than queueing behind a saturated worker pool.
+    """
+
+    def __init__(self, limit=64, timeout=0.1):
+        self.limit = limit
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.shed = 0
+
+    def acquire(self, timeout=None):
+        if not self._slots.acquire(timeout=self.timeout if timeout is None else timeout):
+            with self._lock:
+                self.shed += 1
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+admission = AdmissionControl(app.config['MAX_CONCURRENT_REQUESTS'], app.config['ADMISSION_TIMEOUT'])
+
+# Always answer monitoring, even when shedding load
+ADMISSION_EXEMPT_PATHS = ('/metrics', '/api/health')
+
+@app.before_request
+def admit_request():
+    if request.path in ADMISSION_EXEMPT_PATHS:
+        return None
+    if not admission.acquire():
+        response = jsonify({'message': 'Server is busy, please retry shortly'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    g.admitted = True
+
+@app.teardown_request
+def release_admission(exception):
+    if g.pop('admitted', False):
+        admission.release()
+
+def normalize_skill(skill):
+    """Normalize a skill name for matching"""
+    return ' '.join(str(skill).lower().split())
+
+# Inverted skill index
+class SkillIndex:
+    """Posting lists from normalized skill to internship ids, with n-gram substring lookup.
+
+    A user skill matches an internship skill when either one contains the other,
+    so lookups combine an n-gram index (skills containing the query) with an
+    exact lookup of every substring of the query (skills contained in it).
+    """
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self.postings = {}       # skill -> set of internship ids
+        self.grams = {}          # n-gram -> set of skills
+        self.doc_skills = {}     # internship id -> set of skills
+        self.max_skill_length = 0
+
+    def __len__(self):
+        return len(self.doc_skills)
+
+    def _grams(self, skill):
+        grams = set()
+        for size in range(1, self.GRAM_SIZE + 1):
+            for i in range(len(skill) - size + 1):
+                grams.add(skill[i:i + size])
+        return grams
+
+    def add(self, internship_id, skills):
+        """Index (or re-index) an internship's skills"""
+        if internship_id in self.doc_skills:
+            self.remove(internship_id)
+
+        normalized = {normalize_skill(skill) for skill in skills or []}
+        normalized.discard('')
+        self.doc_skills[internship_id] = normalized
+
+        for skill in normalized:
+            if skill not in self.postings:
+                self.postings[skill] = set()
+                for gram in self._grams(skill):
+                    self.grams.setdefault(gram, set()).add(skill)
+                self.max_skill_length = max(self.max_skill_length, len(skill))
+            self.postings[skill].add(internship_id)
+
+    def remove(self, internship_id):
+        """Drop an internship from the index"""
+        for skill in self.doc_skills.pop(internship_id, ()):
+            ids = self.postings.get(skill)
+            if ids is None:
+                continue
+            ids.discard(internship_id)
+            if not ids:
+                del self.postings[skill]
+                for gram in self._grams(skill):
+                    skills = self.grams.get(gram)
+                    if skills is not None:
+                        skills.discard(skill)
+                        if not skills:
+                            del self.grams[gram]
+
+    def matching_skills(self, user_skill):
+        """Return indexed skills that contain or are contained in user_skill"""
+        if not user_skill:
+            return set(self.postings)
+
+        # Indexed skills containing the user skill
+        if len(user_skill) <= self.GRAM_SIZE:
+            candidates = set(self.grams.get(user_skill, ()))
+        else:
+            candidates = None
+            for i in range(len(user_skill) - self.GRAM_SIZE + 1):
+                skills = self.grams.get(user_skill[i:i + self.GRAM_SIZE])
+                if not skills:
+                    candidates = set()
+                    break
+                candidates = set(skills) if candidates is None else candidates & skills
+                if not candidates:
+                    break
+            candidates = {skill for skill in candidates if user_skill in skill}
+
+        # Indexed skills contained in the user skill
+        max_length = min(len(user_skill), self.max_skill_length)
+        for i in range(len(user_skill)):
+            for j in range(i + 1, min(i + max_length, len(user_skill)) + 1):
+                if user_skill[i:j] in self.postings:
+                    candidates.add(user_skill[i:j])
+
+        return candidates
+
+    def match_counts(self, user_skills):
+        """Count, per internship id, how many user skills match one of its skills"""
+        counts = {}
+        for user_skill in user_skills:
+            matched_ids = set()
+            for skill in self.matching_skills(user_skill):
+                matched_ids |= self.postings[skill]
+            for internship_id in matched_ids:
+                counts[internship_id] = counts.get(internship_id, 0) + 1
+        return counts
+
+# Locations
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+def geohash(latitude, longitude, precision):
+    """Geohash of a point: base32 characters interleaving longitude and latitude bits"""
+    bounds = [[-180.0, 180.0], [-90.0, 90.0]]
+    point = (longitude, latitude)
+    characters = []
+    bit = 0
+    for _ in range(precision):
+        value = 0
+        for _ in range(5):
+            low, high = bounds[bit % 2]
+            middle = (low + high) / 2
+            value <<= 1
+            if point[bit % 2] >= middle:
+                value |= 1
+                bounds[bit % 2][0] = middle
+            else:
+                bounds[bit % 2][1] = middle
+            bit += 1
+        characters.append(GEOHASH_ALPHABET[value])
+    return ''.join(characters)
+
+def distance_km(latitude1, longitude1, latitude2, longitude2):
+    """Great-circle (haversine) distance between two points"""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(longitude2 - longitude1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class GeoIndex:
+    """Points bucketed by geohash cell.
+
+    A radius query only visits the cells overlapping the circle's bounding box
+    and checks exact distances for the points in them; when the box covers
+    more cells than are occupied, the occupied cells are scanned instead.
+    """
+
+    def __init__(self, precision=4):
+        self.precision = precision
+        self.points = {}  # key -> (latitude, longitude)
+        self.cells = {}   # geohash -> set of keys
+        self.rows = 2 ** (5 * precision // 2)
+        self.columns = 2 ** ((5 * precision + 1) // 2)
+        self.cell_height = 180 / self.rows
+        self.cell_width = 360 / self.columns
+
+    def __len__(self):
+        return len(self.points)
+
+    def add(self, key, latitude, longitude):
+        self.remove(key)
+        self.points[key] = (latitude, longitude)
+        self.cells.setdefault(geohash(latitude, longitude, self.precision), set()).add(key)
+
+    def remove(self, key):
+        point = self.points.pop(key, None)
+        if point is not None:
+            cell = geohash(point[0], point[1], self.precision)
+            self.cells[cell].discard(key)
+            if not self.cells[cell]:
+                del self.cells[cell]
+
+    def _covering_cells(self, latitude, longitude, radius_km):
+        """Geohashes of the cells overlapping the circle's bounding box, or None when that is every cell"""
+        latitude_span = radius_km / KM_PER_DEGREE
+        cos_latitude = math.cos(math.radians(min(90.0, abs(latitude) + latitude_span)))
+        if cos_latitude < 1e-9 or latitude_span / cos_latitude >= 180:
+            return None
+        longitude_span = latitude_span / cos_latitude
+
+        first_row = max(0, int((latitude - latitude_span + 90) // self.cell_height))
+        last_row = min(self.rows - 1, int((latitude + latitude_span + 90) // self.cell_height))
+        first_column = int((longitude - longitude_span + 180) // self.cell_width)
+        last_column = int((longitude + longitude_span + 180) // self.cell_width)
+        if (last_row - first_row + 1) * (last_column - first_column + 1) > len(self.cells):
+            return None
+
+        cells = []
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                # Columns wrap around the antimeridian
+                cells.append(geohash((row + 0.5) * self.cell_height - 90,
+                                     (column % self.columns + 0.5) * self.cell_width - 180, self.precision))
+        return cells
+
+    def within(self, latitude, longitude, radius_km):
+        """Yield (key, distance in km) for every point within radius_km of the given point"""
+        cells = self._covering_cells(latitude, longitude, radius_km)
+        for cell in self.cells if cells is None else cells:
+            for key in self.cells.get(cell, ()):
+                distance = distance_km(latitude, longitude, *self.points[key])
+                if distance <= radius_km:
+                    yield key, distance
+
+class Place:
+    """A gazetteer city, region or country. Ids nest: 'us', 'us/ca', 'us/ca/san-francisco'."""
+    __slots__ = ('id', 'kind', 'name', 'parent', 'latitude', 'longitude')
+
+def normalize_place_name(text):
+    """Lowercase a place name, dropping accents and periods"""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(text.lower().replace('.', '').split())
+
+def place_slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', normalize_place_name(name)).strip('-')
+
+class Gazetteer:
+    """Offline geocoder resolving free-text locations to canonical places.
+
+    Loaded from a JSON file of countries, regions and cities with coordinates
+    (see gazetteer.json). Text like 'San Francisco, CA' is split on commas:
+    the first part names a city, region or country (cities first), and the
+    remaining parts pick between places sharing that name. Among equally good
+    candidates the one listed first in the file wins. A part naming a region
+    or country the place is not in ('London, ON') means no match; parts the
+    gazetteer does not know (postcodes, say) are ignored.
+    """
+
+    def __init__(self, path=None):
+        self.places = {}     # place id -> Place
+        self.names = {}      # place id -> names, codes and aliases, normalized
+        self.lookup = ({}, {}, {})  # name -> [Place] for cities, regions and countries
+        self.contained = {}  # place id -> ids of the place and every place inside it
+        self.cities = GeoIndex()
+        self.resolve = lru_cache(maxsize=4096)(self._resolve)
+        if path:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.load(json.load(f))
+            except (OSError, ValueError, KeyError) as e:
+                logging.error(f"Error loading gazetteer from {path}: {e}")
+
+    def __len__(self):
+        return len(self.places)
+
+    def _add(self, kind, place_id, name, parent, aliases, latitude=None, longitude=None):
+        place = Place()
+        place.id = sys.intern(place_id)
+        place.kind = kind
+        place.name = name
+        place.parent = parent
+        place.latitude = latitude
+        place.longitude = longitude
+        self.places[place.id] = place
+        self.names[place.id] = {normalize_place_name(alias) for alias in [name] + aliases}
+        table = self.lookup[('city', 'region', 'country').index(kind)]
+        for alias in self.names[place.id]:
+            table.setdefault(alias, []).append(place)
+        ancestor = place
+        while ancestor is not None:
+            self.contained.setdefault(ancestor.id, set()).add(place.id)
+            ancestor = ancestor.parent
+        if latitude is not None:
+            self.cities.add(place.id, latitude, longitude)
+        return place
+
+    def load(self, data):
+        countries, regions = {}, {}
+        for country in data['countries']:
+            code = country['code'].lower()
+            countries[code] = self._add('country', code, country['name'], None, country.get('aliases', []))
+            # Country codes only qualify other names ('Cambridge, GB'); as a name they clash with region codes
+            self.names[code].add(code)
+        for region in data['regions']:
+            country = countries[region['country'].lower()]
+            region_id = f"{country.id}/{region['code'].lower()}"
+            regions[region_id] = self._add('region', region_id, region['name'], country,
+                                           [region['code']] + region.get('aliases', []))
+        for city in data['cities']:
+            parent = countries[city['country'].lower()]
+            if city.get('region'):
+                parent = regions[f"{parent.id}/{city['region'].lower()}"]
+            self._add('city', f"{parent.id}/{place_slug(city['name'])}", city['name'], parent,
+                      city.get('aliases', []), float(city['latitude']), float(city['longitude']))
+        self.contained = {place_id: frozenset(ids) for place_id, ids in self.contained.items()}
+
+    def _qualifier_matches(self, place, qualifiers):
+        ancestor, matches = place.parent, 0
+        while ancestor is not None:
+            matches += sum(1 for qualifier in qualifiers if qualifier in self.names[ancestor.id])
+            ancestor = ancestor.parent
+        return matches
+
+    def _qualifiers_agree(self, place, qualifiers):
+        """False when a qualifier names a region or country that `place` is not in"""
+        for qualifier in qualifiers:
+            known = qualifier in self.lookup[1] or qualifier in self.lookup[2] or qualifier in self.places
+            if known and not self._qualifier_matches(place, [qualifier]):
+                return False
+        return True
+
+    def _resolve(self, text):
+        """The Place a location string refers to, or None when unknown (e.g. 'Remote')"""
+        parts = [part for part in (normalize_place_name(part) for part in str(text).split(',')) if part]
+        if not parts:
+            return None
+        place = self._best_match(parts[0], parts[1:])
+        if place is None and ' ' in parts[0]:
+            # 'Austin TX': a trailing word may qualify the name, but then it has to match
+            name, _, qualifier = parts[0].rpartition(' ')
+            place = self._best_match(name, [qualifier] + parts[1:])
+            if place is not None and not self._qualifier_matches(place, [qualifier]):
+                place = None
+        if place is not None and not self._qualifiers_agree(place, parts[1:]):
+            return None
+        return place
+
+    def _best_match(self, name, qualifiers):
+        for table in self.lookup:
+            candidates = table.get(name)
+            if candidates:
+                return max(candidates, key=lambda place: self._qualifier_matches(place, qualifiers))
+        return None
+
+    def place_id(self, text):
+        """Canonical id for a location string, or None"""
+        place = self.resolve(text) if isinstance(text, str) else None
+        return place.id if place is not None else None
+
+    def matching_place_ids(self, place, radius_km=None):
+        """Ids of places satisfying a location filter: inside `place`, or cities within radius_km of it"""
+        if radius_km is None:
+            return self.contained.get(place.id, frozenset([place.id]))
+        return frozenset(city_id for city_id, distance in self.cities.within(place.latitude, place.longitude, radius_km))
+
+gazetteer = Gazetteer(app.config['GAZETTEER_FILE'])
+
+def preference_location(preferences):
+    """(place, radius in km or None) for a location preference the gazetteer knows; raises ValueError.
+
+    Returns None when no location is given or the gazetteer does not know it;
+    such locations are matched as exact text. A withinKm radius needs a city.
+    """
+    location = preferences.get('location')
+    radius = preferences.get('withinKm')
+    if radius in (None, ''):
+        radius = None
+    else:
+        try:
+            radius = float(radius)
+        except (TypeError, ValueError):
+            raise ValueError('Invalid withinKm')
+        if not radius >= 0:
+            raise ValueError('Invalid withinKm')
+
+    place = gazetteer.resolve(location) if isinstance(location, str) else None
+    if radius is not None and (place is None or place.kind != 'city'):
+        raise ValueError('withinKm needs a known city as location')
+    return (place, radius) if place is not None else None
+
+# Compact catalog records
+NUMBER_PATTERN = re.compile(r'\d[\d,]*(?:\.\d+)?')
+EPOCH = datetime.date(1970, 1, 1)
+
+def parse_stipend(value):
+    """Monthly stipend amount from text like '$1500/month' or '$400 per week'; None if unknown"""
+    text = str(value or '').lower()
+    if 'unpaid' in text:
+        return 0.0
+    match = NUMBER_PATTERN.search(text)
+    if not match or 'hour' in text:
+        return None
+    amount = float(match.group(0).replace(',', ''))
+    if 'week' in text:
+        return amount * 52 / 12
+    if 'year' in text or 'annum' in text:
+        return amount / 12
+    return amount
+
+def parse_duration(value):
+    """Duration in months from text like '3 months' or '10 weeks'; None if unknown"""
+    text = str(value or '').lower()
+    match = NUMBER_PATTERN.search(text)
+    if not match:
+        return None
+    amount = float(match.group(0).replace(',', ''))
+    if 'week' in text:
+        return amount * 12 / 52
+    if 'year' in text:
+        return amount * 12
+    return amount
+
+def format_stipend(amount):
+    if amount is None:
+        return None
+    return f'${int(amount)}/month' if float(amount).is_integer() else f'${amount}/month'
+
+def format_duration(months):
+    if months is None:
+        return None
+    return f'{int(months)} months' if float(months).is_integer() else f'{months} months'
+
+class InternshipRecord:
+    """One catalog internship, without a per-instance dict.
+
+    Stipend (per month) and duration (in months) are numeric; the original
+    text is kept only when formatting the number would not reproduce it.
+    Skills are ids into the owning InternshipStore's vocabulary and the
+    posting date is a day count since the Unix epoch. place_id is the
+    gazetteer place the location resolves to, when the store geocodes.
+    """
+    __slots__ = ('id', 'title', 'company', 'location', 'place_id', 'type', 'field', 'description', 'experience_required',
+                 'stipend', 'stipend_text', 'duration', 'duration_text', 'skill_ids', 'posted_day')
+
+class InternshipStore:
+    """Catalog records by id. Repeated strings are interned and dicts are only built by to_dict()."""
+
+    def __init__(self, geocode=None):
+        self.records = {}       # internship id -> InternshipRecord
+        self.skill_names = []   # skill id -> skill as posted
+        self.skill_ids = {}     # skill as posted -> skill id
+        self.geocode = geocode  # location text -> place id, e.g. Gazetteer.place_id
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, internship_id):
+        return internship_id in self.records
+
+    def __getitem__(self, internship_id):
+        return self.records[internship_id]
+
+    def _intern(self, value):
+        return sys.intern(value) if isinstance(value, str) else value
+
+    def _skill_id(self, skill):
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is None:
+            skill_id = self.skill_ids[sys.intern(skill)] = len(self.skill_names)
+            self.skill_names.append(skill)
+        return skill_id
+
+    def add(self, internship_id, internship):
+        """Store (or replace) an internship given in its API representation; returns the record"""
+        record = InternshipRecord()
+        record.id = internship_id
+        record.title = internship.get('title')
+        record.company = self._intern(internship.get('company'))
+        record.location = self._intern(internship.get('location'))
+        record.place_id = self.geocode(record.location) if self.geocode else None
+        record.type = self._intern(internship.get('type'))
+        record.field = self._intern(internship.get('field'))
+        record.description = internship.get('description')
+        record.experience_required = self._intern(internship.get('experienceRequired'))
+
+        stipend = internship.get('stipend')
+        record.stipend = parse_stipend(stipend)
+        record.stipend_text = None if format_stipend(record.stipend) == stipend else self._intern(stipend)
+        duration = internship.get('duration')
+        record.duration = parse_duration(duration)
+        record.duration_text = None if format_duration(record.duration) == duration else self._intern(duration)
+
+        record.skill_ids = tuple(self._skill_id(skill) for skill in internship.get('skills') or [] if isinstance(skill, str))
+        posted = parse_posted_date(internship.get('postedDate')) if internship.get('postedDate') else None
+        record.posted_day = (posted - EPOCH).days if posted else None
+
+        self.records[internship_id] = record
+        return record
+
+    def remove(self, internship_id):
+        self.records.pop(internship_id, None)
+
+    def skills(self, record):
+        return [self.skill_names[skill_id] for skill_id in record.skill_ids]
+
+    def terms(self, record):
+        """Tokens of a record's title, skills and description, for BM25 scoring"""
+        return tokenize(' '.join([record.title or '', ' '.join(self.skills(record)), record.description or '']))
+
+    def to_dict(self, record):
+        """The record in its API representation"""
+        return {
+            'id': record.id,
+            'title': record.title,
+            'company': record.company,
+            'location': record.location,
+            'type': record.type,
+            'field': record.field,
+            'duration': record.duration_text if record.duration_text is not None else format_duration(record.duration),
+            'stipend': record.stipend_text if record.stipend_text is not None else format_stipend(record.stipend),
+            'description': record.description,
+            'skills': self.skills(record),
+            'experienceRequired': record.experience_required,
+            'postedDate': (EPOCH + datetime.timedelta(days=record.posted_day)).isoformat() if record.posted_day is not None else None
+        }
+
+# Search preferences filtering on numeric record fields, as (minimum key, maximum key)
+RANGE_PREFERENCES = {'stipend': ('minStipend', 'maxStipend'), 'duration': ('minDuration', 'maxDuration')}
+
+def preference_ranges(preferences):
+    """(low, high) bounds per numeric record field requested in search preferences; raises ValueError"""
+    ranges = {}
+    for name, keys in RANGE_PREFERENCES.items():
+        try:
+            bounds = tuple(None if preferences.get(key) in (None, '') else float(preferences[key]) for key in keys)
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid {name} range')
+        if bounds != (None, None):
+            ranges[name] = bounds
+    return ranges
+
+# Relevance ranking
+TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+')
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+@lru_cache(maxsize=4096)
+def parse_posted_date(value):
+    try:
+        return datetime.datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+class TermStats:
+    """Document frequencies for BM25 scoring, maintained incrementally"""
+
+    def __init__(self, documents=()):
+        self.document_frequency = collections.Counter()
+        self.doc_terms = {}  # document id -> (distinct terms, length)
+        self.total_length = 0
+        for doc_id, terms in documents:
+            self.add(doc_id, terms)
+
+    def add(self, doc_id, terms):
+        self.remove(doc_id)
+        distinct = frozenset(terms)
+        self.doc_terms[doc_id] = (distinct, len(terms))
+        self.document_frequency.update(distinct)
+        self.total_length += len(terms)
+
+    def remove(self, doc_id):
+        entry = self.doc_terms.pop(doc_id, None)
+        if entry is not None:
+            self.document_frequency.subtract(entry[0])
+            self.total_length -= entry[1]
+
+    @property
+    def average_length(self):
+        return self.total_length / len(self.doc_terms) if self.doc_terms else 0
+
+    def idf(self, term):
+        documents = len(self.doc_terms)
+        frequency = self.document_frequency.get(term, 0)
+        return math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+
+class RankingEngine:
+    """Weighted relevance ranking with top-k heap selection.
+
+    Each scorer maps (internship, skill match count, context) to a value in
+    [0, 1] and is combined using its weight. Candidates are visited in
+    descending skill-match order, so once the heap holds `offset + limit`
+    results, buckets whose best possible score cannot beat the heap are never
+    scored. Custom scorers can be added with register().
+    """
+    DEFAULT_WEIGHTS = {'skills': 0.6, 'text': 0.15, 'recency': 0.1, 'location': 0.1, 'type': 0.05}
+
+    def __init__(self, weights=None, recency_half_life=30, k1=1.2, b=0.75):
+        self.scorers = {
+            'skills': self._score_skills,
+            'text': self._score_text,
+            'recency': self._score_recency,
+            'location': self._score_location,
+            'type': self._score_type
+        }
+        self.weights = dict(self.DEFAULT_WEIGHTS, **(weights or {}))
+        self.recency_half_life = recency_half_life
+        self.k1 = k1
+        self.b = b
+
+    def register(self, name, scorer, weight):
+        """Add or replace a scorer; it must return a value in [0, 1]"""
+        self.scorers[name] = scorer
+        self.weights[name] = weight
+
+    def top_k(self, matches, user_skills, preferences=None, stats=None, limit=15, offset=0, store=None, places=None):
+        """Rank (record, match count) pairs from `store`; returns [(record, match count, score)]
+
+        `places` are the gazetteer place ids the location preference accepts;
+        without them the location is compared as text.
+        """
+        preferences = preferences or {}
+        types = preferences.get('type')
+        today = datetime.date.today()
+        context = {
+            'skill_count': len(user_skills),
+            'query_terms': set(tokenize(' '.join(user_skills))),
+            'stats': stats,
+            'store': store,
+            'location': normalize_skill(preferences['location']) if preferences.get('location') else None,
+            'places': places,
+            'types': {types} if isinstance(types, str) else set(types or []),
+            'today': today,
+            'today_day': (today - EPOCH).days
+        }
+        scorers = [(self.scorers[name], weight) for name, weight in self.weights.items() if weight and name in self.scorers]
+        other_weight = sum(weight for name, weight in self.weights.items() if name != 'skills')
+        k = offset + limit if limit is not None else None
+
+        buckets = collections.defaultdict(list)
+        for internship, match_count in matches:
+            buckets[match_count].append(internship)
+
+        heap = []
+        sequence = 0
+        for match_count in sorted(buckets, reverse=True):
+            if k is not None and len(heap) >= k:
+                best_possible = self.weights.get('skills', 0) * self._skill_ratio(match_count, context) + other_weight
+                if best_possible <= heap[0][0]:
+                    break
+            for internship in buckets[match_count]:
+                score = sum(weight * scorer(internship, match_count, context) for scorer, weight in scorers)
+                # Earlier candidates win ties
+                item = (score, -sequence, match_count, internship)
+                sequence += 1
+                if k is None or len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+
+        ranked = sorted(heap, key=lambda item: item[:2], reverse=True)[offset:]
+        return [(internship, match_count, score) for score, _, match_count, internship in ranked]
+
+    def _skill_ratio(self, match_count, context):
+        return match_count / context['skill_count'] if context['skill_count'] else 0
+
+    def _score_skills(self, internship, match_count, context):
+        return self._skill_ratio(match_count, context)
+
+    def _score_text(self, internship, match_count, context):
+        """BM25 of the user's skill terms over title, skills and description, squashed into [0, 1)"""
+        stats = context['stats']
+        if not stats or not context['query_terms'] or context['store'] is None:
+            return 0
+        terms = context['store'].terms(internship)
+        frequencies = collections.Counter(term for term in terms if term in context['query_terms'])
+        if not frequencies:
+            return 0
+        norm = self.k1 * (1 - self.b + self.b * len(terms) / (stats.average_length or 1))
+        raw = sum(stats.idf(term) * tf * (self.k1 + 1) / (tf + norm) for term, tf in frequencies.items())
+        return raw / (raw + 1)
+
+    def _score_recency(self, internship, match_count, context):
+        if internship.posted_day is None:
+            return 0
+        age = max(context['today_day'] - internship.posted_day, 0)
+        return 0.5 ** (age / self.recency_half_life)
+
+    def _score_location(self, internship, match_count, context):
+        if context['places'] is not None:
+            return 1 if internship.place_id in context['places'] else 0
+        location = context['location']
+        return 1 if location and normalize_skill(internship.location or '') == location else 0
+
+    def _score_type(self, internship, match_count, context):
+        return 1 if internship.type in context['types'] else 0
+
+# Full-text search
+STEM_SUFFIXES = ('ational', 'ization', 'fulness', 'ousness', 'iveness', 'ements', 'ement', 'ments', 'ment',
+                 'ness', 'ings', 'ing', 'ies', 'ied', 'ers', 'er', 'ed', 'ly', 'es', 's')
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Light suffix-stripping stemmer, so 'developers', 'development' and 'developing' share a stem"""
+    for suffix in STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)] + ('y' if suffix in ('ies', 'ied') else '')
+    return token
+
+def within_one_edit(a, b):
+    """True when a and b differ by at most one insertion, deletion or substitution"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+class TextIndex:
+    """Incremental inverted index over internship titles, companies and descriptions.
+
+    Terms are stemmed; the last query word also matches as a prefix, and words
+    with no exact match fall back to vocabulary words one edit away (found via
+    a single-deletion neighbourhood index). Query words are ANDed together.
+    """
+    FIELD_WEIGHTS = {'title': 3.0, 'company': 2.0, 'description': 1.0}
+    MIN_FUZZY_LENGTH = 4
+
+    def __init__(self):
+        self.postings = {}      # stem -> {doc id: weighted term frequency}
+        self.doc_stems = {}     # doc id -> stems, for removal
+        self.words = {}         # raw word -> stem
+        self.sorted_words = []  # raw words, for prefix lookup
+        self.deletions = {}     # word with one character deleted -> raw words
+
+    def __len__(self):
+        return len(self.doc_stems)
+
+    def add(self, doc_id, fields):
+        """Index (or re-index) a document given as {field name: text}"""
+        if doc_id in self.doc_stems:
+            self.remove(doc_id)
+        frequencies = collections.Counter()
+        for field, weight in self.FIELD_WEIGHTS.items():
+            for word in tokenize(fields.get(field) or ''):
+                self._add_word(word)
+                frequencies[self.words[word]] += weight
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+        self.doc_stems[doc_id] = tuple(frequencies)
+
+    def remove(self, doc_id):
+        for term in self.doc_stems.pop(doc_id, ()):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+
+    def _add_word(self, word):
+        if word in self.words:
+            return
+        self.words[word] = stem(word)
+        bisect.insort(self.sorted_words, word)
+        if len(word) >= self.MIN_FUZZY_LENGTH:
+            for i in range(len(word)):
+                self.deletions.setdefault(word[:i] + word[i + 1:], set()).add(word)
+
+    def _expand(self, word, prefix=False, fuzzy=True):
+        """Stems a query word may match"""
+        terms = set()
+        term = stem(word)
+        if term in self.postings:
+            terms.add(term)
+        if prefix:
+            position = bisect.bisect_left(self.sorted_words, word)
+            while position < len(self.sorted_words) and self.sorted_words[position].startswith(word):
+                terms.add(self.words[self.sorted_words[position]])
+                position += 1
+        if not terms and fuzzy and len(word) >= self.MIN_FUZZY_LENGTH:
+            candidates = set(self.deletions.get(word, ()))
+            for i in range(len(word)):
+                deleted = word[:i] + word[i + 1:]
+                candidates |= self.deletions.get(deleted, set())
+                if deleted in self.words:
+                    candidates.add(deleted)
+            terms = {self.words[candidate] for candidate in candidates if within_one_edit(word, candidate)}
+        return {term for term in terms if term in self.postings}
+
+    def search(self, query, limit=20, offset=0, fuzzy=True):
+        """Return [(doc id, score)] for documents matching every query word, best first"""
+        words = tokenize(query)
+        if not words:
+            return []
+
+        scores = None
+        documents = len(self.doc_stems)
+        for position, word in enumerate(words):
+            word_scores = {}
+            for term in self._expand(word, prefix=position == len(words) - 1, fuzzy=fuzzy):
+                docs = self.postings[term]
+                idf = math.log(1 + (documents - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, frequency in docs.items():
+                    if scores is None or doc_id in scores:
+                        word_scores[doc_id] = max(word_scores.get(doc_id, 0), idf * frequency / (frequency + 1.2))
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {doc_id: score + word_scores[doc_id] for doc_id, score in scores.items() if doc_id in word_scores}
+            if not scores:
+                return []
+
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: item[1])
+        return top[offset:]
+
+# Enhanced AI Service for Viinterns
+class ViinternsAIService:
+    def __init__(self):
+        self.field_keywords = {
+            'Engineering': {
+                'keywords': ['software', 'developer', 'engineer', 'programming', 'coding', 'tech', 'computer science', 'web development'],
+                'companies': ['Google', 'Microsoft', 'Amazon', 'Meta', 'Netflix', 'Tech Startup', 'Innovation Labs']
+            },
+            'Medicine': {
+                'keywords': ['medical', 'healthcare', 'clinical', 'hospital', 'nursing', 'pharmacy', 'biomedical'],
+                'companies': ['City Hospital', 'Medical Center', 'Health Clinic', 'Research Institute']
+            },
+            'Business': {
+                'keywords': ['business', 'management', 'marketing', 'sales', 'consulting', 'operations', 'administration'],
+                'companies': ['Business Corp', 'Consulting Firm', 'Startup Hub', 'Enterprise Solutions']
+            },
+            'Science': {
+                'keywords': ['research', 'laboratory', 'biology', 'chemistry', 'physics', 'scientist', 'environmental'],
+                'companies': ['Research Lab', 'Science Institute', 'Environmental Org', 'Biotech Company']
+            },
+            'Art': {
+                'keywords': ['art', 'design', 'creative', 'painting', 'drawing', 'illustration', 'graphic'],
+                'companies': ['Art Gallery', 'Design Studio', 'Creative Agency', 'Museum']
+            },
+            'Education': {
+                'keywords': ['teaching', 'education', 'tutor', 'instructor', 'academic', 'curriculum'],
+                'companies': ['School District', 'Learning Center', 'Education Non-profit', 'Online Education']
+            }
+        }
+
+        # Keyword -> fields lookup, so a skill is matched against every field in one pass
+        self.keyword_fields = {}
+        for field, field_data in self.field_keywords.items():
+            for keyword in field_data['keywords']:
+                self.keyword_fields.setdefault(keyword.lower(), set()).add(field)
+        self.max_keyword_length = max(len(keyword) for keyword in self.keyword_fields)
+        self.fields_for_skill = lru_cache(maxsize=4096)(self._fields_for_skill)
+        self.keyword_pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(keyword) for keyword in sorted(self.keyword_fields, key=len, reverse=True)) + r')\b',
+            re.IGNORECASE
+        )
+
+        # Catalog skill index, updated incrementally as internships are added or removed
+        self.skill_index = SkillIndex()
+        self.term_stats = TermStats()
+        self.text_index = TextIndex()
+        self.catalog = InternshipStore(geocode=gazetteer.place_id)
+        self.ranking = RankingEngine()
+        # Serializes index updates with the searches reading the index
+        self.lock = threading.RLock()
+
+    def _fields_for_skill(self, skill):
+        """Return the fields having a keyword contained in the skill"""
+        fields = set()
+        for i in range(len(skill)):
+            for j in range(i + 1, min(i + self.max_keyword_length, len(skill)) + 1):
+                matched = self.keyword_fields.get(skill[i:j])
+                if matched:
+                    fields |= matched
+        return frozenset(fields)
+
+    def index_internship(self, internship):
+        """Add or update an internship in the catalog index"""
+        with self.lock:
+            record = self.catalog.add(internship['id'], internship)
+            self.skill_index.add(record.id, internship.get('skills', []))
+            self.term_stats.add(record.id, self.catalog.terms(record))
+            self.text_index.add(record.id, internship)
+
+    def remove_internship(self, internship_id):
+        """Remove an internship from the catalog index"""
+        with self.lock:
+            self.catalog.remove(internship_id)
+            self.skill_index.remove(internship_id)
+            self.term_stats.remove(internship_id)
+            self.text_index.remove(internship_id)
+
+    def match_catalog(self, user_skills, career_fields=None, preferences=None, limit=15, offset=0):
+        """Rank indexed internships against the user's skills, returning one page of copies"""
+        with self.lock:
+            user_skills = [normalize_skill(skill) for skill in user_skills]
+            counts = self.skill_index.match_counts(user_skills)
+            places = self._place_filter(preferences)
+            return self._rank_matches(
+                self._filter_candidates(counts, career_fields, preferences, places),
+                user_skills, preferences, self.term_stats, limit, offset, places=places
+            )
+    
+    def newest_catalog(self, user_skills, career_fields=None, preferences=None, limit=15, before_id=None):
+        """Catalog internships matching the user's skills, newest (highest id) first"""
+        with self.lock:
+            user_skills = [normalize_skill(skill) for skill in user_skills]
+            counts = self.skill_index.match_counts(user_skills)
+            if before_id is not None:
+                counts = {internship_id: count for internship_id, count in counts.items() if internship_id < before_id}
+        
+            results = []
+            candidates = self._filter_candidates(counts, career_fields, preferences, self._place_filter(preferences))
+            for record, count in heapq.nlargest(limit, candidates, key=lambda match: match[0].id):
+                internship = self.catalog.to_dict(record)
+                internship['skillMatchCount'] = count
+                internship['skillMatchRatio'] = count / len(user_skills) if user_skills else 0
+                results.append(internship)
+            return results
+    
+    def search_text(self, query, limit=20, offset=0, fuzzy=True):
+        """Keyword search over catalog titles, companies and descriptions"""
+        with self.lock:
+            results = []
+            for internship_id, score in self.text_index.search(query, limit, offset, fuzzy):
+                internship = self.catalog.to_dict(self.catalog[internship_id])
+                internship['searchScore'] = round(score, 4)
+                results.append(internship)
+            return results
+    
+    def _place_filter(self, preferences):
+        """Place ids a location preference accepts, or None when the location is matched as text"""
+        location = preference_location(preferences or {})
+        return gazetteer.matching_place_ids(*location) if location else None
+    
+    def _filter_candidates(self, counts, career_fields, preferences, places=None):
+        """Yield (record, match count) for catalog matches passing the field, location, type and range filters.
+
+        With `places` (from _place_filter) an internship must be located in one
+        of them, except that Remote internships pass when Remote is among the
+        requested types; otherwise the location text must match exactly.
+        """
+        fields = set(career_fields or [])
+        preferences = preferences or {}
+        location = preferences.get('location')
+        types = preferences.get('type')
+        if isinstance(types, str):
+            types = [types]
+        remote_anywhere = bool(types) and 'Remote' in types
+        ranges = preference_ranges(preferences).items()
+        
+        for internship_id, count in counts.items():
+            record = self.catalog[internship_id]
+            if fields and record.field not in fields:
+                continue
+            if places is not None:
+                if record.place_id not in places and not (remote_anywhere and record.type == 'Remote'):
+                    continue
+            elif location and record.location != location:
+                continue
+            if types and record.type not in types:
+                continue
+            if ranges and not all(
+                    getattr(record, name) is not None
+                    and (low is None or getattr(record, name) >= low)
+                    and (high is None or getattr(record, name) <= high)
+                    for name, (low, high) in ranges):
+                continue
+            yield record, count
+    
+    def match_batch(self, profiles, limit=15):
+        """Score many profiles against the catalog, yielding one result list per profile.
+
+        Skills are normalized and looked up in the index once per distinct skill
+        across the whole batch, giving a sparse skill-by-internship matrix that
+        every profile's scores are summed from.
+        """
+        skill_rows = {}
+        for profile in profiles:
+            # The lock is held per profile, never across a yield
+            with self.lock:
+                user_skills = [normalize_skill(skill) for skill in profile.get('skills') or []]
+                counts = collections.Counter()
+                for skill in user_skills:
+                    row = skill_rows.get(skill)
+                    if row is None:
+                        row = set()
+                        for indexed_skill in self.skill_index.matching_skills(skill):
+                            row |= self.skill_index.postings[indexed_skill]
+                        row = skill_rows[skill] = frozenset(row)
+                    counts.update(row)
+                
+                preferences = profile.get('preferences') or {}
+                places = self._place_filter(preferences)
+                results = self._rank_matches(
+                    self._filter_candidates(counts, profile.get('careerFields'), preferences, places),
+                    user_skills, preferences, self.term_stats, limit, places=places
+                )
+            yield results
+    
+    def extract_skills(self, text):
+        """Find field keywords mentioned in free text, grouped by field"""
+        found = {}
+        for match in self.keyword_pattern.finditer(text):
+            keyword = match.group(0).lower()
+            for field in self.keyword_fields[keyword]:
+                found.setdefault(field, set()).add(keyword)
+        return found
+    
+    def _rank_matches(self, matches, user_skills, preferences=None, stats=None, limit=None, offset=0, places=None):
+        """Rank (record, match count) pairs from the catalog and return dicts with their scores attached"""
+        ranked_internships = []
+        
+        for record, match_count, score in self.ranking.top_k(matches, user_skills, preferences, stats, limit, offset,
+                                                             self.catalog, places):
+            internship = self.catalog.to_dict(record)
+            internship['skillMatchRatio'] = match_count / len(user_skills) if user_skills else 0
+            internship['skillMatchCount'] = match_count
+            internship['relevanceScore'] = round(score, 4)
+            ranked_internships.append(internship)
+        
+        return ranked_internships
+
+# Initialize AI Service
+ai_service = ViinternsAIService()
+
+# Distinct catalog skills, used to expand user skills before querying internship_skills
+skill_vocabulary = SkillIndex()
+skill_vocabulary_loaded = False
+
+# Whether the internships table has been loaded into ai_service's catalog index
+catalog_loaded = False
+
+# Held while the vocabulary or catalog is loaded or refreshed; vocabulary_lock guards skill_vocabulary itself
+catalog_load_lock = threading.RLock()
+vocabulary_lock = threading.Lock()
+
+# What this process's vocabulary and catalog index reflect: the catalog_state
+# generation and the highest internship id read, set by the first full load
+catalog_generation = None
+catalog_max_id = 0
+catalog_checked_at = 0.0
+
+# Authentication decorator
+def token_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = request.headers.get('Authorization')
+        
+        if not token:
+            return jsonify({'message': 'Token is missing'}), 401
+        
+        try:
+            if token.startswith('Bearer '):
+                token = token[7:]
+            data = decode_token(token)
+            current_user = get_cached_user(data['user_id'])
+            if not current_user:
+                return jsonify({'message': 'User not found'}), 401
+        except PoolTimeout:
+            raise
+        except Exception as e:
+            logging.error(f"Token validation error: {e}")
+            return jsonify({'message': 'Token validation failed'}), 401
+        
+        return f(current_user, *args, **kwargs)
+    
+    return decorated
+
+def decode_token(token):
+    """Verify a JWT, reusing the payload of recently verified tokens"""
+    data = token_cache.get(token)
+    if data is None:
+        import jwt
+        data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
+        # Never cache a payload beyond the token's own expiry
+        ttl = min(token_cache.ttl, data['exp'] - time.time()) if 'exp' in data else token_cache.ttl
+        if ttl > 0:
+            token_cache.set(token, data, ttl=ttl)
+    return data
+
+def issue_token(user_id):
+    """Sign a JWT for a user, valid for 30 days"""
+    import jwt
+    return jwt.encode({
+        'user_id': user_id,
+        'exp': datetime.datetime.utcnow() + datetime.timedelta(days=30)
+    }, app.config['SECRET_KEY'], algorithm='HS256')
+
+def get_cached_user(user_id):
+    """Return a user by id, served from the user cache when possible"""
+    user = user_cache.get(user_id)
+    if user is None:
+        user = get_user_by_id(user_id)
+        if user:
+            user_cache.set(user_id, user)
+    return user
+
+def optional_user():
+    """The authenticated user on routes that also serve anonymous callers, or None"""
+    token = request.headers.get('Authorization')
+    if not token:
+        return None
+    try:
+        if token.startswith('Bearer '):
+            token = token[7:]
+        return get_cached_user(decode_token(token)['user_id'])
+    except PoolTimeout:
+        raise
+    except Exception:
+        return None
+
+def invalidate_user(user_id):
+    """Drop a user from the cache after their profile changes"""
+    user_cache.delete(user_id)
+
+# Database helper functions
+# Columns loaded for authenticated requests; these rows are cached, possibly in
+# shared Redis, so they never include the password hash
+USER_COLUMNS = ('id', 'name', 'email', 'user_type', 'skills', 'company')
+
+# Hot-path SQL, shared with the query plan check in migrations.py
+USER_BY_ID_QUERY = "SELECT " + ', '.join(USER_COLUMNS) + " FROM users WHERE id = %s"
+USER_BY_EMAIL_QUERY = "SELECT * FROM users WHERE email = %s"
+RECOMMENDATIONS_QUERY = (
+    "SELECT r.score, r.skill_match_count, i.* FROM recommendations r "
+    "JOIN internships i ON i.id = r.internship_id WHERE r.user_id = %s ORDER BY r.position"
+)
+# Application pages, formatted with their WHERE conditions
+STUDENT_APPLICATIONS_QUERY = (
+    "SELECT a.*, i.title, i.company FROM applications a JOIN internships i ON i.id = a.internship_id "
+    "WHERE {} ORDER BY a.applied_at DESC, a.id DESC LIMIT %s"
+)
+INTERNSHIP_APPLICATIONS_QUERY = (
+    "SELECT a.*, u.name, u.email FROM applications a JOIN users u ON u.id = a.user_id "
+    "WHERE {} ORDER BY a.id DESC LIMIT %s"
+)
+APPLICATION_STATUS_UPDATE = "UPDATE applications SET status = %s WHERE id = %s AND internship_id = %s"
+
+def get_user_by_id(user_id):
+    """A user's USER_COLUMNS by id, or None"""
+    try:
+        return db_query(USER_BY_ID_QUERY, (user_id,), fetch='one')
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        logging.error(f"Error getting user by id: {e}")
+        return None
+
+def get_user_by_email(email):
+    try:
+        return db_query(USER_BY_EMAIL_QUERY, (email,), fetch='one')
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        logging.error(f"Error getting user by email: {e}")
+        return None
+
+def encode_cursor(values):
+    """Encode keyset pagination values as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, or None if it is invalid"""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        return None
+
+def internship_from_row(row):
+    """Convert an internships row into the API representation"""
+    skills = row.get('skills') or []
+    if isinstance(skills, (str, bytes)):
+        skills = json.loads(skills)
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'company': row['company'],
+        'location': row['location'],
+        'type': row['type'],
+        'field': row.get('field'),
+        'duration': row['duration'],
+        'stipend': row['stipend'],
+        'description': row['description'],
+        'skills': skills,
+        'experienceRequired': row['experience_required'] or 'No experience required',
+        'postedDate': row['created_at'].strftime('%Y-%m-%d') if row.get('created_at') else None
+    }
+
+def read_catalog_generation():
+    """The catalog_state generation, or None when the table is missing (migration 6 not applied)"""
+    try:
+        row = db_query("SELECT generation FROM catalog_state WHERE id = 1", fetch='one')
+    except Exception as e:
+        logging.error(f"Error reading the catalog generation: {e}")
+        return None
+    return row['generation'] if row else None
+
+def set_catalog_baseline(generation, rows_max_id):
+    """Record what the first full load saw; later full loads leave the baseline alone"""
+    global catalog_generation, catalog_max_id, catalog_checked_at
+    if catalog_generation is None:
+        catalog_generation = generation
+        catalog_max_id = rows_max_id
+        catalog_checked_at = time.monotonic()
+
+def load_skill_vocabulary():
+    """Load the distinct catalog skills into the vocabulary index"""
+    generation = read_catalog_generation()
+    max_id = db_query("SELECT MAX(id) AS max_id FROM internships", fetch='one')['max_id'] or 0
+    rows = db_query("SELECT DISTINCT skill FROM internship_skills")
+    with vocabulary_lock:
+        for row in rows:
+            skill_vocabulary.add(row['skill'], [row['skill']])
+    set_catalog_baseline(generation, max_id)
+
+def ensure_skill_vocabulary_loaded():
+    """Load the skill vocabulary once per process, however many requests race to do it"""
+    global skill_vocabulary_loaded
+    if not skill_vocabulary_loaded:
+        with catalog_load_lock:
+            if not skill_vocabulary_loaded:
+                load_skill_vocabulary()
+                skill_vocabulary_loaded = True
+    refresh_catalog()
+
+def index_catalog_rows(rows, generation=None):
+    """Load internships rows into the in-memory catalog index, unless another thread already has"""
+    global catalog_loaded
+    with catalog_load_lock:
+        if catalog_loaded:
+            return
+        for row in rows:
+            ai_service.index_internship(internship_from_row(row))
+        catalog_loaded = True
+        set_catalog_baseline(generation, max((row['id'] for row in rows), default=0))
+
+def ensure_catalog_loaded():
+    """Load the internships table into the in-memory catalog index on first use, then keep it current"""
+    if not catalog_loaded:
+        with catalog_load_lock:
+            if not catalog_loaded:
+                generation = read_catalog_generation()
+                index_catalog_rows(db_query("SELECT * FROM internships"), generation)
+    refresh_catalog()
+
+def refresh_catalog(force=False):
+    """Index internships that other processes inserted since this process last looked.
+
+    Every insert bumps catalog_state.generation first thing in its transaction
+    (see insert_internships). The row lock this takes serializes inserts, so
+    internship ids become visible in increasing order and the rows to load are
+    exactly those above the highest id already read. catalog_state is polled
+    at most every CATALOG_REFRESH_INTERVAL seconds.
+    """
+    global catalog_generation, catalog_max_id, catalog_checked_at
+    if catalog_generation is None:
+        return
+    if not force and time.monotonic() - catalog_checked_at < app.config['CATALOG_REFRESH_INTERVAL']:
+        return
+    with catalog_load_lock:
+        if not force and time.monotonic() - catalog_checked_at < app.config['CATALOG_REFRESH_INTERVAL']:
+            return
+        catalog_checked_at = time.monotonic()
+        generation = read_catalog_generation()
+        if generation is None or generation == catalog_generation:
+            return
+        rows = db_query("SELECT * FROM internships WHERE id > %s ORDER BY id", (catalog_max_id,))
+        skills = db_query("SELECT DISTINCT skill FROM internship_skills WHERE internship_id > %s", (catalog_max_id,))
+        with vocabulary_lock:
+            for row in skills:
+                skill_vocabulary.add(row['skill'], [row['skill']])
+        if catalog_loaded:
+            for row in rows:
+                ai_service.index_internship(internship_from_row(row))
+        if rows:
+            catalog_max_id = rows[-1]['id']
+        catalog_generation = generation
+    search_cache.invalidate()
+
+def build_catalog_query(user_skills, career_fields, preferences, limit=15, cursor=None):
+    """Build the SQL for one page of catalog search results.
+
+    User skills are expanded against the catalog skill vocabulary (substring
+    match, as in ViinternsAIService) so the database only does exact lookups
+    on the internship_skills index. Results are ordered newest first.
+    Returns (query, params), or None when there is no skill to match.
+    """
+    catalog_skills = set()
+    with vocabulary_lock:
+        for skill in user_skills:
+            catalog_skills |= skill_vocabulary.matching_skills(normalize_skill(skill))
+    if not catalog_skills:
+        # Skills posted since the vocabulary was last refreshed can still match exactly
+        catalog_skills = {normalize_skill(skill) for skill in user_skills} - {''}
+        if not catalog_skills:
+            return None
+
+    conditions = ["EXISTS (SELECT 1 FROM internship_skills s WHERE s.internship_id = i.id AND s.skill IN ({}))".format(
+        ', '.join(['%s'] * len(catalog_skills)))]
+    params = sorted(catalog_skills)
+
+    if career_fields:
+        conditions.append("i.field IN ({})".format(', '.join(['%s'] * len(career_fields))))
+        params.extend(career_fields)
+
+    # Locations the gazetteer knows are filtered in the catalog index instead (see uses_catalog_index)
+    location = preferences.get('location')
+    if location:
+        conditions.append("i.location = %s")
+        params.append(location)
+
+    types = preferences.get('type')
+    if types:
+        types = [types] if isinstance(types, str) else list(types)
+        conditions.append("i.type IN ({})".format(', '.join(['%s'] * len(types))))
+        params.extend(types)
+
+    if cursor:
+        position = decode_cursor(cursor)
+        if not position or 'id' not in position:
+            raise ValueError('Invalid cursor')
+        conditions.append("i.id < %s")
+        params.append(int(position['id']))
+
+    query = "SELECT i.* FROM internships i WHERE " + ' AND '.join(conditions) + " ORDER BY i.id DESC LIMIT %s"
+    return query, params + [limit + 1]
+
+def catalog_page(rows, limit, user_skills):
+    """Turn fetched catalog rows into (internships, next_cursor), scoring only the returned page"""
+    user_skills = [normalize_skill(skill) for skill in user_skills]
+    next_cursor = encode_cursor({'id': rows[limit - 1]['id']}) if len(rows) > limit else None
+    internships = [internship_from_row(row) for row in rows[:limit]]
+
+    with metrics.timer('matching'):
+        index = SkillIndex()
+        for position, internship in enumerate(internships):
+            index.add(position, internship['skills'])
+        counts = index.match_counts(user_skills)
+        for position, internship in enumerate(internships):
+            internship['skillMatchCount'] = counts.get(position, 0)
+            internship['skillMatchRatio'] = internship['skillMatchCount'] / len(user_skills) if user_skills else 0
+
+    return internships, next_cursor
+
+def search_catalog(user_skills, career_fields, preferences, limit=15, cursor=None):
+    """Search the internships table; returns (internships, next_cursor)"""
+    ensure_skill_vocabulary_loaded()
+    catalog_query = build_catalog_query(user_skills, career_fields, preferences, limit, cursor)
+    if catalog_query is None:
+        return [], None
+    return catalog_page(db_query(*catalog_query), limit, user_skills)
+
+def search_cache_key(search_criteria, limit, cursor):
+    """Canonical hash of search criteria, insensitive to case and ordering"""
+    preferences = search_criteria['preferences'] or {}
+    canonical = {
+        'skills': sorted({normalize_skill(skill) for skill in search_criteria['skills'] or []}),
+        'careerFields': sorted(set(search_criteria['careerFields'] or [])),
+        'preferences': {key: preferences[key] for key in sorted(preferences)},
+        'sort': search_criteria.get('sort'),
+        'offset': search_criteria.get('offset'),
+        'limit': limit,
+        'cursor': cursor
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+SEARCH_SORTS = ('newest', 'relevance')
+
+def string_list(value, name):
+    """A list of strings given as a list or a comma separated string; raises ValueError"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(',') if part.strip()]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f'{name} must be a list of strings')
+    return value
+
+def search_preferences(preferences):
+    """Validate search preferences and fold the frontend's work mode into type filters; raises ValueError.
+
+    workMode is an alias of type. A 'Remote' location is a work mode rather
+    than a place, so it becomes a Remote type filter.
+    """
+    if preferences is None:
+        preferences = {}
+    if not isinstance(preferences, dict):
+        raise ValueError('Invalid preferences')
+    preferences = dict(preferences)
+    types = string_list(preferences.pop('type', None) or None, 'type')
+    work_modes = string_list(preferences.pop('workMode', None) or None, 'workMode')
+    types = types or work_modes
+    location = preferences.get('location')
+    if location is not None and not isinstance(location, str):
+        raise ValueError('location must be a string')
+    if location is not None and location.strip().lower() == 'remote':
+        del preferences['location']
+        if 'Remote' not in types:
+            types = types + ['Remote']
+    if types:
+        preferences['type'] = types
+    preference_ranges(preferences)
+    preference_location(preferences)
+    return preferences
+
+def parse_search_request(data):
+    """Extract (search criteria, limit, cursor) from a search request body; raises ValueError"""
+    search_criteria = {
+        'skills': string_list(data.get('skills'), 'skills'),
+        'careerFields': string_list(data.get('careerFields'), 'careerFields'),
+        'preferences': search_preferences(data.get('preferences')),
+        'sort': data.get('sort', 'newest')
+    }
+    if search_criteria['sort'] not in SEARCH_SORTS:
+        raise ValueError('Invalid sort')
+    try:
+        limit = min(max(int(data.get('limit', 15)), 1), 100)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid limit')
+    try:
+        search_criteria['offset'] = max(int(data.get('offset', 0)), 0)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid offset')
+    return search_criteria, limit, data.get('cursor')
+
+def search_response(internships, next_cursor):
+    """Build the /api/search-jobs response from a page of catalog results.
+
+    An empty page is returned as is: generated suggestions would ignore the
+    filters, have no id to apply to, and end up in the search cache.
+    """
+    return {
+        'message': f'Found {len(internships)} internships matching your skills',
+        'internships': internships,
+        'next_cursor': next_cursor,
+        'sources': ['Viinterns Catalog']
+    }
+
+def uses_catalog_index(search_criteria):
+    """Relevance ranking, stipend/duration ranges and gazetteer locations are served from the in-memory catalog"""
+    preferences = search_criteria['preferences'] or {}
+    return (search_criteria.get('sort') == 'relevance' or bool(preference_ranges(preferences))
+            or preference_location(preferences) is not None)
+
+def rank_catalog(search_criteria, limit, cursor):
+    """Page of the in-memory catalog, relevance-ranked or newest first; returns (internships, next_cursor)"""
+    if search_criteria.get('sort') != 'relevance':
+        before_id = None
+        if cursor:
+            position = decode_cursor(cursor)
+            if not position or 'id' not in position:
+                raise ValueError('Invalid cursor')
+            before_id = int(position['id'])
+        with metrics.timer('matching'):
+            internships = ai_service.newest_catalog(
+                search_criteria['skills'],
+                search_criteria['careerFields'],
+                search_criteria['preferences'],
+                limit=limit + 1,
+                before_id=before_id
+            )
+        next_cursor = encode_cursor({'id': internships[limit - 1]['id']}) if len(internships) > limit else None
+        return internships[:limit], next_cursor
+    
+    offset = search_criteria.get('offset', 0)
+    if cursor:
+        position = decode_cursor(cursor)
+        if not position or 'offset' not in position:
+            raise ValueError('Invalid cursor')
+        offset = int(position['offset'])
+    
+    # One extra result tells whether there is a next page
+    with metrics.timer('matching'):
+        internships = ai_service.match_catalog(
+            search_criteria['skills'],
+            search_criteria['careerFields'],
+            search_criteria['preferences'],
+            limit=limit + 1,
+            offset=offset
+        )
+    next_cursor = encode_cursor({'offset': offset + limit}) if len(internships) > limit else None
+    return internships[:limit], next_cursor
+
+def run_search(search_criteria, limit, cursor):
+    """Run a catalog search; raises ValueError for an invalid cursor"""
+    if uses_catalog_index(search_criteria):
+        ensure_catalog_loaded()
+        internships, next_cursor = rank_catalog(search_criteria, limit, cursor)
+    else:
+        internships, next_cursor = search_catalog(
+            search_criteria['skills'],
+            search_criteria['careerFields'],
+            search_criteria['preferences'],
+            limit=limit,
+            cursor=cursor
+        )
+    return search_response(internships, next_cursor)
+
+def catalog_changed():
+    """Invalidate search results and recommendations after an internship is inserted or updated"""
+    search_cache.invalidate()
+    enqueue_recommendations()
+
+def enqueue_recommendations(user_id=None):
+    """Queue a recompute of one student's recommendations, or of every student's when user_id is None.
+
+    Nothing is queued when a job covering the same student is already waiting.
+    """
+    try:
+        db_query(
+            "INSERT INTO recommendation_jobs (user_id) SELECT %s FROM DUAL WHERE NOT EXISTS ("
+            "SELECT 1 FROM recommendation_jobs WHERE status = 'queued' AND (user_id IS NULL OR user_id <=> %s))",
+            (user_id, user_id),
+            fetch=None
+        )
+    except Exception as e:
+        logging.error(f"Error queueing recommendations: {e}")
+
+# Internship posting
+INTERNSHIP_TYPES = ('Remote', 'Hybrid', 'On-site')
+INTERNSHIP_COLUMNS = ('title', 'company', 'location', 'type', 'duration', 'stipend', 'description',
+                      'skills', 'field', 'experience_required', 'posted_by')
+SKILL_MAX_LENGTH = 100
+
+def validate_internship(data):
+    """Validate a posted internship; returns (row values by column, list of errors)"""
+    errors = []
+    values = {}
+    for key, column, max_length in (('title', 'title', 255), ('company', 'company', 255), ('location', 'location', 255),
+                                    ('duration', 'duration', 50), ('stipend', 'stipend', 100),
+                                    ('experienceRequired', 'experience_required', 100)):
+        value = data.get(key)
+        value = str(value).strip() if value is not None else ''
+        if len(value) > max_length:
+            errors.append(f'{key} is longer than {max_length} characters')
+        values[column] = value or None
+    for key in ('title', 'company'):
+        if not values[key]:
+            errors.append(f'{key} is required')
+
+    values['description'] = str(data.get('description') or '').strip() or None
+
+    values['type'] = data.get('type') or None
+    if values['type'] and (not isinstance(values['type'], str) or values['type'] not in INTERNSHIP_TYPES):
+        errors.append(f"type must be one of {', '.join(INTERNSHIP_TYPES)}")
+
+    values['field'] = data.get('field') or None
+    if values['field'] and (not isinstance(values['field'], str) or values['field'] not in ai_service.field_keywords):
+        errors.append('Unknown field')
+
+    skills = data.get('skills') or []
+    if isinstance(skills, str):
+        skills = [skill for skill in (part.strip() for part in skills.split(',')) if skill]
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        errors.append('skills must be a list of strings')
+        skills = []
+    # internship_skills.skill is VARCHAR(100) and stores the normalized form
+    for skill in skills:
+        if len(normalize_skill(skill)) > SKILL_MAX_LENGTH:
+            errors.append(f'skill {skill[:20]!r}... is longer than {SKILL_MAX_LENGTH} characters')
+    values['skills'] = skills
+
+    return values, errors
+
+def insert_internships(cur, rows, posted_by):
+    """Insert validated internships with one multi-row INSERT; returns the new internships.
+
+    Must run in a transaction: bumping the catalog generation first locks its
+    row until commit, which tells other processes to refresh (refresh_catalog)
+    and keeps ids committed in increasing order.
+    """
+    cur.execute("UPDATE catalog_state SET generation = generation + 1 WHERE id = 1")
+    cur.execute(
+        "INSERT INTO internships (" + ', '.join(INTERNSHIP_COLUMNS) + ") VALUES " +
+        ', '.join(['(' + ', '.join(['%s'] * len(INTERNSHIP_COLUMNS)) + ')'] * len(rows)),
+        [json.dumps(row['skills']) if column == 'skills' else posted_by if column == 'posted_by' else row[column]
+         for row in rows for column in INTERNSHIP_COLUMNS]
+    )
+    # A multi-row INSERT reports the first id; ids of a single statement are consecutive
+    first_id = cur.lastrowid
+    posted_date = datetime.datetime.now().strftime('%Y-%m-%d')
+    internships = []
+    skill_rows = []
+    for offset, row in enumerate(rows):
+        internship = internship_from_row(dict(row, id=first_id + offset))
+        internship['postedDate'] = posted_date
+        internships.append(internship)
+        for skill in {normalize_skill(skill) for skill in row['skills']} - {''}:
+            skill_rows.append((internship['id'], skill))
+    if skill_rows:
+        cur.executemany("INSERT INTO internship_skills (internship_id, skill) VALUES (%s, %s)", skill_rows)
+    with vocabulary_lock:
+        for internship_id, skill in skill_rows:
+            skill_vocabulary.add(skill, [skill])
+    return internships
+
+def index_new_internships(internships):
+    """Incrementally update the in-memory indexes and caches after internships are added"""
+    # Waits out a load in progress, which may have read the table before these rows were committed
+    with catalog_load_lock:
+        if catalog_loaded:
+            for internship in internships:
+                ai_service.index_internship(internship)
+    catalog_changed()
+
+def iter_upload_records(stream, content_type):
+    """Yield (row number, record) from a CSV or NDJSON upload without reading it all into memory"""
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    if 'csv' in content_type:
+        for number, record in enumerate(csv.DictReader(text), start=1):
+            yield number, record
+    else:
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield number, None
+                continue
+            yield number, record if isinstance(record, dict) else None
+
+# Applications
+APPLICATION_STATUSES = ('Pending', 'Approved', 'Rejected')
+BULK_STATUS_BATCH_SIZE = 1000
+
+def page_limit(value, default=20, maximum=100):
+    """Parse a page size; raises ValueError"""
+    try:
+        return min(max(int(value if value is not None else default), 1), maximum)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid limit')
+
+def application_from_row(row):
+    application = {
+        'id': row['id'],
+        'userId': row['user_id'],
+        'internshipId': row['internship_id'],
+        'status': row['status'],
+        'appliedAt': row['applied_at'].isoformat() if row.get('applied_at') else None
+    }
+    if 'title' in row:
+        application['internship'] = {'title': row['title'], 'company': row['company']}
+    if 'name' in row:
+        application['applicant'] = {'name': row['name'], 'email': row['email']}
+    return application
+
+def get_owned_internship(internship_id, user):
+    """Return the internship if it was posted by this recruiter, else None"""
+    if user.get('user_type') != 'recruiter':
+        return None
+    return db_query(
+        "SELECT id, posted_by FROM internships WHERE id = %s AND posted_by = %s",
+        (internship_id, user['id']),
+        fetch='one'
+    )
+
+# Resume parsing
+RESUME_EXTENSIONS = {'pdf', 'docx'}
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+resume_executor = ThreadPoolExecutor(max_workers=app.config['RESUME_WORKERS'], thread_name_prefix='resume')
+# Parsed resumes by content hash, and job state by job id. Both are shared so a
+# status poll can be answered by any worker, not just the one that took the upload.
+resume_cache = make_cache('resumes', app.config['RESUME_CACHE_SIZE'], app.config['RESUME_CACHE_TTL'])
+resume_jobs = make_cache('resume_jobs', 10000, app.config['RESUME_JOB_TTL'])
+
+def hash_upload(stream):
+    """sha256 hex digest of an upload, read in chunks; the stream is rewound afterwards"""
+    digest = hashlib.sha256()
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+def save_upload(stream, extension):
+    """Copy an upload to a temporary file for parsing, returning its path.
+
+    The file belongs to the parsing job, which deletes it when done.
+    """
+    path = os.path.join(app.config['UPLOAD_FOLDER'], f'{uuid.uuid4().hex}.{extension}')
+    try:
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(stream, f, UPLOAD_CHUNK_SIZE)
+    except Exception:
+        remove_upload(path)
+        raise
+    return path
+
+def remove_upload(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def iter_resume_text(path, extension):
+    """Yield resume text one page (PDF) or paragraph (DOCX) at a time"""
+    # Parsers are imported on first use; most workers never see a resume
+    if extension == 'pdf':
+        import PyPDF2
+        reader = PyPDF2.PdfReader(path)
+        for page in reader.pages:
+            yield page.extract_text() or ''
+    else:
+        import docx
+        for paragraph in docx.Document(path).paragraphs:
+            yield paragraph.text
+
+def parse_resume(path, extension):
+    """Extract field keywords from a resume file"""
+    fields = {}
+    pages = 0
+    for text in iter_resume_text(path, extension):
+        pages += 1
+        for field, keywords in ai_service.extract_skills(text).items():
+            fields.setdefault(field, set()).update(keywords)
+    return {
+        'skills': sorted({keyword.title() for keywords in fields.values() for keyword in keywords}),
+        'careerFields': sorted(fields),
+        'fieldSkills': {field: sorted(keywords) for field, keywords in fields.items()},
+        'sections': pages
+    }
+
+def run_resume_job(job, path, extension, content_hash):
+    try:
+        result = parse_resume(path, extension)
+        resume_cache.set(content_hash, result)
+        job.update(status='done', result=result)
+    except Exception as e:
+        logging.error(f"Resume parsing error: {e}")
+        job.update(status='failed', error='Could not parse resume')
+    finally:
+        remove_upload(path)
+    # Jobs may live in Redis, so the finished state is written back rather than mutated in place
+    resume_jobs.set(job['id'], job)
+
+# Chat assistant
+# Intents in priority order: when a message matches several, the first wins
+CHAT_INTENTS = (
+    ('greeting', ('hello', 'hi', 'hey', 'hiya', 'howdy', 'greetings', 'good morning', 'good afternoon', 'good evening')),
+    ('internship', ('internship', 'internships', 'job', 'jobs', 'position', 'positions', 'opening', 'openings',
+                    'role', 'roles', 'vacancy', 'vacancies', 'recommend', 'recommendation', 'recommendations',
+                    'suggest', 'suggestion', 'suggestions', 'match', 'matches')),
+    ('resume', ('resume', 'resumes', 'cv', 'cvs', 'cover letter', 'cover letters')),
+    ('interview', ('interview', 'interviews', 'interviewing', 'interviewer')),
+    ('skills', ('skill', 'skills', 'learn', 'learning', 'course', 'courses', 'certification', 'certifications'))
+)
+
+# Reply per intent. A `<intent>_personalized` variant is used for signed-in users
+# and may reference {name}, {skills} and {matches}. CHAT_TEMPLATES_FILE can
+# override any of these with a JSON object of the same shape.
+DEFAULT_CHAT_TEMPLATES = {
+    'greeting': "Hello! I'm your Viinterns assistant. I can help you find no-experience internships, improve your resume, or prepare for interviews.",
+    'greeting_personalized': "Hello {name}! I'm your Viinterns assistant. I can help you find no-experience internships, improve your resume, or prepare for interviews.",
+    'internship': "I can help you find internships that require no prior experience! Check your dashboard for personalized recommendations.",
+    'internship_personalized': "Based on your skills ({skills}), these no-experience internships look like a good fit: {matches}. Check your dashboard for more personalized recommendations.",
+    'resume': "For no-experience positions, focus on transferable skills, education, projects, and willingness to learn in your resume.",
+    'interview': "Research the company, practice common questions out loud, and prepare short examples from your projects, coursework, and activities.",
+    'skills': "Add the skills you already have to your profile to get better matches. Communication, teamwork, and willingness to learn count too!",
+    'fallback': "I specialize in helping students find no-experience-required internships! How can I assist you today?"
+}
+
+MAX_CHAT_CLASSIFY_LENGTH = 2000
+
+class IntentClassifier:
+    """Classifies messages by looking up their words and word pairs in a phrase table.
+
+    Matching whole tokens means 'hi' is found in "hi there" but not in "this"
+    or "machine".
+    """
+
+    def __init__(self, intents):
+        self.priority = {}
+        self.phrases = {}  # phrase tokens joined by spaces -> intent
+        self.max_words = 1
+        for rank, (intent, phrases) in enumerate(intents):
+            self.priority[intent] = rank
+            for phrase in phrases:
+                words = tokenize(phrase)
+                self.phrases.setdefault(' '.join(words), intent)
+                self.max_words = max(self.max_words, len(words))
+
+    def classify(self, message):
+        words = tokenize(message[:MAX_CHAT_CLASSIFY_LENGTH])
+        best = None
+        for size in range(1, self.max_words + 1):
+            for start in range(len(words) - size + 1):
+                intent = self.phrases.get(words[start] if size == 1 else ' '.join(words[start:start + size]))
+                if intent is not None and (best is None or self.priority[intent] < self.priority[best]):
+                    best = intent
+        return best or 'fallback'
+
+def load_chat_templates(path):
+    templates = dict(DEFAULT_CHAT_TEMPLATES)
+    if path:
+        try:
+            with open(path) as f:
+                templates.update(json.load(f))
+        except (OSError, ValueError) as e:
+            logging.error(f"Error loading chat templates from {path}: {e}")
+    return templates
+
+chat_intents = IntentClassifier(CHAT_INTENTS)
+chat_templates = load_chat_templates(app.config['CHAT_TEMPLATES_FILE'])
+
+# Personalized replies by user, intent and skill set
+chat_cache = make_cache('chat', app.config['CHAT_CACHE_SIZE'], app.config['CHAT_CACHE_TTL'])
+
+def user_skills(user):
+    skills = user.get('skills') or []
+    if isinstance(skills, (str, bytes)):
+        try:
+            skills = json.loads(skills)
+        except ValueError:
+            return []
+    return [skill for skill in skills if isinstance(skill, str)] if isinstance(skills, list) else []
+
+def personalized_reply(intent, user, skills):
+    """Fill the intent's personalized template, matching the catalog only when the template needs it"""
+    template = chat_templates.get(f'{intent}_personalized')
+    if not template:
+        return chat_templates[intent]
+    
+    context = {'name': (user.get('name') or '').split(' ')[0], 'skills': ', '.join(skills[:5]), 'matches': ''}
+    if '{matches}' in template:
+        ensure_catalog_loaded()
+        with metrics.timer('matching'):
+            matches = ai_service.match_catalog(skills, limit=3)
+        if not matches:
+            return chat_templates[intent]
+        context['matches'] = '; '.join(f"{match['title']} at {match['company']}" for match in matches)
+    
+    try:
+        return template.format(**context)
+    except (KeyError, IndexError, ValueError) as e:
+        logging.error(f"Invalid chat template for {intent}: {e}")
+        return chat_templates[intent]
+
+def chat_reply(message, user=None):
+    """Answer a chat message, personalized for a signed-in user with skills on their profile"""
+    intent = chat_intents.classify(message)
+    skills = user_skills(user) if user else []
+    if not skills or f'{intent}_personalized' not in chat_templates:
+        return chat_templates[intent]
+    
+    # Keyed on every profile field the templates use, so profile edits are never answered from stale entries
+    digest = hashlib.sha1(json.dumps([user.get('name'), sorted(skills)]).encode('utf-8')).hexdigest()
+    key = f"{user['id']}:{intent}:{digest}"
+    reply = chat_cache.get(key)
+    if reply is None:
+        reply = personalized_reply(intent, user, skills)
+        chat_cache.set(key, reply)
+    return reply
+
+def collect_gauges():
+    """Pool, cache and hashing figures exported on /metrics"""
+    values = {}
+    for key, value in db_pool.metrics().items():
+        values[(f'viinterns_db_pool_{key}', ())] = value
+    for name, cache in (('users', user_cache), ('tokens', token_cache), ('search', search_cache), ('resumes', resume_cache),
+                        ('chat', chat_cache)):
+        for key, value in cache.stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[(f'viinterns_cache_{key}', (('cache', name),))] = value
+    values[('viinterns_bcrypt_rejected_total', ())] = password_hasher.rejected
+    for (route, kind), count in list(rate_limited_total.items()):
+        values[('viinterns_rate_limited_total', (('route', route), ('key', kind)))] = count
+    values[('viinterns_requests_in_flight', ())] = admission.in_flight
+    values[('viinterns_requests_shed_total', ())] = admission.shed
+    return values
+
+metrics.register_gauges(collect_gauges)
+
+# Response encoding
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson')
+STREAM_FLUSH_BYTES = 64 * 1024
+
+def dumps(value):
+    """Serialize to compact JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, default=str, separators=(',', ':')).encode('utf-8')
+
+def body_etag(body):
+    """Weak ETag value for a response body"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def json_response(payload, status=200):
+    """JSON response with a weak ETag; a matching If-None-Match gets 304.
+
+    Search endpoints are POSTed but side-effect free, so conditional requests
+    are honoured for any method.
+    """
+    body = dumps(payload)
+    etag = body_etag(body)
+    if status == 200 and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, status=status, mimetype='application/json')
+    response.set_etag(etag, weak=True)
+    return response
+
+def stream_json(envelope, key, items):
+    """Stream `envelope` as a JSON object whose `key` is an array built from `items`"""
+    def generate():
+        head = dumps(dict(envelope, **{key: []}))
+        yield head[:-2]
+        for position, item in enumerate(items):
+            yield (b',' if position else b'') + dumps(item)
+        yield b']}'
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+def stream_ndjson(items):
+    """Stream `items` as newline-delimited JSON"""
+    def generate():
+        for item in items:
+            yield dumps(item) + b'\n'
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def make_compressor(encoding):
+    """Return (compress, flush, finish) callables for a content encoding"""
+    level = app.config['COMPRESS_LEVEL']
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=min(level, 11))
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+def negotiate_encoding(accept_encodings):
+    """Best content encoding we support from a parsed Accept-Encoding header, or None"""
+    return accept_encodings.best_match(['br', 'gzip'] if brotli is not None else ['gzip'])
+
+def compress_body(body, encoding):
+    """Compress a whole response body"""
+    compress, flush, finish = make_compressor(encoding)
+    return compress(body) + finish()
+
+def iter_compressed(chunks, encoding):
+    """Compress a streamed body, flushing every STREAM_FLUSH_BYTES of input so clients see progress"""
+    compress, flush, finish = make_compressor(encoding)
+    pending = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        pending += len(chunk)
+        data = compress(chunk)
+        if pending >= STREAM_FLUSH_BYTES:
+            data += flush()
+            pending = 0
+        if data:
+            yield data
+    yield finish()
+
+@app.after_request
+def compress_response(response):
+    """gzip or brotli JSON responses above COMPRESS_MIN_BYTES, honouring Accept-Encoding"""
+    if (response.status_code != 200 or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+    if not response.is_streamed and response.content_length is not None \
+            and response.content_length < app.config['COMPRESS_MIN_BYTES']:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    
+    if response.is_streamed:
+        response.response = iter_compressed(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(compress_body(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+# Routes
+@app.route('/')
+def home():
+    return jsonify({
+        'message': 'Viinterns Backend API',
+        'status': 'running',
+        'version': '1.0'
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/health')
+def health():
+    return jsonify({
+        'status': 'running',
+        'pool': db_pool.metrics(),
+        'caches': {
+            'users': user_cache.stats(),
+            'tokens': token_cache.stats(),
+            'search': search_cache.stats()
+        },
+        'admission': {
+            'limit': admission.limit,
+            'in_flight': admission.in_flight,
+            'shed': admission.shed
+        }
+    })
+
+@app.route('/api/register', methods=['POST'])
+@rate_limited('register')
+def register():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No JSON data received'}), 400
+            
+        name = data.get('name')
+        email = data.get('email')
+        phone = data.get('phone')
+        password = data.get('password')
+        user_type = data.get('userType', 'student')
+        
+        if not all([name, email, password]):
+            return jsonify({'message': 'Missing required fields'}), 400
+        
+        # Check if user already exists
+        existing_user = get_user_by_email(email)
+        if existing_user:
+            return jsonify({'message': 'User already exists'}), 400
+        
+        # Hash password
+        hashed_password = password_hasher.hash(password)
+        
+        # Insert user
+        with db_cursor(transaction=True) as cur:
+            cur.execute("""
+                INSERT INTO users (name, email, phone, password, user_type) 
+                VALUES (%s, %s, %s, %s, %s)
+            """, (name, email, phone, hashed_password, user_type))
+            user_id = cur.lastrowid
+        
+        # Generate token
+        token = issue_token(user_id)
+        
+        user_data = {
+            'id': user_id,
+            'name': name,
+            'email': email,
+            'phone': phone,
+            'userType': user_type
+        }
+        
+        # Add additional fields based on user type
+        if user_type == 'student':
+            user_data['skills'] = data.get('skills', [])
+        else:
+            user_data['company'] = data.get('company', '')
+        
+        return jsonify({
+            'message': 'User created successfully',
+            'token': token,
+            'user': user_data
+        }), 201
+        
+    except (HasherBusy, RateLimited, PoolTimeout):
+        raise
+    except Exception as e:
+        logging.error(f"Registration error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/login', methods=['POST'])
+@rate_limited('login')
+def login():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No JSON data received'}), 400
+            
+        email = data.get('email')
+        password = data.get('password')
+        
+        if not all([email, password]):
+            return jsonify({'message': 'Missing email or password'}), 400
+        
+        # Slow down password guessing against one account from many addresses
+        check_rate_limit('login', email=str(email).strip().lower())
+        
+        # Get user
+        user = get_user_by_email(email)
+        if not user:
+            return jsonify({'message': 'Invalid credentials'}), 401
+        
+        # Check password
+        if not password_hasher.verify(password, user['password']):
+            return jsonify({'message': 'Invalid credentials'}), 401
+        
+        # Upgrade hashes made with an outdated cost factor
+        if password_hasher.needs_rehash(user['password']):
+            try:
+                db_query(
+                    "UPDATE users SET password = %s WHERE id = %s",
+                    (password_hasher.hash(password), user['id']),
+                    fetch=None
+                )
+                invalidate_user(user['id'])
+            except (HasherBusy, PoolTimeout):
+                pass
+        
+        # Generate token
+        token = issue_token(user['id'])
+        
+        user_data = {
+            'id': user['id'],
+            'name': user['name'],
+            'email': user['email'],
+            'phone': user['phone'],
+            'userType': user['user_type']
+        }
+        
+        return jsonify({
+            'message': 'Login successful',
+            'token': token,
+            'user': user_data
+        }), 200
+        
+    except (HasherBusy, RateLimited, PoolTimeout):
+        raise
+    except Exception as e:
+        logging.error(f"Login error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/profile', methods=['PUT'])
+@token_required
+def update_profile(current_user):
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No JSON data received'}), 400
+        
+        updates = {}
+        for key, column in (('name', 'name'), ('phone', 'phone'), ('company', 'company')):
+            if key in data:
+                updates[column] = data[key]
+        if 'skills' in data:
+            if not isinstance(data['skills'], list):
+                return jsonify({'message': 'Skills must be a list'}), 400
+            updates['skills'] = json.dumps(data['skills'])
+        
+        if not updates:
+            return jsonify({'message': 'No profile fields to update'}), 400
+        
+        with db_cursor(transaction=True) as cur:
+            cur.execute(
+                "UPDATE users SET " + ', '.join(f'{column} = %s' for column in updates) + " WHERE id = %s",
+                list(updates.values()) + [current_user['id']]
+            )
+        invalidate_user(current_user['id'])
+        if 'skills' in updates:
+            enqueue_recommendations(current_user['id'])
+        
+        return jsonify({'message': 'Profile updated successfully'}), 200
+        
+    except Exception as e:
+        logging.error(f"Profile update error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/search-jobs', methods=['POST'])
+@rate_limited('search')
+def search_jobs():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No JSON data received'}), 400
+        
+        try:
+            search_criteria, limit, cursor = parse_search_request(data)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        
+        try:
+            result = search_cache.get_or_compute(
+                search_cache_key(search_criteria, limit, cursor),
+                lambda: run_search(search_criteria, limit, cursor)
+            )
+        except ValueError:
+            return jsonify({'message': 'Invalid cursor'}), 400
+        
+        return json_response(result)
+        
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        logging.error(f"Job search error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/search-jobs/batch', methods=['POST'])
+@rate_limited('batch')
+def search_jobs_batch():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No JSON data received'}), 400
+        
+        profiles = data.get('profiles')
+        if not isinstance(profiles, list) or not all(isinstance(profile, dict) for profile in profiles):
+            return jsonify({'message': 'profiles must be a list of objects'}), 400
+        if len(profiles) > app.config['BATCH_MAX_PROFILES']:
+            return jsonify({'message': f"At most {app.config['BATCH_MAX_PROFILES']} profiles per batch"}), 400
+        try:
+            profiles = [{
+                'skills': string_list(profile.get('skills'), 'skills'),
+                'careerFields': string_list(profile.get('careerFields'), 'careerFields'),
+                'preferences': search_preferences(profile.get('preferences'))
+            } for profile in profiles]
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        
+        try:
+            limit = min(max(int(data.get('limit', 15)), 1), 100)
+        except (TypeError, ValueError):
+            return jsonify({'message': 'Invalid limit'}), 400
+        
+        ensure_catalog_loaded()
+        
+        results = (
+            {'index': position, 'internships': internships}
+            for position, internships in enumerate(ai_service.match_batch(profiles, limit=limit))
+        )
+        if data.get('format') == 'json':
+            return stream_json({'count': len(profiles)}, 'results', results)
+        return stream_ndjson(results)
+        
+    except Exception as e:
+        logging.error(f"Batch job search error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/chat', methods=['POST'])
+def chat():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No JSON data received'}), 400
+            
+        message = data.get('message', '')
+        if not isinstance(message, str):
+            return jsonify({'message': 'message must be a string'}), 400
+        
+        return jsonify({'response': chat_reply(message, optional_user())}), 200
+        
+    except Exception as e:
+        logging.error(f"Chat error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/resume', methods=['POST'])
+@token_required
+def upload_resume(current_user):
+    try:
+        upload = request.files.get('resume')
+        if not upload or not upload.filename:
+            return jsonify({'message': 'No resume file received'}), 400
+        
+        extension = upload.filename.rsplit('.', 1)[-1].lower() if '.' in upload.filename else ''
+        if extension not in RESUME_EXTENSIONS:
+            return jsonify({'message': 'Resume must be a PDF or DOCX file'}), 400
+        
+        content_hash = hash_upload(upload.stream)
+        job_id = uuid.uuid4().hex
+        job = {'id': job_id, 'userId': current_user['id'], 'status': 'pending', 'contentHash': content_hash}
+        
+        # Re-uploads of an already parsed resume are answered from the cache, without touching disk
+        cached = resume_cache.get(content_hash)
+        if cached is not None:
+            job.update(status='done', result=cached)
+            resume_jobs.set(job_id, job)
+            return jsonify({'jobId': job_id, 'status': 'done', 'result': cached}), 200
+        
+        path = save_upload(upload.stream, extension)
+        resume_jobs.set(job_id, job)
+        try:
+            resume_executor.submit(run_resume_job, job, path, extension, content_hash)
+        except Exception:
+            remove_upload(path)
+            raise
+        return jsonify({'jobId': job_id, 'status': 'pending'}), 202
+        
+    except Exception as e:
+        logging.error(f"Resume upload error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/resume/<job_id>', methods=['GET'])
+@token_required
+def resume_status(current_user, job_id):
+    job = resume_jobs.get(job_id)
+    if not job or job['userId'] != current_user['id']:
+        return jsonify({'message': 'Resume job not found'}), 404
+    
+    response = {'jobId': job_id, 'status': job['status']}
+    if job['status'] == 'done':
+        response['result'] = job['result']
+    elif job['status'] == 'failed':
+        response['message'] = job['error']
+    return jsonify(response), 200
+
+@app.route('/api/recommendations', methods=['GET'])
+@token_required
+def get_recommendations(current_user):
+    """A student's precomputed recommendations, best first.
+
+    Status is 'pending' until the worker has computed them once, and 'ready'
+    afterwards even when nothing matched. Profile and catalog changes queue
+    their own recomputes, so a ready student is never queued from here.
+    """
+    try:
+        skill_count = len(user_skills(current_user))
+        if current_user.get('user_type') != 'student' or not skill_count:
+            return json_response({'internships': [], 'status': 'ready', 'computedAt': None})
+        
+        status = db_query(
+            "SELECT computed_at FROM recommendation_status WHERE user_id = %s",
+            (current_user['id'],),
+            fetch='one'
+        )
+        if status is None:
+            enqueue_recommendations(current_user['id'])
+            return json_response({'internships': [], 'status': 'pending', 'computedAt': None})
+        
+        rows = db_query(RECOMMENDATIONS_QUERY, (current_user['id'],))
+        internships = []
+        for row in rows:
+            internship = internship_from_row(row)
+            internship['skillMatchCount'] = row['skill_match_count']
+            internship['skillMatchRatio'] = row['skill_match_count'] / skill_count
+            internship['relevanceScore'] = round(row['score'], 4)
+            internships.append(internship)
+        
+        return json_response({
+            'internships': internships,
+            'status': 'ready',
+            'computedAt': status['computed_at'].strftime('%Y-%m-%d %H:%M:%S')
+        })
+        
+    except Exception as e:
+        logging.error(f"Recommendations error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/internships', methods=['POST'])
+@token_required
+def post_internship(current_user):
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No JSON data received'}), 400
+        if current_user.get('user_type') != 'recruiter':
+            return jsonify({'message': 'Only recruiters can post internships'}), 403
+        
+        values, errors = validate_internship(data)
+        if errors:
+            return jsonify({'message': 'Invalid internship', 'errors': errors}), 400
+        
+        with db_cursor(transaction=True) as cur:
+            internships = insert_internships(cur, [values], current_user['id'])
+        index_new_internships(internships)
+        
+        return jsonify({'message': 'Internship posted successfully', 'internship': internships[0]}), 201
+        
+    except Exception as e:
+        logging.error(f"Post internship error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/internships/search', methods=['GET'])
+@rate_limited('search')
+def search_internships_text():
+    try:
+        query = (request.args.get('q') or '').strip()
+        if not query:
+            return jsonify({'message': 'Missing search query'}), 400
+        try:
+            limit = page_limit(request.args.get('limit'))
+            offset = max(int(request.args.get('offset', 0)), 0)
+        except ValueError:
+            return jsonify({'message': 'Invalid limit or offset'}), 400
+        fuzzy = request.args.get('fuzzy', '1') not in ('0', 'false')
+        
+        ensure_catalog_loaded()
+        with metrics.timer('matching'):
+            internships = ai_service.search_text(query, limit=limit + 1, offset=offset, fuzzy=fuzzy)
+        
+        return json_response({
+            'internships': internships[:limit],
+            'next_offset': offset + limit if len(internships) > limit else None
+        })
+        
+    except Exception as e:
+        logging.error(f"Internship text search error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/internships/bulk', methods=['POST'])
+@token_required
+def bulk_ingest_internships(current_user):
+    """Ingest a CSV (text/csv) or NDJSON (application/x-ndjson) upload in batched transactions.
+
+    Batches are committed as they fill, so a failure part way through reports
+    how many rows were inserted before it.
+    """
+    errors = []
+    error_count = 0
+    inserted = 0
+    try:
+        if current_user.get('user_type') != 'recruiter':
+            return jsonify({'message': 'Only recruiters can post internships'}), 403
+        content_type = request.mimetype or ''
+        if content_type not in ('text/csv', 'application/x-ndjson', 'application/jsonl'):
+            return jsonify({'message': 'Upload must be text/csv or application/x-ndjson'}), 415
+        
+        batch_size = app.config['BULK_INGEST_BATCH_SIZE']
+        max_errors = app.config['BULK_INGEST_MAX_ERRORS']
+        batch = []
+        
+        def flush():
+            nonlocal inserted
+            with db_cursor(transaction=True) as cur:
+                internships = insert_internships(cur, batch, current_user['id'])
+            index_new_internships(internships)
+            inserted += len(internships)
+            batch.clear()
+        
+        for number, record in iter_upload_records(request.stream, content_type):
+            if record is None:
+                values, row_errors = None, ['Malformed row']
+            else:
+                try:
+                    values, row_errors = validate_internship(record)
+                except Exception as e:
+                    logging.error(f"Bulk ingest validation error on row {number}: {e}")
+                    values, row_errors = None, ['Invalid row']
+            if row_errors:
+                error_count += 1
+                if len(errors) < max_errors:
+                    errors.append({'row': number, 'errors': row_errors})
+                continue
+            batch.append(values)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        
+        return jsonify({
+            'message': f'Inserted {inserted} internships',
+            'inserted': inserted,
+            'failed': error_count,
+            'errors': errors
+        }), 200 if not error_count else 207
+        
+    except HTTPException as e:
+        # e.g. 413 once the upload passes BULK_INGEST_MAX_BYTES
+        return jsonify({'message': e.description, 'inserted': inserted, 'failed': error_count, 'errors': errors}), e.code
+    except Exception as e:
+        logging.error(f"Bulk ingest error: {e}")
+        return jsonify({'message': 'Internal server error', 'inserted': inserted}), 500
+
+@app.route('/api/applications', methods=['POST'])
+@token_required
+def apply(current_user):
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No JSON data received'}), 400
+        if current_user.get('user_type') != 'student':
+            return jsonify({'message': 'Only students can apply'}), 403
+        
+        internship_id = data.get('internshipId')
+        if not internship_id:
+            return jsonify({'message': 'Missing internshipId'}), 400
+        if not db_query("SELECT id FROM internships WHERE id = %s", (internship_id,), fetch='one'):
+            return jsonify({'message': 'Internship not found'}), 404
+        
+        try:
+            with db_cursor(transaction=True) as cur:
+                cur.execute(
+                    "INSERT INTO applications (user_id, internship_id) VALUES (%s, %s)",
+                    (current_user['id'], internship_id)
+                )
+                application_id = cur.lastrowid
+        except mysql.connector.errors.IntegrityError:
+            return jsonify({'message': 'Already applied to this internship'}), 409
+        
+        return jsonify({
+            'message': 'Application submitted',
+            'application': {'id': application_id, 'internshipId': internship_id, 'status': 'Pending'}
+        }), 201
+        
+    except Exception as e:
+        logging.error(f"Application error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/applications', methods=['GET'])
+@token_required
+def list_applications(current_user):
+    """A student's own applications, newest first, keyset-paginated on (applied_at, id)"""
+    try:
+        try:
+            limit = page_limit(request.args.get('limit'))
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        
+        conditions = ["a.user_id = %s"]
+        params = [current_user['id']]
+        cursor = request.args.get('cursor')
+        if cursor:
+            position = decode_cursor(cursor)
+            if not position or 'appliedAt' not in position or 'id' not in position:
+                return jsonify({'message': 'Invalid cursor'}), 400
+            conditions.append("(a.applied_at < %s OR (a.applied_at = %s AND a.id < %s))")
+            params.extend([position['appliedAt'], position['appliedAt'], int(position['id'])])
+        
+        rows = db_query(STUDENT_APPLICATIONS_QUERY.format(' AND '.join(conditions)), params + [limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor({'appliedAt': last['applied_at'].strftime('%Y-%m-%d %H:%M:%S'), 'id': last['id']})
+        
+        return jsonify({
+            'applications': [application_from_row(row) for row in rows[:limit]],
+            'next_cursor': next_cursor
+        }), 200
+        
+    except Exception as e:
+        logging.error(f"List applications error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/internships/<int:internship_id>/applications', methods=['GET'])
+@token_required
+def list_internship_applications(current_user, internship_id):
+    """Applicants of a recruiter's internship, optionally filtered by status, keyset-paginated on id"""
+    try:
+        if not get_owned_internship(internship_id, current_user):
+            return jsonify({'message': 'Internship not found'}), 404
+        try:
+            limit = page_limit(request.args.get('limit'))
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        
+        conditions = ["a.internship_id = %s"]
+        params = [internship_id]
+        status = request.args.get('status')
+        if status:
+            if status not in APPLICATION_STATUSES:
+                return jsonify({'message': 'Invalid status'}), 400
+            conditions.append("a.status = %s")
+            params.append(status)
+        cursor = request.args.get('cursor')
+        if cursor:
+            position = decode_cursor(cursor)
+            if not position or 'id' not in position:
+                return jsonify({'message': 'Invalid cursor'}), 400
+            conditions.append("a.id < %s")
+            params.append(int(position['id']))
+        
+        rows = db_query(INTERNSHIP_APPLICATIONS_QUERY.format(' AND '.join(conditions)), params + [limit + 1])
+        next_cursor = encode_cursor({'id': rows[limit - 1]['id']}) if len(rows) > limit else None
+        
+        return jsonify({
+            'applications': [application_from_row(row) for row in rows[:limit]],
+            'next_cursor': next_cursor
+        }), 200
+        
+    except Exception as e:
+        logging.error(f"List internship applications error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+@app.route('/api/internships/<int:internship_id>/applications/status', methods=['POST'])
+@token_required
+def bulk_update_application_status(current_user, internship_id):
+    """Set the status of many applications of one internship in a single transaction"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No JSON data received'}), 400
+        if not get_owned_internship(internship_id, current_user):
+            return jsonify({'message': 'Internship not found'}), 404
+        
+        status = data.get('status')
+        if status not in APPLICATION_STATUSES:
+            return jsonify({'message': 'Invalid status'}), 400
+        application_ids = data.get('applicationIds')
+        if not isinstance(application_ids, list) or not application_ids:
+            return jsonify({'message': 'applicationIds must be a non-empty list'}), 400
+        try:
+            application_ids = sorted({int(application_id) for application_id in application_ids})
+        except (TypeError, ValueError):
+            return jsonify({'message': 'Invalid application id'}), 400
+        
+        updated = 0
+        with db_cursor(transaction=True) as cur:
+            for start in range(0, len(application_ids), BULK_STATUS_BATCH_SIZE):
+                cur.executemany(
+                    APPLICATION_STATUS_UPDATE,
+                    [(status, application_id, internship_id) for application_id in application_ids[start:start + BULK_STATUS_BATCH_SIZE]]
+                )
+                updated += cur.rowcount
+        
+        return jsonify({'message': f'Updated {updated} applications', 'updated': updated}), 200
+        
+    except Exception as e:
+        logging.error(f"Bulk application status error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+# Application factory for WSGI servers
+def create_app(preload=None):
+    """Return the app, optionally warmed up before worker processes fork.
+
+    With preload (default: PRELOAD_INDEXES), the skill vocabulary and catalog
+    index are loaded and the lazily imported modules are imported now, so that
+    gunicorn workers forked from a preloading master share them copy-on-write:
+
+        gunicorn --preload 'app:create_app(preload=True)'
+
+    Pooled connections are closed so workers never share a socket, and
+    gc.freeze() keeps the collector from touching (and so copying) the
+    preloaded objects. Schema setup is never run here; see migrations.py.
+    """
+    if preload is None:
+        preload = app.config['PRELOAD_INDEXES']
+    if preload:
+        started = time.perf_counter()
+        import bcrypt, jwt, PyPDF2, docx  # noqa: F401
+        try:
+            ensure_skill_vocabulary_loaded()
+            ensure_catalog_loaded()
+        except Exception as e:
+            logging.error(f"Error preloading catalog indexes: {e}")
+        db_pool.close_idle()
+        gc.collect()
+        gc.freeze()
+        logging.info(f"Preloaded {len(ai_service.catalog)} internships in {time.perf_counter() - started:.2f}s")
+    return app
+
+# Schema migrations, run as a deployment step: flask --app app db upgrade
+db_cli = AppGroup('db', help='Manage the database schema.')
+app.cli.add_command(db_cli)
+
+def create_database():
+    """Create the configured database if it does not exist yet"""
+    conn = mysql.connector.connect(
+        host=app.config['MYSQL_HOST'],
+        user=app.config['MYSQL_USER'],
+        password=app.config['MYSQL_PASSWORD']
+    )
+    try:
+        cur = conn.cursor()
+        cur.execute(f"CREATE DATABASE IF NOT EXISTS `{app.config['MYSQL_DB']}`")
+        cur.close()
+    finally:
+        conn.close()
+
+@db_cli.command('upgrade')
+@click.option('--to', 'target', type=int, help='Stop after this migration version.')
+def db_upgrade(target):
+    """Apply pending schema migrations."""
+    import migrations
+    create_database()
+    conn = connect_mysql()
+    try:
+        applied = migrations.upgrade(conn, target)
+    finally:
+        conn.close()
+    for version, description in applied:
+        click.echo(f'Applied {version}: {description}')
+    if not applied:
+        click.echo('Schema is up to date')
+
+@db_cli.command('status')
+def db_status():
+    """List applied and pending schema migrations."""
+    import migrations
+    conn = connect_mysql()
+    try:
+        for version, description, applied in migrations.status(conn):
+            click.echo(f"{version:>4}  {'applied' if applied else 'pending':8} {description}")
+    finally:
+        conn.close()
+
+@db_cli.command('check')
+@click.option('--strict', is_flag=True, help='Fail on any full table scan, not only unindexed ones.')
+def db_check(strict):
+    """EXPLAIN the hot queries and fail if any does a full table scan."""
+    import migrations
+    conn = connect_mysql()
+    try:
+        problems = migrations.check_query_plans(conn, strict=strict)
+    finally:
+        conn.close()
+    for problem in problems:
+        click.echo(problem, err=True)
+    if problems:
+        raise SystemExit(1)
+    click.echo(f'{len(migrations.hot_queries())} hot queries use indexes')
+
+# Recommendation worker: flask --app app recommendations worker
+recommendations_cli = AppGroup('recommendations', help='Precompute student recommendations.')
+app.cli.add_command(recommendations_cli)
+
+@recommendations_cli.command('worker')
+@click.option('--processes', type=int, default=app.config['RECOMMENDATION_WORKERS'], help='Worker processes.')
+@click.option('--once', is_flag=True, help='Exit once the queue is empty.')
+def recommendations_worker(processes, once):
+    """Process queued recommendation jobs."""
+    import worker
+    worker.run(processes, once=once)
+
+@recommendations_cli.command('enqueue')
+@click.option('--user', 'user_id', type=int, help='Only this student; every student by default.')
+def recommendations_enqueue(user_id):
+    """Queue a recompute of recommendations."""
+    enqueue_recommendations(user_id)
+
+if __name__ == '__main__':
+    app.run(debug=True, port=5000, host='0.0.0.0')
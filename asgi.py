@@ -0,0 +1,257 @@
+"""Async serving mode for the Viinterns API.
+
+Run with an ASGI server, e.g.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 8000 --workers 4
+
+The I/O-bound endpoints (/api/search-jobs, /api/chat, /api/health) are served
+natively on the event loop with an aiomysql pool, so waiting on MySQL does not
+hold a thread. Every other route is delegated to the Flask app through
+asgiref's WSGI adapter, which runs it on a thread pool.
+"""
+import asyncio
+import json
+import logging
+import math
+import time
+
+import aiomysql
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+
+import app as viinterns
+
+flask_app = WsgiToAsgi(viinterns.app)
+db_pool = None
+
+CORS_HEADERS = [(b'access-control-allow-origin', b'*')]
+
+# Database access
+async def startup():
+    global db_pool
+    config = viinterns.app.config
+    db_pool = await aiomysql.create_pool(
+        host=config['MYSQL_HOST'],
+        user=config['MYSQL_USER'],
+        password=config['MYSQL_PASSWORD'],
+        db=config['MYSQL_DB'],
+        minsize=0,
+        maxsize=config['MYSQL_POOL_SIZE'] + config['MYSQL_POOL_MAX_OVERFLOW'],
+        pool_recycle=int(config['MYSQL_POOL_PING_INTERVAL']),
+        autocommit=True,
+        cursorclass=aiomysql.DictCursor
+    )
+    try:
+        await asyncio.to_thread(viinterns.ensure_skill_vocabulary_loaded)
+    except Exception as e:
+        logging.error(f"Error loading skill vocabulary: {e}")
+
+async def shutdown():
+    if db_pool is not None:
+        db_pool.close()
+        await db_pool.wait_closed()
+
+async def fetch_all(query, params=()):
+    async with db_pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+def pool_metrics():
+    if db_pool is None:
+        return None
+    return {
+        'size': db_pool.size,
+        'idle': db_pool.freesize,
+        'checked_out': db_pool.size - db_pool.freesize,
+        'maxsize': db_pool.maxsize
+    }
+
+# Native async handlers, each returning (payload, status)
+async def search_jobs(data):
+    if not data:
+        return {'message': 'No JSON data received'}, 400
+    try:
+        search_criteria, limit, cursor = viinterns.parse_search_request(data)
+    except ValueError as e:
+        return {'message': str(e)}, 400
+
+    async def compute():
+        # Loading, refreshing and ranking the in-memory catalog are CPU bound (and take the
+        # catalog locks), so they run on the default thread pool rather than the event loop
+        if viinterns.uses_catalog_index(search_criteria):
+            return await asyncio.to_thread(viinterns.run_search, search_criteria, limit, cursor)
+
+        await asyncio.to_thread(viinterns.ensure_skill_vocabulary_loaded)
+        catalog_query = viinterns.build_catalog_query(
+            search_criteria['skills'],
+            search_criteria['careerFields'],
+            search_criteria['preferences'],
+            limit,
+            cursor
+        )
+        internships, next_cursor = [], None
+        if catalog_query is not None:
+            rows = await fetch_all(*catalog_query)
+            internships, next_cursor = viinterns.catalog_page(rows, limit, search_criteria['skills'])
+        return viinterns.search_response(internships, next_cursor)
+
+    try:
+        result = await viinterns.search_cache.get_or_compute_async(
+            viinterns.search_cache_key(search_criteria, limit, cursor),
+            compute,
+            lambda: viinterns.run_search(search_criteria, limit, cursor)
+        )
+    except ValueError:
+        return {'message': 'Invalid cursor'}, 400
+    return result, 200
+
+async def chat(data):
+    if not data:
+        return {'message': 'No JSON data received'}, 400
+    message = data.get('message', '')
+    if not isinstance(message, str):
+        return {'message': 'message must be a string'}, 400
+    return {'response': viinterns.chat_reply(message)}, 200
+
+async def health(data):
+    return {
+        'status': 'running',
+        'mode': 'asgi',
+        'pool': pool_metrics(),
+        'caches': {
+            'search': viinterns.search_cache.stats()
+        }
+    }, 200
+
+ROUTES = {
+    ('POST', '/api/search-jobs'): search_jobs,
+    ('POST', '/api/chat'): chat,
+    ('GET', '/api/health'): health
+}
+
+# Native handlers charged against a per-IP rate limit budget
+RATE_LIMITED = {search_jobs: 'search'}
+
+# Native handlers answered with an ETag and a 304 for a matching If-None-Match, like json_response
+CONDITIONAL = {search_jobs}
+
+# ASGI plumbing
+async def read_json(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            break
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+def request_header(scope, name):
+    """Value of a request header, or None"""
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+def client_address(scope):
+    """Client IP, taken from X-Forwarded-For behind TRUSTED_PROXIES proxies as ProxyFix does for Flask"""
+    address = scope['client'][0] if scope.get('client') else None
+    trusted = viinterns.app.config['TRUSTED_PROXIES']
+    forwarded = request_header(scope, b'x-forwarded-for') if trusted else None
+    if forwarded:
+        # Each trusted proxy appends the address it saw, so the client is the trusted-th from the end
+        hops = [hop.strip() for hop in forwarded.split(',')]
+        if len(hops) >= trusted:
+            address = hops[-trusted]
+    return address
+
+def json_message(scope, payload, status, headers=(), conditional=False):
+    """Encode a JSON response as (status, headers, body), with the ETag handling of json_response and
+    the compression of compress_response"""
+    body = viinterns.dumps(payload)
+    headers = [(b'content-type', b'application/json')] + CORS_HEADERS + list(headers)
+    if conditional:
+        etag = viinterns.body_etag(body)
+        headers.append((b'etag', quote_etag(etag, weak=True).encode('ascii')))
+        if status == 200 and parse_etags(request_header(scope, b'if-none-match')).contains_weak(etag):
+            status, body = 304, b''
+            headers = [header for header in headers if header[0] != b'content-type']
+    if status == 200 and len(body) >= viinterns.app.config['COMPRESS_MIN_BYTES']:
+        headers.append((b'vary', b'Accept-Encoding'))
+        encoding = viinterns.negotiate_encoding(parse_accept_header(request_header(scope, b'accept-encoding')))
+        if encoding is not None:
+            body = viinterns.compress_body(body, encoding)
+            headers.append((b'content-encoding', encoding.encode('ascii')))
+    if status != 304:
+        headers.append((b'content-length', str(len(body)).encode('ascii')))
+    return status, headers, body
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await startup()
+            except Exception as e:
+                logging.error(f"ASGI startup error: {e}")
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    handler = ROUTES.get((scope.get('method'), scope.get('path'))) if scope['type'] == 'http' else None
+    if handler is chat and any(name == b'authorization' for name, value in scope['headers']):
+        # Personalized replies look the user up synchronously, so they go through Flask
+        handler = None
+    if handler is None:
+        await flask_app(scope, receive, send)
+        return
+
+    # Admission, metrics and profiling mirror the Flask hooks (admit_request, record_request_metrics).
+    # Component timers need a Flask request context, so these requests add no component observations.
+    route, started, request_key = scope['path'], time.perf_counter(), object()
+    if viinterns.profiler is not None:
+        viinterns.profiler.start_request(request_key)
+    headers = []
+    # Waiting for a slot would block the event loop, so a full process sheds straight away
+    exempt = route in viinterns.ADMISSION_EXEMPT_PATHS
+    admitted = not exempt and viinterns.admission.acquire(timeout=0)
+    try:
+        if not exempt and not admitted:
+            payload, status = {'message': 'Server is busy, please retry shortly'}, 503
+            headers.append((b'retry-after', b'1'))
+        else:
+            if handler in RATE_LIMITED:
+                viinterns.check_rate_limit(RATE_LIMITED[handler], ip=client_address(scope))
+            payload, status = await handler(await read_json(receive))
+    except viinterns.RateLimited as e:
+        payload, status = {'message': 'Too many requests, please retry later'}, 429
+        headers.append((b'retry-after', str(max(1, math.ceil(e.retry_after))).encode('ascii')))
+    except Exception as e:
+        logging.error(f"ASGI handler error: {e}")
+        payload, status = {'message': 'Internal server error'}, 500
+    finally:
+        if admitted:
+            viinterns.admission.release()
+
+    status, headers, body = json_message(scope, payload, status, headers, conditional=handler in CONDITIONAL)
+    duration = time.perf_counter() - started
+    viinterns.metrics.record_request(route, scope['method'], status, duration)
+    headers.append((b'server-timing', f'total;dur={duration * 1000:.2f}'.encode('ascii')))
+    if viinterns.profiler is not None:
+        viinterns.profiler.finish_request(route, duration, request_key)
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
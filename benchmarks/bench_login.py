@@ -0,0 +1,164 @@
+"""Login p99 under a mixed login/search load.
+
+Drives /api/login and /api/search-jobs through the Flask app with concurrent
+clients, backed by the SQLite stand-in for MySQL (see sqlite_backend.py). Each
+run uses a different password hasher: one with a worker per client thread,
+which behaves like bcrypt running inline on the request threads, and one
+bounded as configured by BCRYPT_WORKERS and BCRYPT_MAX_QUEUE. Latency
+percentiles, status counts, hasher rejections and connection pool usage are
+printed as JSON; 503s come from a full hashing queue or an exhausted pool.
+
+    python benchmarks/bench_login.py --threads 16 --duration 10 --pool-size 4
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import bcrypt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import app as viinterns  # noqa: E402
+import bench_suite  # noqa: E402
+import sqlite_backend  # noqa: E402
+
+PASSWORD = 'benchmark-password'
+USERS = 200
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def summarize(samples, statuses):
+    return {
+        'count': len(samples),
+        'p50_ms': round(percentile(samples, 50) * 1000, 2) if samples else None,
+        'p99_ms': round(percentile(samples, 99) * 1000, 2) if samples else None,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())}
+    }
+
+
+def seed(catalog_size, rounds):
+    path = os.path.join(tempfile.mkdtemp(prefix='viinterns-bench-'), 'bench.sqlite3')
+    hashed = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+    vocabulary = bench_suite.seed_database(path, catalog_size, USERS, hashed)
+    fields = list(viinterns.ai_service.field_keywords)
+    random.seed(bench_suite.SEED)
+    profiles = [{
+        'skills': random.sample(vocabulary, 4),
+        'careerFields': random.sample(fields, 2),
+        'preferences': {'type': random.choice(viinterns.INTERNSHIP_TYPES)}
+    } for _ in range(200)]
+    return path, profiles
+
+
+def run(mode, hasher, path, profiles, args):
+    viinterns.password_hasher = hasher
+    viinterns.db_pool = viinterns.ConnectionPool(sqlite_backend.connector(path), size=args.pool_size,
+                                                 max_overflow=0, timeout=args.pool_timeout)
+    # Load the catalog index before timing anything
+    viinterns.app.test_client().post('/api/search-jobs', json=profiles[0])
+
+    samples = {'login': ([], {}), 'search': ([], {})}
+    peak = {'waiting': 0, 'checked_out': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def login(client, number):
+        return client.post('/api/login', json={'email': f'student{number % USERS}@example.com', 'password': PASSWORD})
+
+    def search(client, number):
+        # Uncached, so every search needs a pooled connection
+        viinterns.search_cache.invalidate()
+        return client.post('/api/search-jobs', json=profiles[number % len(profiles)])
+
+    def worker(index):
+        route = 'login' if index < args.threads * args.login_share else 'search'
+        make_request = login if route == 'login' else search
+        client = viinterns.app.test_client()
+        number = index
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            status = make_request(client, number).status_code
+            elapsed = time.perf_counter() - start
+            number += args.threads
+            with lock:
+                latencies, statuses = samples[route]
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    def monitor():
+        while time.monotonic() < deadline:
+            usage = viinterns.db_pool.metrics()
+            for key in peak:
+                peak[key] = max(peak[key], usage[key])
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    threads.append(threading.Thread(target=monitor))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'mode': mode,
+        'login': summarize(*samples['login']),
+        'search': summarize(*samples['search']),
+        'rejected_logins': hasher.rejected,
+        'pool': dict(viinterns.db_pool.metrics(), peak_waiting=peak['waiting'], peak_checked_out=peak['checked_out'])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--login-share', type=float, default=0.5, help='fraction of client threads doing logins')
+    parser.add_argument('--rounds', type=int, default=viinterns.app.config['BCRYPT_ROUNDS'])
+    parser.add_argument('--catalog', type=int, default=5000, help='internships seeded in the SQLite database')
+    parser.add_argument('--pool-size', type=int, default=4, help='database connections, without overflow')
+    parser.add_argument('--pool-timeout', type=float, default=1.0, help='seconds to wait for a connection before a 503')
+    parser.add_argument('--output', help='write results to this JSON file')
+    args = parser.parse_args()
+
+    viinterns.app.config['RATE_LIMIT_ENABLED'] = False
+    path, profiles = seed(args.catalog, args.rounds)
+    hashers = {
+        'inline': viinterns.PasswordHasher(rounds=args.rounds, workers=args.threads, max_queue=args.threads),
+        'pool': viinterns.PasswordHasher(
+            rounds=args.rounds,
+            workers=viinterns.app.config['BCRYPT_WORKERS'],
+            max_queue=viinterns.app.config['BCRYPT_MAX_QUEUE'],
+            timeout=viinterns.app.config['BCRYPT_TIMEOUT']
+        )
+    }
+
+    results = {
+        'threads': args.threads,
+        'duration': args.duration,
+        'rounds': args.rounds,
+        'catalog': args.catalog,
+        'hash_workers': viinterns.app.config['BCRYPT_WORKERS'],
+        'hash_max_queue': viinterns.app.config['BCRYPT_MAX_QUEUE'],
+        'runs': [run(mode, hasher, path, profiles, args) for mode, hasher in hashers.items()]
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
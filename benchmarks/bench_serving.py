@@ -0,0 +1,115 @@
+"""Load-test comparison of the threaded Flask server and the ASGI serving mode.
+
+Start both servers first, for example
+
+    python app.py                                    # threaded, port 5000
+    uvicorn asgi:application --port 8000             # async, port 8000
+
+then run
+
+    python benchmarks/bench_serving.py --concurrency 1000 --requests 20000 \\
+        --target threaded=http://127.0.0.1:5000 --target asgi=http://127.0.0.1:8000
+
+Each target receives the same mix of /api/search-jobs and /api/chat requests
+from a pool of concurrent connections; throughput, latency percentiles and
+error counts are printed as JSON.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+SEARCH_BODIES = [
+    {'skills': ['Python', 'Web Development'], 'careerFields': ['Engineering']},
+    {'skills': ['Graphic Design', 'Illustration'], 'careerFields': ['Art']},
+    {'skills': ['Marketing', 'Sales'], 'careerFields': ['Business'], 'preferences': {'type': 'Remote'}},
+    {'skills': ['Biology', 'Research'], 'careerFields': ['Science', 'Medicine']}
+]
+CHAT_BODIES = [{'message': 'hello'}, {'message': 'any internship for me?'}, {'message': 'resume tips'}]
+
+
+async def post(host, port, path, body):
+    payload = json.dumps(body).encode('utf-8')
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f'POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n'.encode('ascii') + payload
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] if samples else None
+
+
+async def run_target(name, url, concurrency, total, search_share):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    latencies, errors = [], 0
+    remaining = total
+
+    async def client():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            if random.random() < search_share:
+                path, body = '/api/search-jobs', random.choice(SEARCH_BODIES)
+            else:
+                path, body = '/api/chat', random.choice(CHAT_BODIES)
+            start = time.perf_counter()
+            try:
+                status = await post(host, port, path, body)
+                if status >= 500:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'target': name,
+        'url': url,
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': round(elapsed, 2),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2)
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', action='append', required=True, help='name=url of a running server')
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--search-share', type=float, default=0.7)
+    parser.add_argument('--output', help='write results to this JSON file')
+    args = parser.parse_args()
+
+    results = []
+    for target in args.target:
+        name, url = target.split('=', 1)
+        results.append(await run_target(name, url, args.concurrency, args.requests, args.search_share))
+
+    output = json.dumps({'concurrency': args.concurrency, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
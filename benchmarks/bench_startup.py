@@ -0,0 +1,123 @@
+"""Cold start time of the API: import, first request and preload.
+
+Each sample runs in a fresh interpreter so nothing is already imported or
+cached. Three phases are timed:
+
+  import         import app
+  first_request  import app, then a first /api/login through the test client
+                 (pulls in the lazily imported bcrypt and jwt)
+  preload        import app, then create_app(preload=True) against a seeded
+                 catalog, as a gunicorn --preload master would
+
+The slowest modules from python -X importtime are reported alongside, and the
+results are printed (or written) as JSON.
+
+    python benchmarks/bench_startup.py --runs 10 --catalog 5000
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import bcrypt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+PRELUDE = f"""
+import sys, time
+sys.path.insert(0, {ROOT!r})
+sys.path.insert(0, {BENCH_DIR!r})
+started = time.perf_counter()
+import app as viinterns
+imported = time.perf_counter()
+"""
+
+PHASES = {
+    'import': PRELUDE + """
+print(imported - started)
+""",
+    'first_request': PRELUDE + """
+import sqlite_backend
+viinterns.db_pool = viinterns.ConnectionPool(sqlite_backend.connector(sys.argv[1]), size=1, max_overflow=0)
+viinterns.password_hasher.rounds = int(sys.argv[2])
+response = viinterns.app.test_client().post('/api/login', json={'email': 'student0@example.com', 'password': 'benchmark-password'})
+assert response.status_code == 200, response.status_code
+print(time.perf_counter() - started)
+""",
+    'preload': PRELUDE + """
+import sqlite_backend
+viinterns.db_pool = viinterns.ConnectionPool(sqlite_backend.connector(sys.argv[1]), size=1, max_overflow=0)
+viinterns.create_app(preload=True)
+assert viinterns.catalog_loaded
+print(time.perf_counter() - started)
+"""
+}
+
+
+def run_phase(script, args):
+    output = subprocess.run([sys.executable, '-c', script] + args, check=True, capture_output=True, text=True, cwd=ROOT)
+    return float(output.stdout.split()[-1])
+
+
+def slowest_imports(top):
+    """Cumulative import time of each module app imports, from python -X importtime"""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            check=True, capture_output=True, text=True, cwd=ROOT)
+    packages = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting is shown by indentation; keep the modules app imports directly
+        if len(name) - len(name.lstrip()) != 3:
+            continue
+        packages[name.strip()] = int(cumulative)
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{'module': name, 'cumulative_ms': round(us / 1000, 2)} for name, us in ranked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--runs', type=int, default=10, help='fresh interpreters per phase')
+    parser.add_argument('--catalog', type=int, default=5000, help='internships seeded for the preload phase')
+    parser.add_argument('--bcrypt-rounds', type=int, default=4)
+    parser.add_argument('--top', type=int, default=10, help='slowest imports to report')
+    args = parser.parse_args()
+
+    import bench_suite
+    path = os.path.join(tempfile.mkdtemp(prefix='viinterns-startup-'), 'bench.sqlite3')
+    bench_suite.seed_database(path, args.catalog, 1,
+                              bcrypt.hashpw(b'benchmark-password', bcrypt.gensalt(rounds=args.bcrypt_rounds)).decode('utf-8'))
+
+    phases = []
+    for name, script in PHASES.items():
+        samples = [run_phase(script, [path, str(args.bcrypt_rounds)]) for _ in range(args.runs)]
+        phases.append({
+            'name': name,
+            'params': {'runs': args.runs, 'catalog': args.catalog},
+            'min_ms': round(min(samples) * 1000, 2),
+            'median_ms': round(statistics.median(samples) * 1000, 2),
+            'max_ms': round(max(samples) * 1000, 2)
+        })
+
+    output = json.dumps({
+        'python': platform.python_version(),
+        'phases': phases,
+        'slowest_imports': slowest_imports(args.top)
+    }, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+"""Benchmark suite for the search, auth and registration hot paths.
+
+Micro-benchmarks time ViinternsAIService over synthetic catalogs and skill
+sets of increasing size. Load scenarios drive /api/login, /api/register and
+/api/search-jobs through the Flask app with concurrent clients, backed by a
+SQLite stand-in for MySQL (see sqlite_backend.py). Results are written as
+JSON; pass --compare to flag regressions against an earlier run.
+
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --output new.json --compare baseline.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import bcrypt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import app as viinterns  # noqa: E402
+import sqlite_backend  # noqa: E402
+
+SEED = 1234
+BASE_SKILLS = ['python', 'java', 'javascript', 'sql', 'machine learning', 'web development', 'graphic design',
+               'marketing', 'sales', 'research', 'biology', 'chemistry', 'teaching', 'nursing', 'excel',
+               'communication', 'react', 'html', 'css', 'illustration', 'consulting', 'pharmacy']
+LOCATIONS = ['Remote', 'San Francisco, CA', 'New York, NY', 'Austin, TX', 'Chicago, IL']
+NEARBY = {'location': 'Palo Alto, CA', 'withinKm': 50}
+
+
+def skill_vocabulary(size):
+    return BASE_SKILLS + [f'{random.choice(BASE_SKILLS)} {i}' for i in range(max(0, size - len(BASE_SKILLS)))]
+
+
+def synthetic_catalog(size, vocabulary):
+    fields = list(viinterns.ai_service.field_keywords)
+    today = datetime.date.today()
+    return [{
+        'id': i + 1,
+        'title': f'{random.choice(fields)} Intern {i}',
+        'company': f'Company {i % 500}',
+        'location': random.choice(LOCATIONS),
+        'type': random.choice(viinterns.INTERNSHIP_TYPES),
+        'field': random.choice(fields),
+        'duration': f'{random.randint(2, 6)} months',
+        'stipend': f'${random.randint(1000, 3000)}/month',
+        'description': 'Hands-on projects with ' + ', '.join(random.sample(vocabulary, 3)),
+        'skills': random.sample(vocabulary, 5),
+        'experienceRequired': 'No experience required',
+        'postedDate': (today - datetime.timedelta(days=random.randint(0, 60))).isoformat()
+    } for i in range(size)]
+
+
+def time_calls(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        'calls': repeat,
+        'min_ms': round(min(samples) * 1000, 4),
+        'median_ms': round(statistics.median(samples) * 1000, 4),
+        'mean_ms': round(statistics.mean(samples) * 1000, 4)
+    }
+
+
+def micro_benchmarks(scale, repeat):
+    random.seed(SEED)
+    fields = list(viinterns.ai_service.field_keywords)
+    results = []
+
+    for catalog_size in (100 * scale, 1000 * scale, 10000 * scale):
+        vocabulary = skill_vocabulary(max(100, catalog_size // 10))
+        indexed = viinterns.ViinternsAIService()
+        for internship in synthetic_catalog(catalog_size, vocabulary):
+            indexed.index_internship(internship)
+        for skill_count in (5, 50, 500):
+            user_skills = random.sample(vocabulary, min(skill_count, len(vocabulary)))
+            params = {'catalog': catalog_size, 'skills': skill_count}
+            results.append(dict(name='match_catalog', params=params,
+                                **time_calls(lambda: indexed.match_catalog(user_skills, limit=15), repeat)))
+            results.append(dict(name='match_catalog_full_sort', params=params,
+                                **time_calls(lambda: indexed.match_catalog(user_skills, limit=None), max(1, repeat // 10))))
+            results.append(dict(name='match_catalog_filtered', params=params,
+                                **time_calls(lambda: indexed.match_catalog(user_skills, fields[:2], {'type': ['Remote', 'Hybrid']},
+                                                                           limit=15), repeat)))
+            results.append(dict(name='match_catalog_within_km', params=params,
+                                **time_calls(lambda: indexed.match_catalog(user_skills, preferences=NEARBY, limit=15), repeat)))
+
+    return results
+
+
+def seed_database(path, catalog_size, users, password_hash):
+    random.seed(SEED)
+    sqlite_backend.create_database(path)
+    connection = sqlite_backend.Connection(path)
+    cur = connection.cursor()
+    connection.start_transaction()
+    vocabulary = skill_vocabulary(max(100, catalog_size // 10))
+    for internship in synthetic_catalog(catalog_size, vocabulary):
+        cur.execute(
+            "INSERT INTO internships (id, title, company, location, type, duration, stipend, description, skills, field) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            (internship['id'], internship['title'], internship['company'], internship['location'], internship['type'],
+             internship['duration'], internship['stipend'], internship['description'], json.dumps(internship['skills']),
+             internship['field'])
+        )
+        cur.executemany("INSERT INTO internship_skills (internship_id, skill) VALUES (%s, %s)",
+                        [(internship['id'], viinterns.normalize_skill(skill)) for skill in internship['skills']])
+    cur.executemany(
+        "INSERT INTO users (name, email, password, user_type) VALUES (%s, %s, %s, 'student')",
+        [(f'Student {i}', f'student{i}@example.com', password_hash) for i in range(users)]
+    )
+    connection.commit()
+    connection.close()
+    return vocabulary
+
+
+def run_scenario(name, make_request, total, concurrency):
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker():
+        client = viinterns.app.test_client()
+        while True:
+            with lock:
+                number = next(counter, None)
+            if number is None:
+                return
+            start = time.perf_counter()
+            status = make_request(client, number)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(pct):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * pct / 100))] * 1000, 3)
+
+    return {
+        'name': name,
+        'params': {'requests': total, 'concurrency': concurrency},
+        'requests_per_second': round(total / elapsed, 1),
+        'p50_ms': percentile(50),
+        'p95_ms': percentile(95),
+        'p99_ms': percentile(99),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())}
+    }
+
+
+def load_scenarios(catalog_size, requests, concurrency, bcrypt_rounds):
+    workdir = tempfile.mkdtemp(prefix='viinterns-bench-')
+    path = os.path.join(workdir, 'bench.sqlite3')
+    password = 'benchmark-password'
+    users = max(100, requests)
+    vocabulary = seed_database(path, catalog_size, users,
+                               bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=bcrypt_rounds)).decode('utf-8'))
+
+    viinterns.db_pool = viinterns.ConnectionPool(sqlite_backend.connector(path), size=concurrency, max_overflow=0)
+    viinterns.password_hasher.rounds = bcrypt_rounds
+    viinterns.app.config['RATE_LIMIT_ENABLED'] = False
+    viinterns.skill_vocabulary_loaded = False
+    viinterns.catalog_loaded = False
+    fields = list(viinterns.ai_service.field_keywords)
+    random.seed(SEED)
+    profiles = [{
+        'skills': random.sample(vocabulary, 4),
+        'careerFields': random.sample(fields, 2),
+        'preferences': {'type': random.choice(viinterns.INTERNSHIP_TYPES)}
+    } for _ in range(200)]
+
+    def login(client, number):
+        return client.post('/api/login', json={'email': f'student{number % users}@example.com', 'password': password}).status_code
+
+    def register(client, number):
+        return client.post('/api/register', json={
+            'name': f'New Student {number}', 'email': f'new{number}-{time.time_ns()}@example.com', 'password': password
+        }).status_code
+
+    def search(client, number):
+        return client.post('/api/search-jobs', json=profiles[number % len(profiles)]).status_code
+
+    def search_uncached(client, number):
+        viinterns.search_cache.invalidate()
+        return search(client, number)
+
+    def search_relevance(client, number):
+        viinterns.search_cache.invalidate()
+        return client.post('/api/search-jobs', json=dict(profiles[number % len(profiles)], sort='relevance')).status_code
+
+    results = [
+        run_scenario('api_login', login, requests, concurrency),
+        run_scenario('api_register', register, requests, concurrency),
+        run_scenario('api_search_jobs_uncached', search_uncached, requests, concurrency),
+        run_scenario('api_search_jobs_relevance', search_relevance, requests, concurrency),
+        run_scenario('api_search_jobs_cached', search, requests, concurrency)
+    ]
+    for result in results:
+        result['params'].update(catalog=catalog_size, bcrypt_rounds=bcrypt_rounds)
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    """Return descriptions of results that got slower than the baseline by more than threshold"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def keyed(entries, metric):
+        return {(entry['name'], json.dumps(entry['params'], sort_keys=True)): entry[metric] for entry in entries}
+
+    regressions = []
+    for section, metric in (('micro', 'median_ms'), ('load', 'p50_ms')):
+        old = keyed(baseline.get(section, []), metric)
+        for key, value in keyed(results.get(section, []), metric).items():
+            if key in old and old[key] and value > old[key] * (1 + threshold):
+                regressions.append(f'{key[0]} {key[1]}: {metric} {old[key]} -> {value}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown before a result is a regression')
+    parser.add_argument('--scale', type=int, default=1, help='multiplier for synthetic catalog sizes')
+    parser.add_argument('--repeat', type=int, default=50, help='calls per micro-benchmark')
+    parser.add_argument('--catalog', type=int, default=5000, help='internships seeded for load scenarios')
+    parser.add_argument('--requests', type=int, default=500, help='requests per load scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--bcrypt-rounds', type=int, default=viinterns.app.config['BCRYPT_ROUNDS'])
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-load', action='store_true')
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': vars(args)
+        },
+        'micro': [] if args.skip_micro else micro_benchmarks(args.scale, args.repeat),
+        'load': [] if args.skip_load else load_scenarios(args.catalog, args.requests, args.concurrency, args.bcrypt_rounds)
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
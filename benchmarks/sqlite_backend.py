@@ -0,0 +1,198 @@
+"""SQLite stand-in for MySQL, used by the benchmark suite.
+
+Provides connections with the subset of the mysql-connector API that app.py
+uses (dictionary cursors, %s placeholders, transactions, ping, IntegrityError),
+so the real ConnectionPool and data-access code run unchanged against a local
+file. The few MySQL-only constructs in the app's SQL are rewritten on the way
+in (see MYSQL_SYNTAX).
+"""
+import contextlib
+import functools
+import sqlite3
+
+import mysql.connector
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    phone TEXT,
+    password TEXT NOT NULL,
+    user_type TEXT DEFAULT 'student',
+    skills TEXT,
+    company TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS internships (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT,
+    type TEXT,
+    duration TEXT,
+    stipend TEXT,
+    description TEXT,
+    skills TEXT,
+    field TEXT,
+    experience_required TEXT,
+    posted_by INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_internships_field ON internships (field, id);
+CREATE INDEX IF NOT EXISTS idx_internships_location ON internships (location, id);
+CREATE INDEX IF NOT EXISTS idx_internships_type ON internships (type, id);
+CREATE TABLE IF NOT EXISTS internship_skills (
+    internship_id INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (internship_id, skill)
+);
+CREATE INDEX IF NOT EXISTS idx_internship_skills_skill ON internship_skills (skill, internship_id);
+CREATE TABLE IF NOT EXISTS catalog_state (
+    id INTEGER PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO catalog_state (id, generation) VALUES (1, 0);
+CREATE TABLE IF NOT EXISTS recommendations (
+    user_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    internship_id INTEGER NOT NULL,
+    score REAL NOT NULL,
+    skill_match_count INTEGER NOT NULL,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, position)
+);
+CREATE TABLE IF NOT EXISTS recommendation_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recommendation_jobs_status ON recommendation_jobs (status, id);
+CREATE TABLE IF NOT EXISTS recommendation_status (
+    user_id INTEGER PRIMARY KEY,
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    internship_id INTEGER,
+    status TEXT DEFAULT 'Pending',
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (user_id, internship_id)
+);
+"""
+
+# MySQL syntax used by app.py and worker.py, and its SQLite equivalent. Row
+# locks are dropped: SQLite serializes writers, so a claimed job is never
+# handed out twice anyway.
+MYSQL_SYNTAX = (
+    ('NOW() - INTERVAL %s SECOND', "datetime('now', '-' || %s || ' seconds')"),
+    ('NOW()', 'CURRENT_TIMESTAMP'),
+    (' FROM DUAL', ''),
+    ('<=>', 'IS'),
+    ('ON DUPLICATE KEY UPDATE', 'ON CONFLICT DO UPDATE SET'),
+    (' FOR UPDATE SKIP LOCKED', ''),
+    ('%s', '?')
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def translate(query):
+    for mysql_syntax, sqlite_syntax in MYSQL_SYNTAX:
+        query = query.replace(mysql_syntax, sqlite_syntax)
+    return query
+
+
+@contextlib.contextmanager
+def integrity_errors():
+    """Raise constraint violations as mysql.connector's IntegrityError, which the app catches"""
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        raise mysql.connector.errors.IntegrityError(msg=str(e)) from e
+
+
+class Cursor:
+    def __init__(self, connection):
+        self._cursor = connection.cursor()
+        self._lastrowid = None
+
+    @property
+    def lastrowid(self):
+        return self._lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, query, params=()):
+        with integrity_errors():
+            self._cursor.execute(translate(query), tuple(params))
+        self._lastrowid = self._cursor.lastrowid
+        if self._cursor.rowcount > 1 and query.lstrip().upper().startswith('INSERT'):
+            # MySQL reports the first id of a multi-row INSERT, SQLite the last
+            self._lastrowid -= self._cursor.rowcount - 1
+
+    def executemany(self, query, rows):
+        with integrity_errors():
+            self._cursor.executemany(translate(query), [tuple(row) for row in rows])
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return dict(row) if row is not None else None
+
+    def fetchall(self):
+        return [dict(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class Connection:
+    def __init__(self, path):
+        self._connection = sqlite3.connect(
+            path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+
+    def cursor(self, dictionary=True):
+        return Cursor(self._connection)
+
+    def start_transaction(self):
+        self._connection.execute('BEGIN')
+
+    def commit(self):
+        if self._connection.in_transaction:
+            self._connection.execute('COMMIT')
+
+    def rollback(self):
+        if self._connection.in_transaction:
+            self._connection.execute('ROLLBACK')
+
+    def ping(self, reconnect=False):
+        self._connection.execute('SELECT 1')
+
+    def close(self):
+        self._connection.close()
+
+
+def create_database(path):
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.close()
+
+
+def connector(path):
+    """Return a zero-argument connect function for ConnectionPool"""
+    return lambda: Connection(path)
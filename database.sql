@@ -1,58 +1,139 @@
--- Create database
-CREATE DATABASE IF NOT EXISTS internconnect;
-USE internconnect;
-
--- Users table
-CREATE TABLE IF NOT EXISTS users (
-    id INT AUTO_INCREMENT PRIMARY KEY,
-    name VARCHAR(255) NOT NULL,
-    phone VARCHAR(20) NOT NULL,
-    email VARCHAR(255) UNIQUE NOT NULL,
-    password_hash VARCHAR(255) NOT NULL,
-    skills TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-);
-
--- Internships table
-CREATE TABLE IF NOT EXISTS internships (
-    id INT AUTO_INCREMENT PRIMARY KEY,
-    title VARCHAR(255) NOT NULL,
-    company VARCHAR(255) NOT NULL,
-    location VARCHAR(255) NOT NULL,
-    type ENUM('Remote', 'On-site', 'Hybrid') NOT NULL,
-    duration VARCHAR(100) NOT NULL,
-    stipend VARCHAR(100) NOT NULL,
-    description TEXT NOT NULL,
-    required_skills TEXT NOT NULL,j
-    status ENUM('Active', 'Inactive') DEFAULT 'Active',
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- Internship applications table
-CREATE TABLE IF NOT EXISTS internship_applications (
-    id INT AUTO_INCREMENT PRIMARY KEY,
-    user_id INT NOT NULL,
-    internship_id INT NOT NULL,
-    status ENUM('Applied', 'Pending', 'Approved', 'Rejected') DEFAULT 'Applied',
-    applied_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    notes TEXT,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    FOREIGN KEY (internship_id) REFERENCES internships(id) ON DELETE CASCADE,
-    UNIQUE KEY unique_application (user_id, internship_id)
-);
-
--- Insert sample internships
-INSERT INTO internships (title, company, location, type, duration, stipend, description, required_skills) VALUES
-('Frontend Developer Intern', 'TechCorp Solutions', 'San Francisco, CA', 'Remote', '3 months', '$3,000/month', 'Join our frontend team to build responsive web applications using React, JavaScript, and modern CSS frameworks.', 'JavaScript,React,HTML,CSS'),
-('Data Science Intern', 'DataInsights Inc.', 'New York, NY', 'Hybrid', '6 months', '$4,500/month', 'Work with our data team to analyze large datasets and build predictive models using Python and machine learning libraries.', 'Python,Machine Learning,SQL,Pandas'),
-('UX/UI Design Intern', 'CreativeMinds Agency', 'Austin, TX', 'On-site', '4 months', '$2,800/month', 'Design intuitive user interfaces for web and mobile applications. Collaborate with developers to implement designs.', 'Figma,UI/UX Design,Wireframing,Prototyping'),
-('Backend Developer Intern', 'ServerStack Technologies', 'Seattle, WA', 'Remote', '5 months', '$3,500/month', 'Develop and maintain server-side applications using Node.js and MongoDB. Implement RESTful APIs and database schemas.', 'Node.js,MongoDB,Express,REST APIs'),
-('Marketing Intern', 'GrowthHackers Marketing', 'Chicago, IL', 'Hybrid', '3 months', '$2,500/month', 'Assist in developing marketing campaigns, analyzing performance metrics, and creating content for social media channels.', 'Digital Marketing,Social Media,Content Creation,Analytics'),
-('Cybersecurity Intern', 'SecureNet Systems', 'Boston, MA', 'On-site', '6 months', '$4,000/month', 'Learn about network security, vulnerability assessment, and ethical hacking techniques under expert supervision.', 'Network Security,Ethical Hacking,Linux,Python');
-
--- Insert sample application (for demonstration)
-INSERT INTO internship_applications (user_id, internship_id, status, applied_date) VALUES
-(1, 1, 'Applied', '2023-10-15'),
-(1, 2, 'Pending', '2023-10-20'),
-(1, 3, 'Approved', '2023-09-10');
\ No newline at end of file
+-- Reference schema for a fresh database, equivalent to running every migration
+-- in migrations.py. Existing databases (including ones created from earlier
+-- versions of this file) should be upgraded with: flask --app app db upgrade
+
+-- Create database
+CREATE DATABASE IF NOT EXISTS viinterns;
+USE viinterns;
+
+-- Users table
+CREATE TABLE IF NOT EXISTS users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    phone VARCHAR(20),
+    password VARCHAR(255) NOT NULL,
+    user_type ENUM('student', 'recruiter') DEFAULT 'student',
+    skills JSON,
+    company VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Internships table
+CREATE TABLE IF NOT EXISTS internships (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    company VARCHAR(255) NOT NULL,
+    location VARCHAR(255),
+    type VARCHAR(50),
+    duration VARCHAR(50),
+    stipend VARCHAR(100),
+    description TEXT,
+    skills JSON,
+    experience_required VARCHAR(100),
+    posted_by INT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    field VARCHAR(100),
+    INDEX idx_internships_field (field, id),
+    INDEX idx_internships_location (location, id),
+    INDEX idx_internships_type (type, id),
+    FOREIGN KEY (posted_by) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Normalized internship skills, one row per (internship, skill)
+CREATE TABLE IF NOT EXISTS internship_skills (
+    internship_id INT NOT NULL,
+    skill VARCHAR(100) NOT NULL,
+    PRIMARY KEY (internship_id, skill),
+    INDEX idx_internship_skills_skill (skill, internship_id),
+    FOREIGN KEY (internship_id) REFERENCES internships(id) ON DELETE CASCADE
+);
+
+-- Applications table
+CREATE TABLE IF NOT EXISTS applications (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT,
+    internship_id INT,
+    status ENUM('Pending', 'Approved', 'Rejected') DEFAULT 'Pending',
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_application (user_id, internship_id),
+    INDEX idx_applications_internship_status (internship_id, status, id),
+    INDEX idx_applications_user_applied (user_id, applied_at, id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (internship_id) REFERENCES internships(id) ON DELETE CASCADE
+);
+
+-- Recommendation jobs; user_id NULL means every student
+CREATE TABLE IF NOT EXISTS recommendation_jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT,
+    status ENUM('queued', 'running', 'done', 'failed') NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    error VARCHAR(500),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL,
+    INDEX idx_recommendation_jobs_status (status, id),
+    INDEX idx_recommendation_jobs_user (user_id, status)
+);
+
+-- Precomputed top matches per student
+CREATE TABLE IF NOT EXISTS recommendations (
+    user_id INT NOT NULL,
+    position SMALLINT NOT NULL,
+    internship_id INT NOT NULL,
+    score DOUBLE NOT NULL,
+    skill_match_count INT NOT NULL,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, position),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (internship_id) REFERENCES internships(id) ON DELETE CASCADE
+);
+
+-- When each student's recommendations were last computed, even if nothing matched
+CREATE TABLE IF NOT EXISTS recommendation_status (
+    user_id INT PRIMARY KEY,
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Bumped by every internship insert; app processes poll it to refresh their indexes
+CREATE TABLE IF NOT EXISTS catalog_state (
+    id TINYINT PRIMARY KEY,
+    generation BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO catalog_state (id, generation) VALUES (1, 0);
+
+-- Migration bookkeeping: this file matches migrations 1-7
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO schema_migrations (version, description) VALUES
+(1, 'Create users, internships and applications tables'),
+(2, 'Convert tables created from the old database.sql'),
+(3, 'Add internship fields and the normalized internship_skills table'),
+(4, 'Add secondary indexes for the search, login and application queries'),
+(5, 'Add the recommendation job queue and materialized recommendations'),
+(6, 'Add the catalog generation counter polled by app processes'),
+(7, 'Record when each student''s recommendations were last computed');
+
+-- Insert sample internships
+INSERT INTO internships (title, company, location, type, duration, stipend, description, skills, field) VALUES
+('Frontend Developer Intern', 'TechCorp Solutions', 'San Francisco, CA', 'Remote', '3 months', '$3,000/month', 'Join our frontend team to build responsive web applications using React, JavaScript, and modern CSS frameworks.', '["JavaScript", "React", "HTML", "CSS"]', 'Engineering'),
+('Data Science Intern', 'DataInsights Inc.', 'New York, NY', 'Hybrid', '6 months', '$4,500/month', 'Work with our data team to analyze large datasets and build predictive models using Python and machine learning libraries.', '["Python", "Machine Learning", "SQL", "Pandas"]', 'Engineering'),
+('UX/UI Design Intern', 'CreativeMinds Agency', 'Austin, TX', 'On-site', '4 months', '$2,800/month', 'Design intuitive user interfaces for web and mobile applications. Collaborate with developers to implement designs.', '["Figma", "UI/UX Design", "Wireframing", "Prototyping"]', 'Art'),
+('Backend Developer Intern', 'ServerStack Technologies', 'Seattle, WA', 'Remote', '5 months', '$3,500/month', 'Develop and maintain server-side applications using Node.js and MongoDB. Implement RESTful APIs and database schemas.', '["Node.js", "MongoDB", "Express", "REST APIs"]', 'Engineering'),
+('Marketing Intern', 'GrowthHackers Marketing', 'Chicago, IL', 'Hybrid', '3 months', '$2,500/month', 'Assist in developing marketing campaigns, analyzing performance metrics, and creating content for social media channels.', '["Digital Marketing", "Social Media", "Content Creation", "Analytics"]', 'Business'),
+('Cybersecurity Intern', 'SecureNet Systems', 'Boston, MA', 'On-site', '6 months', '$4,000/month', 'Learn about network security, vulnerability assessment, and ethical hacking techniques under expert supervision.', '["Network Security", "Ethical Hacking", "Linux", "Python"]', 'Engineering');
+
+INSERT INTO internship_skills (internship_id, skill) VALUES
+(1, 'javascript'), (1, 'react'), (1, 'html'), (1, 'css'),
+(2, 'python'), (2, 'machine learning'), (2, 'sql'), (2, 'pandas'),
+(3, 'figma'), (3, 'ui/ux design'), (3, 'wireframing'), (3, 'prototyping'),
+(4, 'node.js'), (4, 'mongodb'), (4, 'express'), (4, 'rest apis'),
+(5, 'digital marketing'), (5, 'social media'), (5, 'content creation'), (5, 'analytics'),
+(6, 'network security'), (6, 'ethical hacking'), (6, 'linux'), (6, 'python');
@@ -0,0 +1,348 @@
+"""Versioned schema migrations for the Viinterns database.
+
+Run them as a deployment step, not on process start:
+
+    flask --app app db upgrade         # apply pending migrations
+    flask --app app db status          # list applied and pending migrations
+    flask --app app db check           # EXPLAIN the hot queries, fail on full table scans
+
+Applied versions are recorded in the schema_migrations table. MySQL commits
+DDL implicitly, so a migration cannot be rolled back as a whole; instead every
+migration checks the current schema before changing it and can safely be run
+again after a partial failure. Migration 2 converts databases created from the
+old database.sql (password_hash, internship_applications, TEXT skills).
+"""
+import json
+import logging
+
+MIGRATIONS = []  # (version, description, function taking a dictionary cursor), in order
+
+def migration(version, description):
+    def register(f):
+        MIGRATIONS.append((version, description, f))
+        return f
+    return register
+
+# Schema introspection
+def table_exists(cur, table):
+    cur.execute(
+        "SELECT COUNT(*) AS count FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,)
+    )
+    return cur.fetchone()['count'] > 0
+
+def column_type(cur, table, column):
+    """The column's data type (e.g. 'json', 'text'), or None when it does not exist"""
+    cur.execute(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+        (table, column)
+    )
+    row = cur.fetchone()
+    return row['data_type'].lower() if row else None
+
+def index_exists(cur, table, name):
+    cur.execute(
+        "SELECT COUNT(*) AS count FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+        (table, name)
+    )
+    return cur.fetchone()['count'] > 0
+
+def add_column(cur, table, column, definition):
+    if column_type(cur, table, column) is None:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def add_index(cur, table, name, columns, unique=False):
+    if not index_exists(cur, table, name):
+        cur.execute(f"ALTER TABLE {table} ADD {'UNIQUE ' if unique else ''}INDEX {name} ({columns})")
+
+def skills_to_json(cur, table, column, source=None):
+    """Rewrite a TEXT skills column (JSON or comma separated) as a JSON column.
+
+    With `source`, values are read from that column instead, which is then dropped.
+    """
+    source = source or column
+    cur.execute(f"SELECT id, {source} AS skills FROM {table} WHERE {source} IS NOT NULL")
+    rows = cur.fetchall()
+    updates = []
+    for row in rows:
+        value = row['skills']
+        try:
+            skills = json.loads(value)
+        except (TypeError, ValueError):
+            skills = None
+        if not isinstance(skills, list):
+            skills = [skill.strip() for skill in str(value).split(',') if skill.strip()]
+        updates.append((json.dumps(skills), row['id']))
+    if updates:
+        cur.executemany(f"UPDATE {table} SET {column} = %s WHERE id = %s", updates)
+    cur.execute(f"ALTER TABLE {table} MODIFY {column} JSON")
+    if source != column:
+        cur.execute(f"ALTER TABLE {table} DROP COLUMN {source}")
+
+# Migrations
+@migration(1, 'Create users, internships and applications tables')
+def create_base_tables(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            email VARCHAR(255) UNIQUE NOT NULL,
+            phone VARCHAR(20),
+            password VARCHAR(255) NOT NULL,
+            user_type ENUM('student', 'recruiter') DEFAULT 'student',
+            skills JSON,
+            company VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS internships (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            company VARCHAR(255) NOT NULL,
+            location VARCHAR(255),
+            type VARCHAR(50),
+            duration VARCHAR(50),
+            stipend VARCHAR(100),
+            description TEXT,
+            skills JSON,
+            experience_required VARCHAR(100),
+            posted_by INT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (posted_by) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS applications (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT,
+            internship_id INT,
+            status ENUM('Pending', 'Approved', 'Rejected') DEFAULT 'Pending',
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (internship_id) REFERENCES internships(id) ON DELETE CASCADE
+        )
+    """)
+
+@migration(2, 'Convert tables created from the old database.sql')
+def import_legacy_schema(cur):
+    # users: password_hash -> password, TEXT skills -> JSON, optional phone
+    if column_type(cur, 'users', 'password_hash') and not column_type(cur, 'users', 'password'):
+        cur.execute("ALTER TABLE users CHANGE password_hash password VARCHAR(255) NOT NULL")
+        cur.execute("ALTER TABLE users MODIFY phone VARCHAR(20)")
+    add_column(cur, 'users', 'user_type', "ENUM('student', 'recruiter') DEFAULT 'student'")
+    add_column(cur, 'users', 'company', "VARCHAR(255)")
+    if column_type(cur, 'users', 'skills') not in (None, 'json'):
+        skills_to_json(cur, 'users', 'skills')
+
+    # internships: comma separated required_skills -> JSON skills, and the columns posting needs
+    if column_type(cur, 'internships', 'required_skills'):
+        add_column(cur, 'internships', 'skills', "JSON")
+        skills_to_json(cur, 'internships', 'skills', source='required_skills')
+        for column, definition in (('location', 'VARCHAR(255)'), ('type', 'VARCHAR(50)'), ('duration', 'VARCHAR(50)'),
+                                   ('stipend', 'VARCHAR(100)'), ('description', 'TEXT')):
+            cur.execute(f"ALTER TABLE internships MODIFY {column} {definition}")
+    add_column(cur, 'internships', 'experience_required', "VARCHAR(100)")
+    if column_type(cur, 'internships', 'posted_by') is None:
+        cur.execute("ALTER TABLE internships ADD COLUMN posted_by INT, "
+                    "ADD FOREIGN KEY (posted_by) REFERENCES users(id) ON DELETE CASCADE")
+
+    # internship_applications -> applications; 'Applied' was the old name for 'Pending'
+    if table_exists(cur, 'internship_applications'):
+        # The RENAME commits implicitly, so a rerun after a failure between the two must not copy twice
+        cur.execute("""
+            INSERT INTO applications (user_id, internship_id, status, applied_at)
+            SELECT l.user_id, l.internship_id, IF(l.status = 'Applied', 'Pending', l.status), l.applied_date
+            FROM internship_applications l
+            WHERE NOT EXISTS (
+                SELECT 1 FROM applications a WHERE a.user_id = l.user_id AND a.internship_id = l.internship_id
+            )
+        """)
+        cur.execute("RENAME TABLE internship_applications TO internship_applications_legacy")
+
+@migration(3, 'Add internship fields and the normalized internship_skills table')
+def add_internship_skills(cur):
+    from app import normalize_skill
+
+    add_column(cur, 'internships', 'field', "VARCHAR(100)")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS internship_skills (
+            internship_id INT NOT NULL,
+            skill VARCHAR(100) NOT NULL,
+            PRIMARY KEY (internship_id, skill),
+            FOREIGN KEY (internship_id) REFERENCES internships(id) ON DELETE CASCADE
+        )
+    """)
+    cur.execute("SELECT id, skills FROM internships WHERE skills IS NOT NULL")
+    rows = []
+    for row in cur.fetchall():
+        skills = json.loads(row['skills']) if isinstance(row['skills'], (str, bytes)) else row['skills']
+        for skill in {normalize_skill(skill)[:100] for skill in skills or []} - {''}:
+            rows.append((row['id'], skill))
+    if rows:
+        cur.executemany("INSERT IGNORE INTO internship_skills (internship_id, skill) VALUES (%s, %s)", rows)
+
+@migration(4, 'Add secondary indexes for the search, login and application queries')
+def add_secondary_indexes(cur):
+    cur.execute(
+        "SELECT COUNT(*) AS count FROM information_schema.statistics WHERE table_schema = DATABASE() "
+        "AND table_name = 'users' AND column_name = 'email' AND seq_in_index = 1 AND non_unique = 0"
+    )
+    if not cur.fetchone()['count']:
+        add_index(cur, 'users', 'idx_users_email', 'email', unique=True)
+
+    add_index(cur, 'internships', 'idx_internships_field', 'field, id')
+    add_index(cur, 'internships', 'idx_internships_location', 'location, id')
+    add_index(cur, 'internships', 'idx_internships_type', 'type, id')
+    add_index(cur, 'internship_skills', 'idx_internship_skills_skill', 'skill, internship_id')
+
+    if not index_exists(cur, 'applications', 'unique_application'):
+        # Keep the earliest of any duplicate applications before enforcing uniqueness
+        cur.execute("""
+            DELETE a FROM applications a
+            JOIN applications b ON a.user_id = b.user_id AND a.internship_id = b.internship_id AND a.id > b.id
+        """)
+        add_index(cur, 'applications', 'unique_application', 'user_id, internship_id', unique=True)
+    add_index(cur, 'applications', 'idx_applications_internship_status', 'internship_id, status, id')
+    add_index(cur, 'applications', 'idx_applications_user_applied', 'user_id, applied_at, id')
+
+@migration(5, 'Add the recommendation job queue and materialized recommendations')
+def add_recommendations(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS recommendation_jobs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT,
+            status ENUM('queued', 'running', 'done', 'failed') NOT NULL DEFAULT 'queued',
+            attempts INT NOT NULL DEFAULT 0,
+            error VARCHAR(500),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP NULL,
+            finished_at TIMESTAMP NULL,
+            INDEX idx_recommendation_jobs_status (status, id),
+            INDEX idx_recommendation_jobs_user (user_id, status)
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS recommendations (
+            user_id INT NOT NULL,
+            position SMALLINT NOT NULL,
+            internship_id INT NOT NULL,
+            score DOUBLE NOT NULL,
+            skill_match_count INT NOT NULL,
+            computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, position),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (internship_id) REFERENCES internships(id) ON DELETE CASCADE
+        )
+    """)
+
+@migration(6, 'Add the catalog generation counter polled by app processes')
+def add_catalog_state(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_state (
+            id TINYINT PRIMARY KEY,
+            generation BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+    cur.execute("INSERT IGNORE INTO catalog_state (id, generation) VALUES (1, 0)")
+
+@migration(7, 'Record when each student\'s recommendations were last computed')
+def add_recommendation_status(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS recommendation_status (
+            user_id INT PRIMARY KEY,
+            computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+# Runner
+def ensure_migrations_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def applied_versions(conn):
+    cur = conn.cursor(dictionary=True)
+    try:
+        ensure_migrations_table(cur)
+        cur.execute("SELECT version FROM schema_migrations")
+        return {row['version'] for row in cur.fetchall()}
+    finally:
+        cur.close()
+
+def pending_migrations(conn, target=None):
+    applied = applied_versions(conn)
+    return [(version, description, f) for version, description, f in MIGRATIONS
+            if version not in applied and (target is None or version <= target)]
+
+def upgrade(conn, target=None):
+    """Apply pending migrations up to `target` (all by default); returns [(version, description)] applied"""
+    applied = []
+    for version, description, f in pending_migrations(conn, target):
+        logging.info(f"Applying migration {version}: {description}")
+        cur = conn.cursor(dictionary=True)
+        try:
+            f(cur)
+            cur.execute("INSERT INTO schema_migrations (version, description) VALUES (%s, %s)", (version, description))
+            conn.commit()
+        finally:
+            cur.close()
+        applied.append((version, description))
+    return applied
+
+def status(conn):
+    """[(version, description, applied)] for every known migration"""
+    applied = applied_versions(conn)
+    return [(version, description, version in applied) for version, description, f in MIGRATIONS]
+
+# Query plan check
+def hot_queries():
+    """(name, query, params) for the queries on the API's hot paths.
+
+    The SQL comes from app and worker, so the plans checked are those of the
+    queries actually sent. Parameters are representative values; only the
+    plan matters.
+    """
+    import app
+    import worker
+
+    return (
+        ('login: user by email', app.USER_BY_EMAIL_QUERY, ('student@example.com',)),
+        ('auth: user by id', app.USER_BY_ID_QUERY, (1,)),
+        ('search: catalog page by skill and field',
+         *app.build_catalog_query(['python', 'sql'], ['Engineering'], {}, limit=15)),
+        ('search: catalog page by skill and type',
+         *app.build_catalog_query(['python'], [], {'type': 'Remote'}, limit=15, cursor=app.encode_cursor({'id': 1000}))),
+        ('applications: by student', app.STUDENT_APPLICATIONS_QUERY.format('a.user_id = %s'), (1, 21)),
+        ('applications: by internship and status',
+         app.INTERNSHIP_APPLICATIONS_QUERY.format('a.internship_id = %s AND a.status = %s'), (1, 'Pending', 21)),
+        ('recommendations: dashboard read', app.RECOMMENDATIONS_QUERY, (1,)),
+        ('recommendations: claim job', worker.CLAIM_JOB_QUERY, ()),
+        ('applications: status update', app.APPLICATION_STATUS_UPDATE, ('Approved', 1, 1))
+    )
+
+def check_query_plans(conn, strict=False):
+    """EXPLAIN every hot query; return a description of each full table scan.
+
+    By default only scans with no usable index (possible_keys is NULL) count,
+    because MySQL legitimately prefers a scan on small tables. With strict=True
+    every full table scan counts, which is meaningful on production-sized data.
+    """
+    problems = []
+    cur = conn.cursor(dictionary=True)
+    try:
+        for name, query, params in hot_queries():
+            cur.execute('EXPLAIN ' + query, params)
+            for row in cur.fetchall():
+                if row.get('type') == 'ALL' and (strict or not row.get('possible_keys')):
+                    problems.append(f"{name}: full table scan of {row.get('table')}")
+    finally:
+        cur.close()
+    return problems
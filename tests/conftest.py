@@ -0,0 +1,69 @@
+"""Fixtures running the app against the SQLite stand-in from benchmarks/sqlite_backend.py."""
+import os
+import sys
+
+import bcrypt
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import app as viinterns  # noqa: E402
+import bench_suite  # noqa: E402
+import sqlite_backend  # noqa: E402
+
+PASSWORD = 'test-password'
+CATALOG_SIZE = 300
+
+
+@pytest.fixture(scope='session')
+def password_hash():
+    return bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch, password_hash):
+    """A seeded database behind app.db_pool, with empty in-memory indexes and caches"""
+    path = str(tmp_path / 'viinterns.sqlite3')
+    bench_suite.seed_database(path, CATALOG_SIZE, 2, password_hash)
+    monkeypatch.setattr(viinterns, 'db_pool', viinterns.ConnectionPool(sqlite_backend.connector(path), size=2, max_overflow=0))
+    monkeypatch.setattr(viinterns, 'ai_service', viinterns.ViinternsAIService())
+    monkeypatch.setattr(viinterns, 'skill_vocabulary', viinterns.SkillIndex())
+    monkeypatch.setattr(viinterns, 'skill_vocabulary_loaded', False)
+    monkeypatch.setattr(viinterns, 'catalog_loaded', False)
+    monkeypatch.setattr(viinterns, 'catalog_generation', None)
+    monkeypatch.setattr(viinterns, 'catalog_max_id', 0)
+    monkeypatch.setattr(viinterns, 'catalog_checked_at', 0.0)
+    monkeypatch.setattr(viinterns.password_hasher, 'rounds', 4)
+    monkeypatch.setitem(viinterns.app.config, 'RATE_LIMIT_ENABLED', False)
+    viinterns.search_cache.invalidate()
+    viinterns.user_cache.clear()
+    viinterns.token_cache.clear()
+    yield path
+    viinterns.db_pool.close_idle()
+
+
+@pytest.fixture
+def client(database):
+    return viinterns.app.test_client()
+
+
+def login(client, email):
+    response = client.post('/api/login', json={'email': email, 'password': PASSWORD})
+    assert response.status_code == 200, response.get_json()
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+@pytest.fixture
+def student(client):
+    return login(client, 'student0@example.com')
+
+
+@pytest.fixture
+def recruiter(client, password_hash):
+    with viinterns.db_cursor(transaction=True) as cur:
+        cur.execute(
+            "INSERT INTO users (name, email, password, user_type, company) VALUES (%s, %s, %s, 'recruiter', %s)",
+            ('Recruiter', 'recruiter@example.com', password_hash, 'Company 0')
+        )
+    return login(client, 'recruiter@example.com')
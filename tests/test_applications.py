@@ -0,0 +1,99 @@
+import pytest
+
+import app as viinterns
+from conftest import login
+
+
+@pytest.fixture
+def internship(client, recruiter):
+    response = client.post('/api/internships', json={'title': 'Data Intern', 'company': 'Company 0'}, headers=recruiter)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['internship']['id']
+
+
+@pytest.fixture
+def applicants(client, internship, password_hash):
+    """Ten students who applied to `internship`; returns their application ids, oldest first"""
+    with viinterns.db_cursor(transaction=True) as cur:
+        cur.executemany(
+            "INSERT INTO users (name, email, password, user_type) VALUES (%s, %s, %s, 'student')",
+            [(f'Applicant {i}', f'applicant{i}@example.com', password_hash) for i in range(10)]
+        )
+    return [
+        client.post('/api/applications', json={'internshipId': internship},
+                    headers=login(client, f'applicant{i}@example.com')).get_json()['application']['id']
+        for i in range(10)
+    ]
+
+
+def walk(client, url, headers, limit):
+    applications, cursor = [], None
+    while True:
+        page = client.get(url, query_string=dict(limit=limit, **({'cursor': cursor} if cursor else {})), headers=headers)
+        assert page.status_code == 200, page.get_json()
+        applications.extend(page.get_json()['applications'])
+        cursor = page.get_json()['next_cursor']
+        if cursor is None:
+            return applications
+
+
+def test_student_applications_page_newest_first_across_timestamp_ties(client, student):
+    ids = [client.post('/api/applications', json={'internshipId': internship_id}, headers=student).get_json()['application']['id']
+           for internship_id in range(1, 8)]
+    # Three applications share a timestamp, so the id breaks the tie
+    for application_id, applied_at in zip(ids, ['2024-01-01 09:00:00'] * 3 + ['2024-01-02 09:00:00'] * 2 +
+                                          ['2024-01-03 09:00:00'] * 2):
+        viinterns.db_query("UPDATE applications SET applied_at = %s WHERE id = %s", (applied_at, application_id), fetch=None)
+
+    applications = walk(client, '/api/applications', student, 2)
+
+    assert [application['id'] for application in applications] == [ids[6], ids[5], ids[4], ids[3], ids[2], ids[1], ids[0]]
+    assert applications[0]['internship']['title']
+
+
+def test_duplicate_and_unknown_applications_are_rejected(client, student, recruiter):
+    assert client.post('/api/applications', json={'internshipId': 1}, headers=student).status_code == 201
+    assert client.post('/api/applications', json={'internshipId': 1}, headers=student).status_code == 409
+    assert client.post('/api/applications', json={'internshipId': 10 ** 6}, headers=student).status_code == 404
+    assert client.post('/api/applications', json={'internshipId': 1}, headers=recruiter).status_code == 403
+
+
+def test_recruiter_pages_applicants_and_filters_by_status(client, recruiter, internship, applicants):
+    url = f'/api/internships/{internship}/applications'
+    assert [application['id'] for application in walk(client, url, recruiter, 3)] == applicants[::-1]
+
+    response = client.post(f'{url}/status', json={'status': 'Approved', 'applicationIds': applicants[:4] + [applicants[0]]},
+                           headers=recruiter)
+    assert response.status_code == 200
+    assert response.get_json()['updated'] == 4
+
+    approved = client.get(url, query_string={'status': 'Approved'}, headers=recruiter).get_json()
+    assert [application['id'] for application in approved['applications']] == applicants[3::-1]
+    assert approved['applications'][0]['applicant']['email'] == 'applicant3@example.com'
+    assert client.get(url, query_string={'status': 'Hired'}, headers=recruiter).status_code == 400
+    assert client.get(url, query_string={'cursor': 'garbage'}, headers=recruiter).status_code == 400
+
+
+def test_bulk_status_only_touches_this_internships_applications(client, recruiter, student, internship, applicants):
+    other = client.post('/api/applications', json={'internshipId': 1}, headers=student).get_json()['application']['id']
+
+    response = client.post(f'/api/internships/{internship}/applications/status',
+                           json={'status': 'Rejected', 'applicationIds': [other, applicants[0]]}, headers=recruiter)
+
+    assert response.get_json()['updated'] == 1
+    assert viinterns.db_query("SELECT status FROM applications WHERE id = %s", (other,), fetch='one')['status'] == 'Pending'
+
+
+@pytest.mark.parametrize('body', [
+    {'status': 'Hired', 'applicationIds': [1]},
+    {'status': 'Approved', 'applicationIds': []},
+    {'status': 'Approved', 'applicationIds': 'all'},
+    {'status': 'Approved', 'applicationIds': ['one']}
+])
+def test_bulk_status_validates_its_input(client, recruiter, internship, body):
+    assert client.post(f'/api/internships/{internship}/applications/status', json=body, headers=recruiter).status_code == 400
+
+
+def test_only_the_posting_recruiter_sees_applicants(client, student, internship):
+    assert client.get(f'/api/internships/{internship}/applications', headers=student).status_code == 404
+    assert client.get('/api/internships/1/applications', headers=student).status_code == 404
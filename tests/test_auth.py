@@ -0,0 +1,53 @@
+import app as viinterns
+from conftest import PASSWORD, login
+
+
+def test_exhausted_connection_pool_is_503_not_401(client, student, monkeypatch):
+    monkeypatch.setattr(viinterns.db_pool, 'timeout', 0.05)
+    held = [viinterns.db_pool.acquire() for _ in range(viinterns.db_pool.size)]
+    try:
+        viinterns.user_cache.clear()
+        viinterns.search_cache.invalidate()
+        responses = [
+            client.post('/api/login', json={'email': 'student0@example.com', 'password': PASSWORD}),
+            client.get('/api/applications', headers=student),
+            client.post('/api/search-jobs', json={'skills': ['python'], 'careerFields': []})
+        ]
+    finally:
+        for conn in held:
+            viinterns.db_pool.release(conn)
+
+    assert [response.status_code for response in responses] == [503, 503, 503]
+    assert all(response.headers['Retry-After'] == '1' for response in responses)
+
+
+def stored_hash(email):
+    return viinterns.db_query("SELECT password FROM users WHERE email = %s", (email,), fetch='one')['password']
+
+
+def test_login_rehashes_an_outdated_cost_factor(client, monkeypatch):
+    assert stored_hash('student0@example.com').startswith('$2b$04$')
+    monkeypatch.setattr(viinterns.password_hasher, 'rounds', 5)
+
+    login(client, 'student0@example.com')
+    rehashed = stored_hash('student0@example.com')
+    assert rehashed.startswith('$2b$05$')
+
+    login(client, 'student0@example.com')
+    assert stored_hash('student0@example.com') == rehashed
+
+
+def test_full_hashing_queue_sheds_logins_with_503(client, monkeypatch):
+    hasher = viinterns.PasswordHasher(rounds=4, workers=1, max_queue=1)
+    monkeypatch.setattr(viinterns, 'password_hasher', hasher)
+    hasher._slots.acquire()
+    try:
+        response = client.post('/api/login', json={'email': 'student0@example.com', 'password': PASSWORD})
+        registration = client.post('/api/register', json={'name': 'New', 'email': 'new@example.com', 'password': PASSWORD})
+    finally:
+        hasher._slots.release()
+
+    assert response.status_code == 503 and registration.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert hasher.rejected == 2
+    assert login(client, 'student0@example.com')
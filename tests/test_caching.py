@@ -0,0 +1,58 @@
+import time
+
+import app as viinterns
+
+
+def test_ttl_cache_expires_entries_and_evicts_least_recently_used():
+    cache = viinterns.TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['evictions'] == 1
+
+    cache.set('short', 4, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get('short') is None
+
+
+def test_authenticated_requests_load_the_user_once(client, student, monkeypatch):
+    lookups = []
+    get_user_by_id = viinterns.get_user_by_id
+    monkeypatch.setattr(viinterns, 'get_user_by_id', lambda user_id: lookups.append(user_id) or get_user_by_id(user_id))
+    viinterns.user_cache.clear()
+
+    for _ in range(3):
+        assert client.get('/api/applications', headers=student).status_code == 200
+
+    assert len(lookups) == 1
+    cached = viinterns.user_cache.get(lookups[0])
+    assert cached['email'] == 'student0@example.com'
+    assert 'password' not in cached
+
+
+def test_profile_update_invalidates_the_cached_user(client, student):
+    viinterns.chat_cache.clear()
+    client.put('/api/profile', json={'name': 'Ada Lovelace', 'skills': ['python']}, headers=student)
+    assert client.post('/api/chat', json={'message': 'hello'}, headers=student).get_json()['response'].startswith('Hello Ada!')
+
+    client.put('/api/profile', json={'name': 'Grace Hopper'}, headers=student)
+    assert client.post('/api/chat', json={'message': 'hello'}, headers=student).get_json()['response'].startswith('Hello Grace!')
+
+
+def test_decoded_tokens_are_cached_no_longer_than_they_are_valid():
+    import jwt
+
+    token = jwt.encode({'user_id': 1, 'exp': int(time.time()) + 2}, viinterns.app.config['SECRET_KEY'], algorithm='HS256')
+    viinterns.token_cache.clear()
+    assert viinterns.decode_token(token)['user_id'] == 1
+    assert viinterns.token_cache.get(token) is not None
+    assert viinterns.token_cache._data[token][0] <= time.monotonic() + 2
+
+
+def test_bad_tokens_are_rejected(client):
+    assert client.get('/api/applications', headers={'Authorization': 'Bearer not-a-token'}).status_code == 401
+    assert client.get('/api/applications').status_code == 401
@@ -0,0 +1,58 @@
+import pytest
+
+import app as viinterns
+
+
+@pytest.fixture(autouse=True)
+def empty_chat_cache():
+    viinterns.chat_cache.clear()
+
+
+@pytest.mark.parametrize('message, intent', [
+    ('Hello!', 'greeting'),
+    ('Good morning', 'greeting'),
+    ('hi, any internships for me?', 'greeting'),
+    ('Any internships for me?', 'internship'),
+    ('Can you recommend a role?', 'internship'),
+    ('Please check my CV', 'resume'),
+    ('help with a cover letter', 'resume'),
+    ('Is an internship resume different?', 'internship'),
+    ('interview tips', 'interview'),
+    ('which courses should I take', 'skills'),
+    ('this machine is thinking', 'fallback'),
+    ('the cover of my book', 'fallback'),
+    ('', 'fallback')
+])
+def test_messages_are_classified_by_whole_words_in_priority_order(message, intent):
+    assert viinterns.chat_intents.classify(message) == intent
+
+
+def test_only_the_start_of_a_long_message_is_classified():
+    message = 'x ' * viinterns.MAX_CHAT_CLASSIFY_LENGTH + 'hello'
+    assert viinterns.chat_intents.classify(message) == 'fallback'
+
+
+def test_anonymous_chat_gets_the_generic_reply(client):
+    response = client.post('/api/chat', json={'message': 'any internships?'})
+    assert response.status_code == 200
+    assert response.get_json()['response'] == viinterns.DEFAULT_CHAT_TEMPLATES['internship']
+
+
+def test_signed_in_student_gets_replies_for_their_current_profile(client, student):
+    assert client.put('/api/profile', json={'skills': ['python', 'sql']}, headers=student).status_code == 200
+    first = client.post('/api/chat', json={'message': 'any internships?'}, headers=student).get_json()['response']
+    assert first.startswith('Based on your skills (python, sql)')
+    greeting = client.post('/api/chat', json={'message': 'hello'}, headers=student).get_json()['response']
+    assert greeting.startswith('Hello Student!')
+
+    client.put('/api/profile', json={'skills': ['teaching']}, headers=student)
+    second = client.post('/api/chat', json={'message': 'any internships?'}, headers=student).get_json()['response']
+    assert second.startswith('Based on your skills (teaching)')
+
+    client.put('/api/profile', json={'name': 'Ada Lovelace'}, headers=student)
+    renamed = client.post('/api/chat', json={'message': 'hello'}, headers=student).get_json()['response']
+    assert renamed.startswith('Hello Ada!')
+
+
+def test_non_string_message_is_rejected(client):
+    assert client.post('/api/chat', json={'message': ['hello']}).status_code == 400
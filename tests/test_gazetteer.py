@@ -0,0 +1,43 @@
+import pytest
+
+import app as viinterns
+
+
+@pytest.fixture(scope='module')
+def gazetteer():
+    return viinterns.Gazetteer(viinterns.app.config['GAZETTEER_FILE'])
+
+
+@pytest.mark.parametrize('text, place_id', [
+    ('San Francisco, CA', 'us/ca/san-francisco'),
+    ('san francisco,  ca , usa', 'us/ca/san-francisco'),
+    ('San Francisco, CA 94103', 'us/ca/san-francisco'),
+    ('Austin TX', 'us/tx/austin'),
+    ('Cambridge, MA', 'us/ma/cambridge'),
+    ('Cambridge, GB', 'gb/eng/cambridge'),
+    ('Toronto, CA', 'ca/on/toronto'),
+    ('London', 'gb/eng/london'),
+    ('California, USA', 'us/ca'),
+    ('Berlin, Germany', 'de/berlin')
+])
+def test_resolves_known_places(gazetteer, text, place_id):
+    assert gazetteer.place_id(text) == place_id
+
+
+@pytest.mark.parametrize('text', ['Remote', '', 'Atlantis', 'London, ON', 'Berlin, USA', 'Austin TX, Canada', 'Ontario, USA'])
+def test_unknown_or_contradictory_locations_do_not_resolve(gazetteer, text):
+    assert gazetteer.place_id(text) is None
+
+
+def test_region_contains_its_cities(gazetteer):
+    california = gazetteer.resolve('California')
+    places = gazetteer.matching_place_ids(california)
+    assert 'us/ca/san-francisco' in places
+    assert 'us/tx/austin' not in places
+
+
+def test_radius_matches_nearby_cities_only(gazetteer):
+    san_francisco = gazetteer.resolve('San Francisco, CA')
+    nearby = gazetteer.matching_place_ids(san_francisco, radius_km=50)
+    assert 'us/ca/san-francisco' in nearby
+    assert 'us/ca/los-angeles' not in nearby
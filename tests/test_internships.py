@@ -0,0 +1,106 @@
+import io
+import json
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+import app as viinterns
+from conftest import CATALOG_SIZE
+
+
+def ndjson(*records):
+    return '\n'.join(record if isinstance(record, str) else json.dumps(record) for record in records) + '\n'
+
+
+def internship_count():
+    return viinterns.db_query("SELECT COUNT(*) AS count FROM internships", fetch='one')['count']
+
+
+def test_bulk_ingest_reports_per_row_errors_with_207(client, recruiter):
+    body = ndjson(
+        {'title': 'Data Intern', 'company': 'Acme', 'skills': ['python', 'sql']},
+        {'company': 'Acme'},
+        '{not json',
+        {'title': 'Design Intern', 'company': 'Acme', 'type': 'Underwater'},
+        {'title': 'Long Skill Intern', 'company': 'Acme', 'skills': ['x' * 101]},
+        {'title': 'Web Intern', 'company': 'Acme', 'skills': 'html, css'}
+    )
+    response = client.post('/api/internships/bulk', data=body, content_type='application/x-ndjson', headers=recruiter)
+
+    assert response.status_code == 207
+    result = response.get_json()
+    assert result['inserted'] == 2
+    assert result['failed'] == 4
+    assert [error['row'] for error in result['errors']] == [2, 3, 4, 5]
+    assert result['errors'][0]['errors'] == ['title is required']
+    assert result['errors'][1]['errors'] == ['Malformed row']
+    assert 'longer than 100 characters' in result['errors'][3]['errors'][0]
+    assert internship_count() == CATALOG_SIZE + 2
+
+
+def test_bulk_ingest_of_valid_csv_is_200(client, recruiter):
+    body = 'title,company,skills\nData Intern,Acme,"python, sql"\nWeb Intern,Acme,html\n'
+    response = client.post('/api/internships/bulk', data=body, content_type='text/csv', headers=recruiter)
+
+    assert response.status_code == 200
+    assert response.get_json()['inserted'] == 2
+    assert response.get_json()['errors'] == []
+    skills = viinterns.db_query(
+        "SELECT s.skill FROM internship_skills s JOIN internships i ON i.id = s.internship_id "
+        "WHERE i.title = %s ORDER BY s.skill", ('Data Intern',)
+    )
+    assert [row['skill'] for row in skills] == ['python', 'sql']
+
+
+def test_bulk_ingest_needs_a_recruiter(client, student):
+    response = client.post('/api/internships/bulk', data=ndjson({'title': 'x', 'company': 'y'}),
+                           content_type='application/x-ndjson', headers=student)
+    assert response.status_code == 403
+
+
+def test_non_string_field_and_type_are_row_errors(client, recruiter):
+    body = ndjson(
+        {'title': 'Data Intern', 'company': 'Acme', 'field': ['Engineering']},
+        {'title': 'Data Intern', 'company': 'Acme', 'type': {'Remote': True}},
+        {'title': 'Data Intern', 'company': 'Acme', 'field': 'Engineering', 'type': 'Remote'}
+    )
+    response = client.post('/api/internships/bulk', data=body, content_type='application/x-ndjson', headers=recruiter)
+
+    assert response.status_code == 207
+    assert response.get_json()['inserted'] == 1
+    assert [error['errors'] for error in response.get_json()['errors']] == [['Unknown field'], [
+        'type must be one of Remote, Hybrid, On-site']]
+
+    response = client.post('/api/internships', json={'title': 'x', 'company': 'y', 'field': ['Engineering']}, headers=recruiter)
+    assert response.status_code == 400
+
+
+def test_bulk_ingest_has_its_own_size_limit(client, recruiter, monkeypatch):
+    rows = [{'title': f'Intern {i}', 'company': 'Acme', 'skills': ['python']} for i in range(20)]
+    monkeypatch.setitem(viinterns.app.config, 'MAX_CONTENT_LENGTH', 100)
+    response = client.post('/api/internships/bulk', data=ndjson(*rows), content_type='application/x-ndjson', headers=recruiter)
+    assert response.status_code == 200
+    assert response.get_json()['inserted'] == 20
+
+    monkeypatch.setitem(viinterns.app.config, 'BULK_INGEST_MAX_BYTES', 100)
+    response = client.post('/api/internships/bulk', data=ndjson(*rows), content_type='application/x-ndjson', headers=recruiter)
+    assert response.status_code == 413
+    assert response.get_json()['inserted'] == 0
+
+
+def test_upload_cut_off_part_way_reports_committed_rows(client, recruiter, monkeypatch):
+    rows = [{'title': f'Intern {i}', 'company': 'Acme'} for i in range(2000)]
+    body = ndjson(*rows).encode('utf-8')
+    monkeypatch.setitem(viinterns.app.config, 'BULK_INGEST_BATCH_SIZE', 100)
+    monkeypatch.setitem(viinterns.app.config, 'BULK_INGEST_MAX_BYTES', len(body) // 2)
+    # A chunked upload has no Content-Length, so the limit is only hit while streaming
+    environ = EnvironBuilder('/api/internships/bulk', method='POST', input_stream=io.BytesIO(body),
+                             content_type='application/x-ndjson', headers=recruiter).get_environ()
+    del environ['CONTENT_LENGTH']
+    environ['wsgi.input_terminated'] = True
+    # Called directly: the test client would buffer the body first
+    body, status, headers = run_wsgi_app(viinterns.app, environ)
+
+    assert status.startswith('413')
+    inserted = json.loads(b''.join(body))['inserted']
+    assert 0 < inserted < 2000 and inserted % 100 == 0
+    assert internship_count() == CATALOG_SIZE + inserted
@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+import app as viinterns
+import asgi
+from conftest import PASSWORD
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    fresh = viinterns.Metrics()
+    monkeypatch.setattr(viinterns, 'metrics', fresh)
+    return fresh
+
+
+def call_asgi(method, path, payload):
+    body = json.dumps(payload).encode('utf-8')
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b'', 'client': ('127.0.0.1', 5000),
+             'headers': [(b'content-type', b'application/json')]}
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.application(scope, receive, send))
+    return sent
+
+
+def test_flask_requests_record_route_and_component_timings(client, metrics):
+    response = client.post('/api/login', json={'email': 'student0@example.com', 'password': PASSWORD})
+
+    assert response.status_code == 200
+    timing = response.headers['Server-Timing']
+    assert 'db;dur=' in timing and 'bcrypt;dur=' in timing and 'total;dur=' in timing
+    assert metrics.routes[('/api/login', 'POST')].count == 1
+    assert metrics.responses[('/api/login', 'POST', 200)] == 1
+    assert metrics.components['db'].count == 1 and metrics.components['db'].sum > 0
+    assert metrics.components['bcrypt'].count == 1 and metrics.components['bcrypt'].sum > 0
+
+
+def test_server_errors_are_counted_per_route(client, metrics, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('boom')
+    monkeypatch.setattr(viinterns, 'search_cache_key', fail)
+
+    assert client.post('/api/search-jobs', json={'skills': ['python']}).status_code == 500
+    assert metrics.errors['/api/search-jobs'] == 1
+
+
+def test_native_asgi_routes_add_no_component_observations(database, metrics):
+    sent = call_asgi('POST', '/api/chat', {'message': 'hello'})
+
+    assert sent[0]['status'] == 200
+    assert metrics.routes[('/api/chat', 'POST')].count == 1
+    assert metrics.responses[('/api/chat', 'POST', 200)] == 1
+    assert all(histogram.count == 0 for histogram in metrics.components.values())
+
+
+def test_metrics_endpoint_renders_prometheus_text(client, metrics):
+    client.post('/api/search-jobs', json={'skills': ['python'], 'careerFields': []})
+    text = client.get('/metrics').get_data(as_text=True)
+
+    assert 'viinterns_request_duration_seconds_count{route="/api/search-jobs",method="POST"} 1' in text
+    assert 'viinterns_responses_total{route="/api/search-jobs",method="POST",status="200"} 1' in text
+    assert 'viinterns_request_component_seconds_count{component="db"} 1' in text
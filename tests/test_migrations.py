@@ -0,0 +1,64 @@
+import migrations
+
+
+class RecordingConnection:
+    """Stands in for a MySQL connection; upgrade() only needs cursors and commit"""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self, dictionary=True):
+        return RecordingCursor(self.statements)
+
+    def commit(self):
+        self.commits += 1
+
+
+class RecordingCursor:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def execute(self, query, params=()):
+        self.statements.append((query, params))
+
+    def close(self):
+        pass
+
+
+def test_versions_are_unique_and_in_order():
+    versions = [version for version, description, f in migrations.MIGRATIONS]
+    assert versions == list(range(1, len(versions) + 1))
+
+
+def test_pending_migrations_skip_applied_versions_in_order(monkeypatch):
+    monkeypatch.setattr(migrations, 'applied_versions', lambda conn: {1, 2, 4})
+    pending = [version for version, description, f in migrations.pending_migrations(None)]
+    assert pending == [3] + list(range(5, len(migrations.MIGRATIONS) + 1))
+    assert [version for version, description, f in migrations.pending_migrations(None, target=5)] == [3, 5]
+
+
+def test_upgrade_applies_and_records_each_migration_in_order(monkeypatch):
+    calls = []
+    monkeypatch.setattr(migrations, 'MIGRATIONS', [
+        (version, f'migration {version}', lambda cur, version=version: calls.append(version)) for version in (1, 2, 3)
+    ])
+    monkeypatch.setattr(migrations, 'applied_versions', lambda conn: {1})
+    conn = RecordingConnection()
+
+    applied = migrations.upgrade(conn)
+
+    assert applied == [(2, 'migration 2'), (3, 'migration 3')]
+    assert calls == [2, 3]
+    assert [params[0] for query, params in conn.statements if 'schema_migrations' in query] == [2, 3]
+    assert conn.commits == 2
+
+
+def test_hot_queries_use_the_app_sql():
+    import app as viinterns
+
+    queries = {name: query for name, query, params in migrations.hot_queries()}
+    assert queries['auth: user by id'] == viinterns.USER_BY_ID_QUERY
+    assert queries['search: catalog page by skill and field'].startswith('SELECT i.* FROM internships i WHERE EXISTS')
+    for name, query, params in migrations.hot_queries():
+        assert query.count('%s') == len(params), name
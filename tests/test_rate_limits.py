@@ -0,0 +1,71 @@
+import pytest
+
+import app as viinterns
+from conftest import PASSWORD
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Enable rate limiting with fresh buckets; returns the RATE_LIMITS dict to adjust"""
+    monkeypatch.setitem(viinterns.app.config, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(viinterns, 'rate_limit_store', viinterns.TokenBucketStore())
+    limits = {'login': {'ip': (100, 1.0), 'email': (2, 0.01)}, 'search': {'ip': (3, 0.01)}}
+    monkeypatch.setitem(viinterns.app.config, 'RATE_LIMITS', limits)
+    return limits
+
+
+def test_token_bucket_allows_a_burst_then_reports_the_wait():
+    store = viinterns.TokenBucketStore()
+    assert [store.take('key', 3, 1.0) for _ in range(3)] == [0, 0, 0]
+    assert 0 < store.take('key', 3, 1.0) <= 1.0
+    assert store.take('other', 3, 1.0) == 0
+
+
+def test_login_is_limited_per_email(client, limits):
+    attempts = [client.post('/api/login', json={'email': 'student0@example.com', 'password': 'wrong'}) for _ in range(3)]
+
+    assert [response.status_code for response in attempts] == [401, 401, 429]
+    assert int(attempts[2].headers['Retry-After']) >= 1
+    # The same address may still sign in to another account
+    assert client.post('/api/login', json={'email': 'student1@example.com', 'password': PASSWORD}).status_code == 200
+
+
+def test_search_is_limited_per_client_address(client, limits):
+    query = {'skills': ['python'], 'careerFields': []}
+    statuses = [client.post('/api/search-jobs', json=query, environ_base={'REMOTE_ADDR': '10.0.0.1'}).status_code
+                for _ in range(4)]
+
+    assert statuses == [200, 200, 200, 429]
+    assert client.post('/api/search-jobs', json=query, environ_base={'REMOTE_ADDR': '10.0.0.2'}).status_code == 200
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies(client, limits):
+    query = {'skills': ['python'], 'careerFields': []}
+    statuses = [client.post('/api/search-jobs', json=query, headers={'X-Forwarded-For': f'192.0.2.{i}'}).status_code
+                for i in range(4)]
+    assert statuses[-1] == 429
+
+
+def test_rejections_are_counted(client, limits):
+    viinterns.rate_limited_total.clear()
+    for _ in range(3):
+        client.post('/api/login', json={'email': 'student0@example.com', 'password': 'wrong'})
+    assert viinterns.rate_limited_total[('login', 'email')] == 1
+
+
+def test_full_process_sheds_requests_but_answers_monitoring(client, monkeypatch):
+    admission = viinterns.AdmissionControl(limit=1, timeout=0)
+    monkeypatch.setattr(viinterns, 'admission', admission)
+    assert admission.acquire()
+    try:
+        shed = client.post('/api/search-jobs', json={'skills': ['python'], 'careerFields': []})
+        health = client.get('/api/health')
+        metrics = client.get('/metrics')
+    finally:
+        admission.release()
+
+    assert shed.status_code == 503 and shed.headers['Retry-After'] == '1'
+    assert health.status_code == 200 and metrics.status_code == 200
+    assert admission.shed == 1
+    assert client.post('/api/search-jobs', json={'skills': ['python'], 'careerFields': []}).status_code == 200
+    assert admission.in_flight == 0
@@ -0,0 +1,83 @@
+import pytest
+
+import app as viinterns
+import worker
+
+
+def queued_jobs():
+    return viinterns.db_query("SELECT user_id, status FROM recommendation_jobs WHERE status = 'queued' ORDER BY id")
+
+
+def run_queue():
+    """Run queued jobs in this process, as worker.run does on its pool"""
+    jobs = []
+    while True:
+        job = worker.claim_job()
+        if job is None:
+            return jobs
+        for batch in worker.job_batches(job):
+            worker.compute_batch(batch)
+        worker.finish_job(job)
+        jobs.append(job)
+
+
+@pytest.fixture
+def student_id(student):
+    return viinterns.db_query("SELECT id FROM users WHERE email = %s", ('student0@example.com',), fetch='one')['id']
+
+
+def test_recommendations_are_pending_until_the_worker_runs(client, student, student_id):
+    client.put('/api/profile', json={'skills': ['python', 'sql']}, headers=student)
+    assert queued_jobs() == [{'user_id': student_id, 'status': 'queued'}]
+
+    pending = client.get('/api/recommendations', headers=student).get_json()
+    assert pending['status'] == 'pending'
+    assert len(queued_jobs()) == 1
+
+    assert [job['user_id'] for job in run_queue()] == [student_id]
+    ready = client.get('/api/recommendations', headers=student).get_json()
+
+    assert ready['status'] == 'ready' and ready['computedAt']
+    expected = viinterns.ai_service.match_catalog(['python', 'sql'], limit=viinterns.app.config['RECOMMENDATIONS_TOP_K'])
+    assert [internship['id'] for internship in ready['internships']] == [internship['id'] for internship in expected]
+    assert ready['internships'][0]['skillMatchRatio'] == ready['internships'][0]['skillMatchCount'] / 2
+
+
+def test_student_without_matches_is_ready_with_nothing(client, student):
+    client.put('/api/profile', json={'skills': ['underwater basket weaving']}, headers=student)
+    run_queue()
+
+    response = client.get('/api/recommendations', headers=student).get_json()
+    assert response['status'] == 'ready'
+    assert response['internships'] == []
+    assert queued_jobs() == []
+
+
+def test_catalog_job_supersedes_queued_student_jobs(client, student, recruiter, student_id):
+    client.put('/api/profile', json={'skills': ['python']}, headers=student)
+    client.post('/api/internships', json={'title': 'Python Intern', 'company': 'Acme', 'skills': ['python']}, headers=recruiter)
+    viinterns.enqueue_recommendations()
+    viinterns.enqueue_recommendations(student_id)
+    assert queued_jobs() == [{'user_id': student_id, 'status': 'queued'}, {'user_id': None, 'status': 'queued'}]
+
+    assert [job['user_id'] for job in run_queue()] == [None]
+    titles = [internship['title'] for internship in client.get('/api/recommendations', headers=student).get_json()['internships']]
+    assert 'Python Intern' in titles
+
+
+def test_failed_jobs_are_retried_until_they_run_out_of_attempts(database, monkeypatch):
+    monkeypatch.setitem(viinterns.app.config, 'RECOMMENDATION_MAX_ATTEMPTS', 2)
+    viinterns.enqueue_recommendations(1)
+
+    for expected in ('queued', 'failed'):
+        job = worker.claim_job()
+        worker.finish_job(job, 'boom')
+        assert viinterns.db_query("SELECT status FROM recommendation_jobs WHERE id = %s", (job['id'],), fetch='one')['status'] == expected
+    assert worker.claim_job() is None
+
+
+def test_recruiters_and_students_without_skills_get_an_empty_ready_list(client, student, recruiter):
+    for headers in (student, recruiter):
+        assert client.get('/api/recommendations', headers=headers).get_json() == {
+            'internships': [], 'status': 'ready', 'computedAt': None}
+    assert queued_jobs() == []
@@ -0,0 +1,81 @@
+import io
+import time
+
+import docx
+import pytest
+
+import app as viinterns
+
+
+@pytest.fixture
+def uploads(tmp_path, monkeypatch):
+    folder = tmp_path / 'uploads'
+    folder.mkdir()
+    monkeypatch.setitem(viinterns.app.config, 'UPLOAD_FOLDER', str(folder))
+    viinterns.resume_cache.clear()
+    return folder
+
+
+def resume_docx(*paragraphs):
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def upload(client, headers, content, filename='resume.docx'):
+    return client.post('/api/resume', data={'resume': (io.BytesIO(content), filename)},
+                       content_type='multipart/form-data', headers=headers)
+
+
+def wait_for_job(client, headers, job_id):
+    for _ in range(200):
+        job = client.get(f'/api/resume/{job_id}', headers=headers).get_json()
+        if job['status'] != 'pending':
+            return job
+        time.sleep(0.01)
+    raise AssertionError('resume job did not finish')
+
+
+def test_resume_is_parsed_in_the_background_and_the_upload_deleted(client, student, uploads):
+    response = upload(client, student, resume_docx('Software developer, web development projects.', 'Volunteer teaching at a school.'))
+    assert response.status_code == 202
+
+    job = wait_for_job(client, student, response.get_json()['jobId'])
+
+    assert job['status'] == 'done'
+    assert {'Software', 'Developer', 'Web Development', 'Teaching'} <= set(job['result']['skills'])
+    assert job['result']['careerFields'] == ['Education', 'Engineering']
+    assert job['result']['sections'] == 2
+    assert list(uploads.iterdir()) == []
+
+
+def test_reupload_is_answered_from_the_cache_without_writing(client, student, uploads, monkeypatch):
+    content = resume_docx('Python and SQL projects.')
+    first = wait_for_job(client, student, upload(client, student, content).get_json()['jobId'])
+
+    def no_save(stream, extension):
+        raise AssertionError('a cached resume was written to disk')
+    monkeypatch.setattr(viinterns, 'save_upload', no_save)
+    again = upload(client, student, content)
+
+    assert again.status_code == 200
+    assert again.get_json()['result'] == first['result']
+    assert client.get(f"/api/resume/{again.get_json()['jobId']}", headers=student).get_json()['status'] == 'done'
+
+
+def test_unparseable_resume_fails_and_is_deleted(client, student, uploads):
+    response = upload(client, student, b'not a pdf', filename='resume.pdf')
+    job = wait_for_job(client, student, response.get_json()['jobId'])
+
+    assert job['status'] == 'failed'
+    assert list(uploads.iterdir()) == []
+
+
+def test_jobs_are_private_and_extensions_checked(client, student, recruiter, uploads):
+    job_id = upload(client, student, resume_docx('Python')).get_json()['jobId']
+    assert client.get(f'/api/resume/{job_id}', headers=recruiter).status_code == 404
+    assert upload(client, student, b'text', filename='resume.txt').status_code == 400
+    wait_for_job(client, student, job_id)
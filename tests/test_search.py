@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+import app as viinterns
+import bench_suite
+
+
+def walk_pages(client, query, page_size):
+    """Follow next_cursor from the first page to the last; returns the internships of every page"""
+    internships, cursor = [], None
+    while True:
+        body = dict(query, limit=page_size, **({'cursor': cursor} if cursor else {}))
+        response = client.post('/api/search-jobs', json=body)
+        assert response.status_code == 200
+        page = response.get_json()
+        assert len(page['internships']) <= page_size
+        internships.extend(page['internships'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return internships
+
+
+@pytest.mark.parametrize('query', [
+    {'skills': ['teaching', 'nursing'], 'careerFields': []},
+    {'skills': ['teaching', 'nursing'], 'careerFields': [], 'sort': 'relevance'},
+    {'skills': ['react'], 'careerFields': [], 'preferences': {'location': 'San Francisco, CA'}}
+], ids=['newest', 'relevance', 'gazetteer'])
+def test_cursor_pages_cover_the_single_page_result(client, query):
+    everything = client.post('/api/search-jobs', json=dict(query, limit=100)).get_json()
+    assert everything['next_cursor'] is None and len(everything['internships']) > 7
+
+    paged = walk_pages(client, query, 7)
+
+    assert [internship['id'] for internship in paged] == [internship['id'] for internship in everything['internships']]
+
+
+def test_newest_first_pages_are_in_descending_id_order(client):
+    ids = [internship['id'] for internship in walk_pages(client, {'skills': ['python'], 'careerFields': []}, 5)]
+    assert ids == sorted(set(ids), reverse=True)
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.post('/api/search-jobs', json={'skills': ['python'], 'careerFields': [], 'cursor': 'not-a-cursor'})
+    assert response.status_code == 400
+
+
+def test_top_k_matches_a_full_sort():
+    random.seed(bench_suite.SEED)
+    vocabulary = bench_suite.skill_vocabulary(100)
+    service = viinterns.ViinternsAIService()
+    for internship in bench_suite.synthetic_catalog(1000, vocabulary):
+        service.index_internship(internship)
+
+    for user_skills in (random.sample(vocabulary, 3), random.sample(vocabulary, 20), ['python', 'sql']):
+        ranked = service.match_catalog(user_skills, limit=None)
+        assert len(ranked) > 20
+        for limit, offset in ((1, 0), (15, 0), (15, 15), (10, len(ranked) - 5)):
+            page = service.match_catalog(user_skills, limit=limit, offset=offset)
+            expected = ranked[offset:offset + limit]
+            assert [(i['id'], i['relevanceScore']) for i in page] == [(i['id'], i['relevanceScore']) for i in expected]
+
+
+def test_matching_etag_gets_304(client):
+    query = {'skills': ['python', 'sql'], 'careerFields': []}
+    first = client.post('/api/search-jobs', json=query)
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and etag.startswith('W/')
+
+    repeat = client.post('/api/search-jobs', json=query, headers={'If-None-Match': etag})
+    assert repeat.status_code == 304
+    assert repeat.headers['ETag'] == etag
+    assert repeat.data == b''
+
+    other = client.post('/api/search-jobs', json=dict(query, skills=['java']), headers={'If-None-Match': etag})
+    assert other.status_code == 200
+    assert other.headers['ETag'] != etag
+
+
+def test_frontend_remote_preferences_filter_on_type(client):
+    # index.html always sends these, and locations hold cities
+    query = {'skills': ['python', 'sql'], 'careerFields': ['Engineering', 'Business', 'Science'],
+             'preferences': {'location': 'Remote', 'workMode': 'Remote'}}
+    internships = client.post('/api/search-jobs', json=dict(query, limit=100)).get_json()['internships']
+    assert internships
+    assert {internship['type'] for internship in internships} == {'Remote'}
+
+
+def test_work_mode_is_a_type_filter(client):
+    query = {'skills': ['python'], 'careerFields': [], 'preferences': {'workMode': 'Hybrid'}}
+    internships = client.post('/api/search-jobs', json=dict(query, limit=100)).get_json()['internships']
+    assert internships
+    assert {internship['type'] for internship in internships} == {'Hybrid'}
+
+
+@pytest.mark.parametrize('body', [
+    {'skills': 5},
+    {'skills': [['python']]},
+    {'skills': ['python'], 'careerFields': {'Engineering': True}},
+    {'skills': ['python'], 'preferences': {'type': 5}},
+    {'skills': ['python'], 'preferences': {'type': [['x']]}},
+    {'skills': ['python'], 'preferences': {'location': ['Remote']}},
+    {'skills': ['python'], 'preferences': []}
+])
+def test_malformed_criteria_are_rejected(client, body):
+    assert client.post('/api/search-jobs', json=body).status_code == 400
+
+
+def test_comma_separated_skills_are_split(client):
+    as_string = client.post('/api/search-jobs', json={'skills': 'python, sql', 'careerFields': 'Engineering', 'limit': 100})
+    as_list = client.post('/api/search-jobs', json={'skills': ['python', 'sql'], 'careerFields': ['Engineering'], 'limit': 100})
+    assert as_string.status_code == 200
+    assert as_string.get_json()['internships'] == as_list.get_json()['internships']
@@ -0,0 +1,150 @@
+"""Background worker that precomputes per-student recommendations.
+
+    flask --app app recommendations worker [--processes N] [--once]
+
+Jobs are rows in the recommendation_jobs table, queued by the API when a
+student's skills change (one student) or the catalog changes (every student).
+The worker claims them with SELECT ... FOR UPDATE SKIP LOCKED, so several
+workers, on one host or many, can share the queue. Catalog-wide jobs are
+claimed first, since they also cover every student job queued before them;
+the rest go in id order. Students are split into batches scored on a process
+pool; each pool process holds its own copy of the catalog index and writes its
+batch's top-k rows to the recommendations table. A catalog-wide job starts a
+fresh pool so the index is reloaded.
+"""
+import logging
+import multiprocessing
+import time
+
+import app as viinterns
+
+# Running jobs older than this are assumed to belong to a dead worker
+STALE_JOB_SECONDS = 3600
+
+def init_process():
+    """Pool initializer: load the catalog index once per process"""
+    viinterns.ensure_catalog_loaded()
+
+def compute_batch(user_ids):
+    """Recompute and store the top-k recommendations for a batch of students; returns the batch size"""
+    # Picks up internships posted since this process loaded the index
+    viinterns.ensure_catalog_loaded()
+    users = viinterns.db_query(
+        "SELECT id, skills FROM users WHERE id IN ({})".format(', '.join(['%s'] * len(user_ids))),
+        user_ids
+    )
+    profiles = [{'skills': viinterns.user_skills(user)} for user in users]
+    rows = []
+    for user, internships in zip(users, viinterns.ai_service.match_batch(profiles, limit=viinterns.app.config['RECOMMENDATIONS_TOP_K'])):
+        for position, internship in enumerate(internships):
+            rows.append((user['id'], position, internship['id'], internship['relevanceScore'], internship['skillMatchCount']))
+
+    with viinterns.db_cursor(transaction=True) as cur:
+        cur.execute(
+            "DELETE FROM recommendations WHERE user_id IN ({})".format(', '.join(['%s'] * len(user_ids))),
+            user_ids
+        )
+        if rows:
+            cur.executemany(
+                "INSERT INTO recommendations (user_id, position, internship_id, score, skill_match_count) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows
+            )
+        # Marks students as computed even when nothing matched, so they are not reported pending
+        if users:
+            cur.executemany(
+                "INSERT INTO recommendation_status (user_id) VALUES (%s) "
+                "ON DUPLICATE KEY UPDATE computed_at = CURRENT_TIMESTAMP",
+                [(user['id'],) for user in users]
+            )
+    return len(user_ids)
+
+CLAIM_JOB_QUERY = (
+    "SELECT id, user_id, attempts FROM recommendation_jobs WHERE status = 'queued' "
+    "ORDER BY user_id IS NULL DESC, id LIMIT 1 FOR UPDATE SKIP LOCKED"
+)
+
+def claim_job():
+    """Mark the oldest queued job as running and return it, or None when the queue is empty"""
+    with viinterns.db_cursor(transaction=True) as cur:
+        cur.execute(CLAIM_JOB_QUERY)
+        job = cur.fetchone()
+        if job is None:
+            return None
+        cur.execute(
+            "UPDATE recommendation_jobs SET status = 'running', attempts = attempts + 1, started_at = NOW() WHERE id = %s",
+            (job['id'],)
+        )
+        if job['user_id'] is None:
+            # Recomputing everyone also covers single students queued before this job
+            cur.execute(
+                "UPDATE recommendation_jobs SET status = 'done', finished_at = NOW() "
+                "WHERE status = 'queued' AND user_id IS NOT NULL AND id < %s",
+                (job['id'],)
+            )
+    job['attempts'] += 1
+    return job
+
+def finish_job(job, error=None):
+    """Record a job as done, or requeue it after an error until it runs out of attempts"""
+    if error is None:
+        status = 'done'
+    else:
+        status = 'queued' if job['attempts'] < viinterns.app.config['RECOMMENDATION_MAX_ATTEMPTS'] else 'failed'
+    viinterns.db_query(
+        "UPDATE recommendation_jobs SET status = %s, error = %s, finished_at = NOW() WHERE id = %s",
+        (status, error[:500] if error else None, job['id']),
+        fetch=None
+    )
+
+def requeue_stale_jobs():
+    viinterns.db_query(
+        "UPDATE recommendation_jobs SET status = 'queued' "
+        "WHERE status = 'running' AND started_at < NOW() - INTERVAL %s SECOND",
+        (STALE_JOB_SECONDS,),
+        fetch=None
+    )
+
+def job_batches(job):
+    """Student ids a job covers, in batches of RECOMMENDATION_BATCH_SIZE"""
+    if job['user_id'] is not None:
+        return [[job['user_id']]]
+    rows = viinterns.db_query(
+        "SELECT id FROM users WHERE user_type = 'student' AND skills IS NOT NULL ORDER BY id"
+    )
+    size = viinterns.app.config['RECOMMENDATION_BATCH_SIZE']
+    ids = [row['id'] for row in rows]
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+def run(processes, once=False, poll_interval=1.0):
+    """Process jobs until interrupted (or, with once=True, until the queue is empty)"""
+    # Spawned processes never share the parent's pooled MySQL connections
+    context = multiprocessing.get_context('spawn')
+    pool = None
+    requeue_stale_jobs()
+    try:
+        while True:
+            job = claim_job()
+            if job is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            if pool is None or job['user_id'] is None:
+                if pool is not None:
+                    pool.terminate()
+                pool = context.Pool(processes, initializer=init_process)
+
+            started = time.perf_counter()
+            try:
+                students = sum(pool.imap_unordered(compute_batch, job_batches(job)))
+            except Exception as e:
+                logging.error(f"Recommendation job {job['id']} failed: {e}")
+                finish_job(job, str(e))
+                continue
+            finish_job(job)
+            logging.info(f"Recommendation job {job['id']}: {students} students in {time.perf_counter() - started:.1f}s")
+    finally:
+        if pool is not None:
+            pool.terminate()